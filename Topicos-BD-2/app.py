@@ -12,6 +12,7 @@ import base64
 from pathlib import Path
 import os
 import sys
+import time
 
 # Configuração da página - DEVE SER A PRIMEIRA COISA
 st.set_page_config(
@@ -26,6 +27,49 @@ CSS_PATH = PROJECT_ROOT / "styles" / "styles.css"
 IMAGES_PATH = PROJECT_ROOT / "images"
 PROGRAMS_PATH = PROJECT_ROOT / "programas"
 
+# Módulos compartilhados das páginas (ex: pdf_extraction) ficam em programas/
+if str(PROGRAMS_PATH) not in sys.path:
+    sys.path.insert(0, str(PROGRAMS_PATH))
+
+from analysis_cache import ANALYSES
+from background_jobs import JOBS
+from doc_cache import DOCS
+from inference_service import get_service
+from page_loader import record_first_run, run_page
+from spacy_models import MODELS, rss_bytes
+
+# Pipelines spaCy sem uso por este tempo (segundos) são descarregados da memória
+SPACY_IDLE_TIMEOUT = 30 * 60
+MODELS.idle_timeout = SPACY_IDLE_TIMEOUT
+MODELS.start_idle_monitor()
+
+# Modelos carregados com a tabela de vetores reduzida (palavras do corpus + mais frequentes,
+# float16, mapeada em memória e compartilhada entre processos), gerada antes com:
+#   python programas/vector_tables.py --model pt_core_news_lg
+# Ex: ["pt_core_news_lg"]. benchmarks/benchmark_vector_tables.py mede a memória e a
+# diferença nas similaridades.
+REDUCED_VECTOR_MODELS = []
+if REDUCED_VECTOR_MODELS:
+    # Importa o spaCy: só quando a opção está ativa
+    from vector_tables import table_path
+
+    for vector_model in REDUCED_VECTOR_MODELS:
+        MODELS.vector_tables[vector_model] = table_path(vector_model)
+
+# Modelos carregados em segundo plano na primeira execução do servidor, em ordem de
+# prioridade, enquanto a página inicial é exibida (Tokenização, Similaridade e
+# Dependências usam o lg; Classes Gramaticais, Detecção de Frases e NER, o sm)
+WARMUP_MODELS = ["pt_core_news_lg", "pt_core_news_sm"]
+MODELS.warm_up(WARMUP_MODELS)
+
+# Processos do serviço de inferência por modelo: os textos de todas as sessões são
+# processados em micro-lotes (nlp.pipe) nesses processos, em vez de um por vez na thread
+# de cada sessão. Vale a pena com muitos usuários simultâneos; cada processo carrega uma
+# cópia do modelo. Vazio processa na thread da sessão. Ex: {"pt_core_news_sm": 2}
+INFERENCE_WORKERS = {}
+for inference_model, inference_workers in INFERENCE_WORKERS.items():
+    DOCS.services[inference_model] = get_service(inference_model, workers=inference_workers)
+
 webmedia_image_path = IMAGES_PATH / "webmedia2024.png"
 background_image_path = IMAGES_PATH / "background.png"
 current_dir = Path(__file__).parent if "__file__" in locals() else Path.cwd()
@@ -111,18 +155,49 @@ def run_external_page(page_file):
         page_path = PROGRAMS_PATH / page_file
         
         if page_path.exists():
-            # Lê o conteúdo do arquivo
-            with open(page_path, 'r', encoding='utf-8') as f:
-                page_content = f.read()
-            
-            # Executa o código da página
-            exec(page_content, globals())
+            # Executa o código compilado em cache (recompilado só se o arquivo mudar),
+            # em um namespace próprio da página
+            run_page(page_path, host_file=__file__)
         else:
             st.error(f"Arquivo {page_file} não encontrado em: {page_path}")
     except Exception as e:
         st.error(f"Erro ao carregar a página: {e}")
         st.info("A página pode estar em desenvolvimento")
 
+# Memória dos pipelines spaCy compartilhados pelas páginas
+def show_model_memory():
+    stats = MODELS.stats()
+    rss = rss_bytes()
+    with st.expander("🧠 Modelos spaCy"):
+        if rss is not None:
+            st.caption(f"Memória do servidor: {rss / 1024 / 1024:.0f} MB")
+        if not stats:
+            st.caption("Nenhum modelo carregado")
+        for label, model_stats in stats.items():
+            memory = f"{model_stats['rss_bytes'] / 1024 / 1024:.0f} MB" if model_stats['rss_bytes'] is not None else "?"
+            if model_stats['loaded']:
+                state = f"sem uso há {model_stats['idle_seconds'] / 60:.0f} min"
+            else:
+                state = "descarregado"
+            st.caption(f"{label}: {memory}, {state}")
+
+# Acertos e faltas do cache de documentos processados (doc_cache.DOCS) e do cache de
+# análises em disco (analysis_cache.ANALYSES), e tarefas em segundo plano (background_jobs.JOBS)
+def show_doc_cache_stats():
+    stats = DOCS.stats()
+    disk_stats = ANALYSES.stats()
+    job_stats = JOBS.stats()
+    requests = stats['hits'] + stats['misses']
+    with st.expander("📦 Cache de documentos"):
+        hit_rate = f" ({stats['hits'] / requests:.0%})" if requests else ""
+        st.caption(f"Acertos: {stats['hits']}{hit_rate} | Faltas: {stats['misses']}")
+        st.caption(f"{stats['entries']} documentos, {stats['bytes'] / 1024 / 1024:.1f} MB | "
+                   f"Descartados: {stats['evictions']}")
+        st.caption(f"Em disco: {disk_stats['entries']} análises, {disk_stats['bytes'] / 1024 / 1024:.1f} MB | "
+                   f"Acertos: {disk_stats['hits']} | Faltas: {disk_stats['misses']}")
+        st.caption(f"Tarefas: {job_stats['executando']} executando, {job_stats['pendente']} na fila | "
+                   f"Reaproveitadas: {job_stats['reused']} de {job_stats['submitted'] + job_stats['reused']}")
+
 # Função para mostrar a página inicial
 def show_home():
     st.title("Análise LLM dos anais do WebMedia 2024")
@@ -182,10 +257,15 @@ with st.sidebar:
     
     st.markdown('</div>', unsafe_allow_html=True)
 
+    show_model_memory()
+    show_doc_cache_stats()
+
 # Conteúdo principal baseado na página selecionada
 # Conteúdo principal baseado na página selecionada - CORRIGIDO
 if st.session_state.current_page == "Home":
+    home_start = time.perf_counter()
     show_home()
+    record_first_run("Página inicial", home_start)
 else:
     # Executa a página externa correspondente
     page_file = PAGE_MAPPING.get(st.session_state.current_page)
@@ -0,0 +1,144 @@
+"""
+Compara o artigos.json de "4 - gera_json.py" (indent=2), o JSONL em fluxo e o formato
+colunar de article_store (Parquet com token/POS/lema codificados por dicionário):
+tamanho em disco e tempo para carregar tudo, um artigo e uma coluna (lemas).
+
+Usa um artigos.jsonl real (--jsonl) ou, sem ele, artigos sintéticos gerados a partir de
+arquivos/files_txt (tokens por expressão regular, POS por regras simples no conjunto de
+17 etiquetas universais e lema = token em minúsculas sem sufixo de plural).
+
+Uso:
+    python benchmarks/benchmark_article_store.py --copies 20
+    python benchmarks/benchmark_article_store.py --jsonl programas/artigos.jsonl
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmark_pdf_to_txt import PROJECT_ROOT
+
+sys.path.insert(0, str(PROJECT_ROOT / "programas"))
+
+from article_store import ArticleColumnStore, ArticleJSONLWriter, iter_articles, write_column_store  # noqa: E402
+
+TXT_FOLDER = PROJECT_ROOT / "arquivos" / "files_txt"
+TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+FUNCTION_WORDS = {
+    'o': 'DET', 'a': 'DET', 'os': 'DET', 'as': 'DET', 'um': 'DET', 'uma': 'DET', 'the': 'DET',
+    'de': 'ADP', 'do': 'ADP', 'da': 'ADP', 'em': 'ADP', 'para': 'ADP', 'com': 'ADP', 'of': 'ADP', 'in': 'ADP',
+    'e': 'CCONJ', 'ou': 'CCONJ', 'and': 'CCONJ', 'que': 'SCONJ', 'se': 'PRON', 'é': 'AUX', 'são': 'AUX',
+}
+
+
+def synthetic_pos(token):
+    if not token[0].isalnum():
+        return 'PUNCT'
+    if token.isdigit():
+        return 'NUM'
+    lower = token.lower()
+    if lower in FUNCTION_WORDS:
+        return FUNCTION_WORDS[lower]
+    if token[0].isupper():
+        return 'PROPN'
+    if lower.endswith(('ar', 'er', 'ir', 'ou', 'am')):
+        return 'VERB'
+    if lower.endswith(('mente', 'ly')):
+        return 'ADV'
+    if lower.endswith(('vel', 'ico', 'ica', 'al', 'ivo', 'iva')):
+        return 'ADJ'
+    return 'NOUN'
+
+
+def synthetic_articles(folder, copies):
+    for copy in range(copies):
+        for path in sorted(Path(folder).glob("*.txt")):
+            text = path.read_text(encoding="utf-8")
+            tokens = TOKEN_RE.findall(text)
+            yield {
+                'titulo': next((line for line in text.splitlines() if len(line.split()) >= 3), ''),
+                'informacoes_url': f'https://exemplo.com/artigo/{path.name}',
+                'idioma': 'Português',
+                'storage_key': f"{copy:04d}/{path.name}",
+                'autores': [{'nome': 'Autor', 'afiliacao': 'Afiliação não encontrada', 'orcid': 'ORCID não encontrado'}],
+                'data_publicacao': 'Data não encontrada',
+                'resumo': text[:800],
+                'keywords': ['Palavras-chave não encontradas'],
+                'referencias': ['Referências não encontradas'],
+                'artigo_completo': text[:5000],
+                'artigo_tokenizado': tokens,
+                'pos_tagger': [synthetic_pos(token) for token in tokens],
+                'lema': [re.sub(r"(?<=\w\w)s$", "", token.lower()) for token in tokens],
+            }
+
+
+def timed(function, repeat=3):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return result, (time.perf_counter() - start) / repeat
+
+
+def load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jsonl", help="artigos.jsonl gerado por 4 - gera_json.py")
+    parser.add_argument("--input", default=str(TXT_FOLDER), help="TXTs para os artigos sintéticos")
+    parser.add_argument("--copies", type=int, default=10, help="cópias do corpus sintético")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        jsonl_path = os.path.join(folder, "artigos.jsonl")
+        json_path = os.path.join(folder, "artigos.json")
+        prefix = os.path.join(folder, "artigos")
+
+        source = iter_articles(args.jsonl) if args.jsonl else synthetic_articles(args.input, args.copies)
+        with ArticleJSONLWriter(jsonl_path) as writer:
+            for article in source:
+                writer.write(article)
+        articles = list(iter_articles(jsonl_path))
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(articles, f, ensure_ascii=False, indent=2)
+        _, write_seconds = timed(lambda: write_column_store(iter_articles(jsonl_path), prefix), repeat=1)
+
+        tokens = sum(len(article['artigo_tokenizado']) for article in articles)
+        target = articles[len(articles) // 2]['storage_key']
+        parquet_size = sum(os.path.getsize(prefix + suffix) for suffix in (".tokens.parquet", ".articles.parquet"))
+        print(f"{len(articles)} artigos, {tokens} tokens ({'sintéticos' if not args.jsonl else args.jsonl}); "
+              f"colunar gravado em {write_seconds:.2f}s")
+        print(f"Tamanho: JSON {os.path.getsize(json_path) / 1024 / 1024:7.1f} MB | "
+              f"JSONL {os.path.getsize(jsonl_path) / 1024 / 1024:7.1f} MB | "
+              f"Parquet {parquet_size / 1024 / 1024:7.1f} MB")
+
+        store = ArticleColumnStore(prefix)
+        if store.get_article(target) != next(a for a in articles if a['storage_key'] == target):
+            raise AssertionError("Artigo lido do formato colunar difere do JSON")
+        if store.column('lema') != [article['lema'] for article in articles]:
+            raise AssertionError("Coluna de lemas lida do formato colunar difere do JSON")
+
+        rows = [
+            ("Tudo", lambda: load_json(json_path), lambda: list(iter_articles(jsonl_path)),
+             lambda: [store.get_article(i) for i in range(len(store))]),
+            ("Um artigo", lambda: [a for a in load_json(json_path) if a['storage_key'] == target],
+             lambda: next(a for a in iter_articles(jsonl_path) if a['storage_key'] == target),
+             lambda: ArticleColumnStore(prefix).get_article(target)),
+            ("Coluna lema", lambda: [a['lema'] for a in load_json(json_path)],
+             lambda: [a['lema'] for a in iter_articles(jsonl_path, fields=('lema',))],
+             lambda: ArticleColumnStore(prefix).column('lema')),
+        ]
+        for label, *functions in rows:
+            seconds = [timed(function)[1] for function in functions]
+            print(f"{label:<12} JSON {seconds[0] * 1000:8.1f} ms | JSONL {seconds[1] * 1000:8.1f} ms | "
+                  f"Parquet {seconds[2] * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Compara a limpeza de texto de text_cleaning (máquina de estados linha a linha, padrões
+pré-compilados) com a versão anterior baseada em várias passadas de regex, que fica
+copiada abaixo como referência.
+
+1. Confere que as duas produzem exatamente a mesma saída para os PDFs de arquivos/files_pdf.
+2. Mede o tempo das duas sobre esse corpus.
+3. Mede o pior caso com entradas adversárias de tamanho crescente (longas sequências de
+   linhas em branco, títulos repetidos, resumos sem fim...): a versão por regex cresce de
+   forma quadrática em algumas delas, a nova cresce linearmente.
+
+Uso:
+    python benchmarks/benchmark_clean_text.py --repeat 5 --sizes 1000 2000 4000 8000
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+from benchmark_pdf_to_txt import PDF_FOLDER, load_script
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "programas"))
+
+from text_cleaning import clean_text  # noqa: E402
+
+# Entradas adversárias: função tamanho -> texto
+ADVERSARIAL_INPUTS = {
+    "linhas em branco": lambda n: "Texto\n" + "\n" * n + "Fim",
+    "linhas só com espaços": lambda n: "Texto\n" + " \n" * n + "Fim",
+    "títulos repetidos": lambda n: "Texto\n" + "1.\n\nIntroduction\n" * n,
+    "resumo sem fim": lambda n: "Abstract " + "1. 2. iv. " * n,
+    "palavras-chave repetidas": lambda n: "Keywords: " * n + "\n\nFim",
+    "linha única longa": lambda n: "palavra  " * (n * 10),
+}
+
+
+def clean_text_regex(text):
+    """
+    Realiza operações de limpeza no texto extraído:
+    - Normaliza quebras de linha e remove caracteres de avanço de página.
+    - Tenta remover nomes de autores e afiliações (abordagem heurística, linguagem agnóstica).
+    - Remove as seções ABSTRACT (Inglês) e KEYWORDS (Inglês).
+    - Remove o cabeçalho INTRODUCTION (Inglês) se for um título de seção.
+    - Remove as seções REFERENCES/BIBLIOGRAPHY (Inglês).
+    - Tenta remover números de página.
+    - Normaliza espaços em branco para delimitação de parágrafos e palavras.
+    """
+    # 1. Normaliza quebras de linha e remove caracteres de avanço de página
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    text = text.replace('\x0c', '') # Caractere de avanço de página
+
+    lines = text.split('\n')
+    
+    # --- 2. Tentativa de remover Nomes de Autores e Afiliações (altamente heurística) ---
+    # Aplica-se às primeiras linhas. Esta parte é linguagem agnóstica.
+    main_content_start_index = 0
+    # Limita a busca às primeiras 50 linhas para eficiência e relevância
+    for i, line in enumerate(lines[:min(50, len(lines))]):
+        line_lower = line.lower().strip()
+        # Procura por marcadores de início de conteúdo principal (English/Portuguese)
+        if (
+            line_lower.startswith('abstract') or line_lower.startswith('resumo') or
+            line_lower.startswith('introdução') or line_lower.startswith('introduction') or
+            re.match(r'^\d+\.?\s+[A-Z]', line_lower) or # Ex: "1. Título"
+            re.match(r'^[IVX]+\.?\s+[A-Z]', line_lower) # Ex: "I. Título"
+        ):
+            main_content_start_index = i
+            break
+        # Heurística para linhas longas que não parecem ser metadados de autor
+        elif len(line_lower.split()) > 10 and not any(
+            keyword in line_lower for keyword in ['email', 'university', 'department', 'institute', 'college', 'orcid', 'instituição', 'affiliation', 'author']
+        ):
+            main_content_start_index = i
+            break
+        
+    # Se um potencial início de conteúdo principal foi encontrado, verifica se o bloco anterior
+    # realmente contém padrões de autor para evitar remover introduções legítimas.
+    if main_content_start_index > 0:
+        potential_author_block = "\n".join(lines[:main_content_start_index]).lower()
+        if any(keyword in potential_author_block for keyword in ['email', 'university', 'department', 'institute', 'college', 'orcid', 'instituição', 'affiliation', 'author']):
+            lines = lines[main_content_start_index:]
+        # Caso contrário, mantém as linhas originais, pois não encontrou padrões fortes de autor.
+
+
+    # Re-junta as linhas para aplicar regex de blocos maiores
+    text = '\n'.join(lines)
+    
+    # --- 3. Remove seções ABSTRACT (Inglês) e KEYWORDS (Inglês) ---
+    # Remove ABSTRACT (Inglês)
+    abstract_pattern_en = re.compile(
+        r'\bABSTRACT\b.*?'  # Captura ABSTRACT
+        r'(?='  # Lookahead para o fim da seção ABSTRACT
+        r'\bKEYWORDS\b'         # Fim se encontrar KEYWORDS (English)
+        r'|\bRESUMO\b'          # Fim se encontrar RESUMO (Portuguese) - para não remover
+        r'|\b(?:1\.\s*Introduction|I\.\s*INTRODUCTION)\b' # Fim se encontrar Introduction (English)
+        r'|\bPALAVRAS-CHAVE\b'  # Fim se encontrar PALAVRAS-CHAVE (Portuguese) - para não remover
+        r'|\b\d+\.\s+[A-Z][a-zA-Z\s]+' # Ou início de nova seção numerada
+        r'|\b[IVX]+\.\s+[A-Z][a-zA-Z\s]+' # Ou início de nova seção romana
+        r'|\n\n[A-Z]'           # Ou duas quebras de linha seguidas por uma letra maiúscula (novo parágrafo/seção)
+        r'|\Z'                  # Ou fim do documento
+        r')',
+        re.IGNORECASE | re.DOTALL
+    )
+    text = abstract_pattern_en.sub('', text)
+
+    # Remove KEYWORDS (Inglês) - se não foi pego pelo ABSTRACT_pattern_en
+    keywords_only_pattern_en = re.compile(
+        r'\bKEYWORDS\b.*?'
+        r'(?='
+        r'\bPALAVRAS-CHAVE\b'  # Fim se encontrar PALAVRAS-CHAVE (Portuguese) - para não remover
+        r'|\b(?:1\.\s*Introduction|I\.\s*INTRODUCTION)\b' # Fim se encontrar Introduction (English)
+        r'|\b\d+\.\s+[A-Z][a-zA-Z\s]+'
+        r'|\b[IVX]+\.\s+[A-Z][a-zA-Z\s]+'
+        r'|\n\n[A-Z]'
+        r'|\Z'
+        r')',
+        re.IGNORECASE | re.DOTALL
+    )
+    text = keywords_only_pattern_en.sub('', text)
+
+    # --- 4. Remove o cabeçalho INTRODUCTION (Inglês) ---
+    # Procura por linhas que são estritamente o cabeçalho INTRODUCTION, com ou sem numeração.
+    # Ex: "1. Introduction", "I. INTRODUCTION", "Introduction"
+    introduction_heading_pattern_en = re.compile(
+        r'^\s*(?:\d+\.?\s*|[IVX]+\.?\s*)?INTRODUCTION\s*$',
+        re.IGNORECASE | re.MULTILINE
+    )
+    # Substitui a linha do cabeçalho por uma string vazia para ser limpa depois
+    text = introduction_heading_pattern_en.sub('\n', text)
+
+    # --- 5. Remove a seção de Referências (Inglês: REFERENCES/BIBLIOGRAPHY) ---
+    # Captura "REFERENCES" ou "BIBLIOGRAPHY" (case-insensitive) e tudo o que segue.
+    references_pattern_en = re.compile(
+        r'\b(?:REFERENCES|BIBLIOGRAPHY)\b.*',
+        re.IGNORECASE | re.DOTALL
+    )
+    text = references_pattern_en.sub('', text)
+
+    # --- 6. Remove números de página ---
+    # Opera linha a linha para remover linhas que contêm APENAS um número de página.
+    lines = text.split('\n')
+    cleaned_lines_without_page_numbers = []
+    
+    # Regex para identificar uma linha que é *apenas* um número de página
+    # Suporta números arábicos (até 4 dígitos) e romanos (até 4 caracteres),
+    # opcionalmente envolvidos por hífens/traços e espaços.
+    page_number_regex = re.compile(r'^\s*[-–—]?\s*(?:\d{1,4}|[ivxlcdmIVXLCDM]{1,4})\s*[-–—]?\s*$')
+
+    for line in lines:
+        stripped_line = line.strip()
+        if not stripped_line:
+            # Mantém linhas vazias para que a estrutura de parágrafos não seja prejudicada antes da normalização final
+            cleaned_lines_without_page_numbers.append(line)
+            continue
+
+        # Verifica se a linha corresponde ao padrão de número de página
+        if page_number_regex.match(stripped_line):
+            # Adiciona uma heurística extra para evitar falsos positivos.
+            # Se a linha for curta (até 9 caracteres) E for puramente numérica ou romana, a removemos.
+            if len(stripped_line) < 10 and (
+                stripped_line.isdigit() or 
+                re.fullmatch(r'[ivxlcdmIVXLCDM]+', stripped_line.replace('-', '').replace('–', '').replace('—', '').strip())
+            ):
+                continue # Remove a linha se for um número de página
+        
+        # Se não for um número de página (ou for um falso positivo), mantém a linha
+        cleaned_lines_without_page_numbers.append(line)
+
+    text = '\n'.join(cleaned_lines_without_page_numbers)
+
+    # --- 7. Normaliza parágrafos e palavras ---
+    # Substitui múltiplas quebras de linha por no máximo duas (simulando quebra de parágrafo)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    # Substitui múltiplos espaços (e tabulações) por um único espaço
+    text = re.sub(r'[ \t]{2,}', ' ', text)
+    # Remove espaços em branco do início/fim de cada linha
+    text = '\n'.join([line.strip() for line in text.split('\n')])
+    # Remove linhas vazias que podem ter resultado das operações anteriores
+    text = '\n'.join(filter(lambda x: x.strip(), text.split('\n')))
+
+    return text
+
+
+def timed(function, text, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function(text)
+    return (time.perf_counter() - start) / repeat, result
+
+
+def run_corpus(pdf_to_txt, input_folder, repeat):
+    texts = {pdf.name: pdf_to_txt.extract_raw_text(str(pdf))[0] for pdf in sorted(Path(input_folder).glob("*.pdf"))}
+    if not texts:
+        raise SystemExit(f"Nenhum PDF encontrado em {input_folder}")
+    total_regex = total_new = 0.0
+    for name, raw in texts.items():
+        regex_seconds, expected = timed(clean_text_regex, raw, repeat)
+        new_seconds, cleaned = timed(clean_text, raw, repeat)
+        if cleaned != expected:
+            raise AssertionError(f"Saída divergente para {name}")
+        total_regex += regex_seconds
+        total_new += new_seconds
+    chars = sum(len(raw) for raw in texts.values())
+    print(f"Corpus: {len(texts)} PDFs, {chars / 1e6:.2f} M caracteres, saídas idênticas")
+    print(f"  regex: {total_regex * 1000:8.1f} ms | text_cleaning: {total_new * 1000:8.1f} ms | "
+          f"ganho {total_regex / total_new:.1f}x")
+
+
+def run_adversarial(sizes, max_regex_seconds):
+    print("Entradas adversárias (tempo por chamada; razão = crescimento ao dobrar o tamanho):")
+    for label, make_text in ADVERSARIAL_INPUTS.items():
+        print(f"  {label}:")
+        previous = {}
+        measure_regex = True
+        for size in sizes:
+            text = make_text(size)
+            timings = {}
+            timings['text_cleaning'], cleaned = timed(clean_text, text)
+            if measure_regex:
+                timings['regex'], expected = timed(clean_text_regex, text)
+                if cleaned != expected:
+                    raise AssertionError(f"Saída divergente em '{label}' com tamanho {size}")
+                measure_regex = timings['regex'] <= max_regex_seconds
+            columns = []
+            for name in ('regex', 'text_cleaning'):
+                if name not in timings:
+                    columns.append(f"{name} {'(pulado)':>25}")
+                    continue
+                growth = f"(razão {timings[name] / previous[name]:.1f})" if name in previous else ""
+                columns.append(f"{name} {timings[name] * 1000:9.2f} ms {growth:<11}")
+            previous = timings
+            print(f"    n={size:>6} ({len(text) / 1e3:6.1f} K car.): " + " | ".join(columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", default=str(PDF_FOLDER))
+    parser.add_argument("--repeat", type=int, default=5, help="repetições por PDF do corpus")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 2000, 4000, 8000])
+    parser.add_argument("--max-regex-seconds", type=float, default=5.0,
+                        help="deixa de medir a versão por regex numa entrada depois de uma chamada mais lenta que isto")
+    args = parser.parse_args()
+
+    pdf_to_txt = load_script("2 - pdf_to_txt.py", "pdf_to_txt")
+    run_corpus(pdf_to_txt, args.input, args.repeat)
+    run_adversarial(sorted(args.sizes), args.max_regex_seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Mede o rastreador de anais (sbc_crawler) contra o servidor OJS local:
+a partir da página de arquivo, com várias edições, compara a resolução
+sequencial das páginas de visualização (1 worker) com a paralela e confere
+se o JSONL contém exatamente os links de download esperados.
+
+Uso:
+    python benchmarks/benchmark_crawler.py --issues 5 --articles 20 --latency 0.1 --workers 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "programas"))
+
+from ojs_stub_server import OJSStubServer  # noqa: E402
+from sbc_crawler import SBCCrawler, read_download_links  # noqa: E402
+
+
+def run_crawl(stub, workers, rps):
+    with tempfile.TemporaryDirectory() as folder:
+        output = os.path.join(folder, "links_pdfs.jsonl")
+        stats = SBCCrawler(output, max_workers=workers, requests_per_second=rps).crawl([stub.archive_url()])
+        links = read_download_links(output)
+        # Uma segunda execução sobre o mesmo JSONL não deve acrescentar nada
+        again = SBCCrawler(output, max_workers=workers, requests_per_second=rps).crawl([stub.archive_url()])
+    if sorted(links) != sorted(stub.download_urls()) or len(links) != len(set(links)):
+        raise AssertionError("Links encontrados diferem dos servidos pelo servidor")
+    if again['new_pdfs']:
+        raise AssertionError("A segunda execução repetiu links já gravados")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--issues", type=int, default=5)
+    parser.add_argument("--articles", type=int, default=20, help="artigos por edição")
+    parser.add_argument("--latency", type=float, default=0.1, help="latência simulada por requisição (s)")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rps", type=float, default=100.0, help="limite de requisições/s por host")
+    args = parser.parse_args()
+
+    issues = {1361 + i: args.articles for i in range(args.issues)}
+    with OJSStubServer(issues=issues, latency=args.latency) as stub:
+        results = {}
+        for workers in (1, args.workers):
+            stats = run_crawl(stub, workers, args.rps)
+            results[workers] = stats['seconds']
+            print(f"{workers} worker(s): {stats['archive']} páginas de arquivo, {stats['issue']} edições, "
+                  f"{stats['view']} páginas de visualização, {stats['new_pdfs']} PDFs em {stats['seconds']:.2f}s")
+        print(f"Ganho: {results[1] / results[args.workers]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Compara o download sequencial (um requests.get por arquivo, como no script
+original) com o download concorrente de sbc_download, contra o servidor OJS local.
+
+Em seguida mede o manifesto: uma primeira execução com quedas de conexão
+simuladas (retomadas por Range) e uma segunda execução sobre a mesma edição,
+que deve transferir praticamente nada.
+
+Uso:
+    python benchmarks/benchmark_download.py --articles 40 --latency 0.2 --workers 8
+"""
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "programas"))
+
+from ojs_stub_server import OJSStubServer  # noqa: E402
+from sbc_download import (HEADERS, DownloadManifest, download_pdfs_concurrently,  # noqa: E402
+                          pdf_filename_from_url, print_download_summary)
+
+
+def download_sequential(pdf_urls, download_folder):
+    """Reproduz o laço original: uma conexão nova e um arquivo por vez."""
+    start = time.perf_counter()
+    total_bytes = 0
+    for index, pdf_url in enumerate(pdf_urls):
+        response = requests.get(pdf_url, stream=True, headers=HEADERS, timeout=30)
+        response.raise_for_status()
+        with open(os.path.join(download_folder, pdf_filename_from_url(pdf_url, index)), 'wb') as f:
+            for chunk in response.iter_content(chunk_size=8192):
+                f.write(chunk)
+                total_bytes += len(chunk)
+    return time.perf_counter() - start, total_bytes
+
+
+def verify_downloads(stub, download_folder):
+    """Confere se cada PDF baixado é idêntico ao servido pelo servidor."""
+    for galley_id in stub.articles:
+        path = os.path.join(download_folder, f"{galley_id}.pdf")
+        with open(path, 'rb') as f:
+            if hashlib.sha256(f.read()).digest() != hashlib.sha256(stub.pdf_bytes(galley_id)).digest():
+                raise AssertionError(f"Conteúdo divergente em {path}")
+
+
+def run_manifest_scenario(args):
+    """Primeira execução com quedas simuladas e segunda execução sobre a edição inalterada."""
+    interrupt = max(1, args.articles // 8)
+    with OJSStubServer(issues={1361: args.articles}, latency=args.latency, interrupt=interrupt) as stub, \
+            tempfile.TemporaryDirectory() as folder:
+        pdf_urls = stub.download_urls()
+        manifest_path = os.path.join(folder, "manifest.json")
+        for run in (1, 2):
+            sent_before = stub.bytes_sent
+            summary = download_pdfs_concurrently(pdf_urls, folder, max_workers=args.workers,
+                                                 requests_per_second=args.rps,
+                                                 manifest=DownloadManifest(manifest_path))
+            verify_downloads(stub, folder)
+            print(f"Execução {run} com manifesto:")
+            print_download_summary(summary)
+            print(f"Bytes enviados pelo servidor: {(stub.bytes_sent - sent_before) / 1024:.1f} KB")
+        pdf_files = [f for f in os.listdir(folder) if f.endswith('.pdf')]
+        if len(pdf_files) != len(pdf_urls):
+            raise AssertionError(f"Esperados {len(pdf_urls)} PDFs, encontrados {len(pdf_files)}")
+        print(f"Quedas simuladas: {interrupt} | Requisições por tipo: {dict(stub.requests)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.2, help="latência simulada por requisição (s)")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rps", type=float, default=50.0, help="limite de requisições/s por host")
+    args = parser.parse_args()
+
+    with OJSStubServer(issues={1361: args.articles}, latency=args.latency) as stub:
+        pdf_urls = stub.download_urls()
+
+        with tempfile.TemporaryDirectory() as folder:
+            seq_elapsed, seq_bytes = download_sequential(pdf_urls, folder)
+            verify_downloads(stub, folder)
+        print(f"Sequencial: {len(pdf_urls)} arquivos em {seq_elapsed:.2f}s "
+              f"({seq_bytes / (1024 * 1024) / seq_elapsed:.2f} MB/s)")
+
+        with tempfile.TemporaryDirectory() as folder:
+            summary = download_pdfs_concurrently(pdf_urls, folder, max_workers=args.workers,
+                                                 requests_per_second=args.rps)
+            verify_downloads(stub, folder)
+        print(f"Concorrente ({args.workers} workers):")
+        print_download_summary(summary)
+        print(f"Ganho: {seq_elapsed / summary['elapsed']:.1f}x")
+
+    run_manifest_scenario(args)
+
+
+if __name__ == "__main__":
+    main()
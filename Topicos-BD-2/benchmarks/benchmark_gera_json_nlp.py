@@ -0,0 +1,118 @@
+"""
+Compara o NLP de "4 - gera_json.py" feito como antes (nlp(texto[:10000]) por artigo, com
+o pipeline completo) com process_texts_nlp (nlp.pipe em lotes, sem parser/ner), com
+diferentes números de processos, sobre os PDFs de arquivos/files_pdf.
+
+Confere que tokens, POS e lemas de cada artigo são idênticos com o mesmo corte de 10.000
+caracteres e mede o tempo. Depois processa os artigos inteiros com e sem divisão em
+trechos, comparando tokens cobertos, tempo e pico de memória Python (tracemalloc).
+Por fim, compara o idioma de cada artigo (detect_language) com o idioma detectado por
+parágrafo (lingua, em lote e um a um) e mede o processamento com roteamento por parágrafo.
+
+Uso:
+    python benchmarks/benchmark_gera_json_nlp.py --batch-size 16 --n-process 1 2 4 --chunk-chars 2000 10000
+"""
+import argparse
+import os
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+from benchmark_pdf_to_txt import PDF_FOLDER, load_script
+
+LEGACY_MAX_CHARS = 10000
+
+
+def legacy_annotations(gera_json, items):
+    results = []
+    for text, language in items:
+        doc = gera_json.select_nlp(language)(text[:LEGACY_MAX_CHARS])
+        results.append(([t.text for t in doc], [t.pos_ for t in doc], [t.lemma_ for t in doc]))
+    return results
+
+
+def measure_full_text(gera_json, items, batch_size, chunk_chars):
+    tracemalloc.start()
+    start = time.perf_counter()
+    results = gera_json.process_texts_nlp(items, batch_size=batch_size, max_chars=None, chunk_chars=chunk_chars,
+                                          paragraph_language=False)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    tokens = sum(len(tokens) for tokens, _, _ in results)
+    label = f"trechos de {chunk_chars}" if chunk_chars else "artigo inteiro"
+    print(f"{label:<20} {tokens:>8} tokens | {seconds:6.2f}s | pico {peak / 1024 / 1024:7.1f} MB")
+    return results
+
+
+def measure_routing(gera_json, items, batch_size):
+    pieces = [(language, piece) for text, language in items
+              for piece in gera_json._split_text(text, gera_json.NLP_CHUNK_CHARS, True)]
+    texts = [piece for _, piece in pieces]
+    gera_json.detect_languages(texts[:1])  # carrega os modelos do lingua fora da medição
+    start = time.perf_counter()
+    languages = gera_json.detect_languages(texts)
+    batch = time.perf_counter() - start
+    start = time.perf_counter()
+    for text in texts:
+        gera_json.detect_languages([text])
+    single = time.perf_counter() - start
+    print(f"Idioma de {len(texts)} parágrafos: lote {batch:.2f}s | um a um {single:.2f}s")
+
+    chars = Counter()
+    for (article_language, piece), language in zip(pieces, languages):
+        chars[(article_language, language or 'indeterminado')] += len(piece)
+    total = sum(chars.values())
+    for (article_language, language), count in sorted(chars.items()):
+        print(f"  artigo {article_language:<13} parágrafo {language:<13} {count:>9} caracteres ({count / total:6.1%})")
+
+    start = time.perf_counter()
+    gera_json.process_texts_nlp(items, batch_size=batch_size, max_chars=None, paragraph_language=True)
+    print(f"NLP com idioma por parágrafo: {time.perf_counter() - start:6.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", default=str(PDF_FOLDER))
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--n-process", type=int, nargs="+", default=[1, 2, os.cpu_count() or 1])
+    parser.add_argument("--chunk-chars", type=int, nargs="+", default=[2000, 10000])
+    parser.add_argument("--copies", type=int, default=1, help="cópias do corpus (para lotes maiores)")
+    args = parser.parse_args()
+
+    gera_json = load_script("4 - gera_json.py", "gera_json")
+    items = []
+    for pdf in sorted(Path(args.input).glob("*.pdf")):
+        text = gera_json.extract_text_from_pdf(str(pdf))
+        items.append((text, gera_json.detect_language(text)))
+    items *= args.copies
+
+    start = time.perf_counter()
+    reference = legacy_annotations(gera_json, items)
+    base = time.perf_counter() - start
+    print(f"{len(items)} artigos | um a um, pipeline completo, {LEGACY_MAX_CHARS} caracteres: {base:6.2f}s")
+
+    for n_process in sorted(set(args.n_process)):
+        start = time.perf_counter()
+        results = gera_json.process_texts_nlp(items, batch_size=args.batch_size, n_process=n_process,
+                                              max_chars=LEGACY_MAX_CHARS, chunk_chars=None,
+                                              paragraph_language=False)
+        seconds = time.perf_counter() - start
+        if results != reference:
+            raise AssertionError(f"Anotações divergentes com {n_process} processo(s)")
+        print(f"nlp.pipe lotes de {args.batch_size}, {n_process} processo(s): {seconds:6.2f}s | "
+              f"ganho {base / seconds:.1f}x | resultados idênticos")
+
+    print(f"Artigos inteiros ({sum(len(text) for text, _ in items)} caracteres):")
+    whole = measure_full_text(gera_json, items, args.batch_size, None)
+    for chunk_chars in args.chunk_chars:
+        chunked = measure_full_text(gera_json, items, args.batch_size, chunk_chars)
+        same_tokens = sum(a[0] == b[0] for a, b in zip(whole, chunked))
+        print(f"{'':<20} tokens iguais ao artigo inteiro em {same_tokens}/{len(items)} artigos")
+
+    measure_routing(gera_json, items, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
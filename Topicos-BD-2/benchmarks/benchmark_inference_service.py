@@ -0,0 +1,100 @@
+"""
+Teste de carga do serviço de inferência (inference_service): N sessões simultâneas
+(threads, como no Streamlit), cada uma enviando pedidos em sequência, com chamadas diretas
+ao mesmo nlp ou pelo serviço em micro-lotes. Mostra latência p50/p95 por pedido e vazão.
+
+Os textos são trechos de arquivos/files_txt. Confere que os tokens e POS do serviço são
+iguais aos da chamada direta.
+
+Uso:
+    python benchmarks/benchmark_inference_service.py --model pt_core_news_sm --sessions 1 8 32 --workers 2
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from benchmark_pdf_to_txt import PROJECT_ROOT
+
+sys.path.insert(0, str(PROJECT_ROOT / "programas"))
+
+from inference_service import InferenceService  # noqa: E402
+from spacy_models import MODELS  # noqa: E402
+from text_chunking import iter_chunks  # noqa: E402
+
+TXT_FOLDER = PROJECT_ROOT / "arquivos" / "files_txt"
+
+
+def sample_texts(folder, chars, limit):
+    texts = []
+    for path in sorted(Path(folder).glob("*.txt")):
+        texts.extend(chunk for chunk in iter_chunks(path.read_text(encoding="utf-8"), chars) if chunk.strip())
+    return texts[:limit]
+
+
+def run_load(call, texts, sessions, requests):
+    """Cada sessão faz requests pedidos em sequência; devolve latências (s) e duração total."""
+    def session(index):
+        latencies = []
+        for i in range(requests):
+            text = texts[(index * requests + i) % len(texts)]
+            start = time.perf_counter()
+            call(text)
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(sessions) as executor:
+        latencies = [value for values in executor.map(session, range(sessions)) for value in values]
+    return latencies, time.perf_counter() - start
+
+
+def summary(label, latencies, seconds):
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    print(f"  {label:<9} p50 {quantiles[49] * 1000:8.1f} ms | p95 {quantiles[94] * 1000:8.1f} ms | "
+          f"{len(latencies) / seconds:7.1f} pedidos/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="pt_core_news_sm", help='modelo spaCy (ou "blank:pt")')
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=20, help="pedidos por sessão")
+    parser.add_argument("--workers", type=int, default=min(2, os.cpu_count() or 1))
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--max-latency", type=float, default=0.010, help="segundos")
+    parser.add_argument("--chars", type=int, default=500, help="tamanho dos textos")
+    args = parser.parse_args()
+
+    texts = sample_texts(TXT_FOLDER, args.chars, 2000)
+    nlp = MODELS.get(args.model)
+    service = InferenceService(args.model, workers=args.workers, max_batch=args.max_batch,
+                               max_latency=args.max_latency)
+    # Aquecimento: todos os processos do pool com o modelo carregado
+    for future in [service.submit(text) for text in texts[:args.workers * args.max_batch]]:
+        future.result()
+
+    sample = texts[0]
+    direct = nlp(sample)
+    served = service.to_doc(service.submit(sample).result(), nlp.vocab)
+    if [(t.text, t.pos_) for t in direct] != [(t.text, t.pos_) for t in served]:
+        raise AssertionError("Resultado do serviço difere da chamada direta")
+
+    print(f"{args.model}: {len(texts)} textos de até {args.chars} caracteres, {args.requests} pedidos por sessão, "
+          f"{args.workers} processo(s), lotes de até {args.max_batch}, espera máx. {args.max_latency * 1000:.0f} ms")
+    for sessions in args.sessions:
+        print(f"{sessions} sessão(ões):")
+        summary("direto", *run_load(nlp, texts, sessions, args.requests))
+        before = service.stats()
+        summary("serviço", *run_load(lambda text: service.submit(text).result(), texts, sessions, args.requests))
+        after = service.stats()
+        batches = after['batches'] - before['batches']
+        print(f"  {'':<9} lote médio {(after['requests'] - before['requests']) / max(batches, 1):.1f} textos")
+    service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Compara a concatenação antiga de "3 - merge_txt.py" (todo o corpus em uma lista antes de
+gravar) com a concatenação em fluxo com índice de documentos, sobre copies cópias dos
+arquivos de arquivos/files_txt.
+
+Mede tempo e pico de memória Python (tracemalloc) das duas, confere que o arquivo gerado
+tem os mesmos documentos e compara o acesso a um documento pelo índice (mmap) com a
+releitura do corpus inteiro.
+
+Uso:
+    python benchmarks/benchmark_merge_txt.py --copies 50
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmark_pdf_to_txt import PROJECT_ROOT, load_script
+
+sys.path.insert(0, str(PROJECT_ROOT / "programas"))
+
+from corpus_index import MergedCorpus, read_index  # noqa: E402
+
+TXT_FOLDER = PROJECT_ROOT / "arquivos" / "files_txt"
+
+
+def concatenar_em_lista(pasta_origem, caminho_saida):
+    """Implementação anterior: lê todos os arquivos para a memória e grava no fim."""
+    conteudo_total = []
+    for nome_arquivo in os.listdir(pasta_origem):
+        if nome_arquivo.endswith(".txt"):
+            with open(os.path.join(pasta_origem, nome_arquivo), 'r', encoding='utf-8') as arquivo_entrada:
+                conteudo_total.extend(["\n", arquivo_entrada.read(), "\n\n"])
+    with open(caminho_saida, 'w', encoding='utf-8') as arquivo_saida:
+        arquivo_saida.writelines(conteudo_total)
+
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", default=str(TXT_FOLDER))
+    parser.add_argument("--copies", type=int, default=50, help="cópias de cada arquivo no corpus sintético")
+    parser.add_argument("--lookups", type=int, default=200, help="acessos a documentos medidos")
+    args = parser.parse_args()
+
+    merge_txt = load_script("3 - merge_txt.py", "merge_txt")
+    with tempfile.TemporaryDirectory() as folder:
+        corpus = os.path.join(folder, "files_txt")
+        os.makedirs(corpus)
+        for name in sorted(os.listdir(args.input)):
+            if name.endswith(".txt"):
+                for copy in range(args.copies):
+                    shutil.copy(os.path.join(args.input, name), os.path.join(corpus, f"{copy:04d}-{name}"))
+
+        old_path = os.path.join(folder, "lista.txt")
+        _, old_seconds, old_peak = measure(lambda: concatenar_em_lista(corpus, old_path))
+        cwd = os.getcwd()
+        os.chdir(folder)
+        try:
+            index, new_seconds, new_peak = measure(lambda: merge_txt.concatenar_arquivos_txt(corpus))
+        finally:
+            os.chdir(cwd)
+        new_path = os.path.join(folder, "arquivo_saida.txt")
+
+        with open(old_path, "rb") as f:
+            old_bytes = f.read()
+        with open(new_path, "rb") as f:
+            new_bytes = f.read()
+        if len(old_bytes) != len(new_bytes) or any(
+                b"\n" + new_bytes[e['offset']:e['offset'] + e['length']] + b"\n\n" not in old_bytes
+                for e in read_index(new_path + ".index.jsonl")[:50]):
+            raise AssertionError("Arquivos concatenados com documentos diferentes")
+
+        print(f"{len(index)} documentos, {len(new_bytes) / 1024 / 1024:.1f} MB")
+        print(f"Lista em memória: {old_seconds:6.2f}s | pico {old_peak / 1024:9.0f} KB")
+        print(f"Em fluxo + índice: {new_seconds:6.2f}s | pico {new_peak / 1024:9.0f} KB")
+
+        names = [entry['name'] for entry in index]
+        targets = [names[i * len(names) // args.lookups] for i in range(args.lookups)]
+        with MergedCorpus(new_path) as merged:
+            start = time.perf_counter()
+            for name in targets:
+                merged[name]
+            mmap_seconds = (time.perf_counter() - start) / len(targets)
+        # Sem índice: reler o corpus e procurar o documento pela ordem de concatenação
+        start = time.perf_counter()
+        for name in targets[:5]:
+            with open(new_path, "r", encoding="utf-8") as f:
+                f.read().split("\n\n\n")[names.index(name)]
+        scan_seconds = (time.perf_counter() - start) / 5
+        print(f"Acesso a um documento: mmap {mmap_seconds * 1e6:.0f} µs | releitura {scan_seconds * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Mede o custo por interação de carregar as páginas do app.py (PAGE_MAPPING): como antes
+(ler o arquivo e compilar o código a cada rerun do Streamlit) e com page_loader
+(code object em cache por caminho e mtime, só um os.stat por rerun).
+
+Com --exec, executa também cada página inteira das duas formas (requer streamlit e as
+dependências das páginas; roda sem servidor, como "bare mode", e páginas que falham ao
+importar são ignoradas), para comparar o tempo total de uma interação.
+
+Uso:
+    python benchmarks/benchmark_page_loading.py --repeat 50
+    python benchmarks/benchmark_page_loading.py --exec --repeat 5
+"""
+import argparse
+import ast
+import sys
+import time
+
+from benchmark_pdf_to_txt import PROJECT_ROOT
+
+sys.path.insert(0, str(PROJECT_ROOT / "programas"))
+
+from page_loader import clear_cache, compile_page, run_page  # noqa: E402
+
+APP_PATH = PROJECT_ROOT / "app.py"
+
+
+def page_mapping():
+    """PAGE_MAPPING (rótulo do botão -> arquivo), lido do app.py sem executá-lo."""
+    tree = ast.parse(APP_PATH.read_text(encoding="utf-8"))
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "PAGE_MAPPING" for t in node.targets):
+            return ast.literal_eval(node.value)
+    raise ValueError("PAGE_MAPPING não encontrado em app.py")
+
+
+def page_files():
+    """Arquivos de PAGE_MAPPING."""
+    return list(page_mapping().values())
+
+
+def legacy_load(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return compile(f.read(), str(path), "exec")
+
+
+def legacy_run(path):
+    # Como o run_external_page antigo: lê, compila e executa no namespace do app.py
+    with open(path, "r", encoding="utf-8") as f:
+        exec(f.read(), {"__name__": "__main__", "__file__": str(APP_PATH)})
+
+
+def timed(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50, help="interações simuladas por página")
+    parser.add_argument("--exec", action="store_true", help="executa as páginas inteiras (requer streamlit)")
+    args = parser.parse_args()
+
+    paths = [PROJECT_ROOT / "programas" / name for name in page_files()]
+    print(f"{'Página':<42} {'ler+compilar':>13} {'cache':>10} {'ganho':>8}")
+    totals = [0.0, 0.0]
+    for path in paths:
+        clear_cache()
+        compile_page(path)  # primeira interação compila; as seguintes usam o cache
+        before = timed(lambda: legacy_load(path), args.repeat)
+        after = timed(lambda: compile_page(path), args.repeat)
+        totals[0] += before
+        totals[1] += after
+        print(f"{path.name:<42} {before * 1000:10.2f} ms {after * 1000:7.3f} ms {before / after:7.0f}x")
+    print(f"{'Total':<42} {totals[0] * 1000:10.2f} ms {totals[1] * 1000:7.3f} ms")
+
+    if not args.exec:
+        return
+    print("\nPágina inteira por interação (sem servidor):")
+    for path in paths:
+        try:
+            run_page(path, host_file=str(APP_PATH))
+        except Exception as e:
+            print(f"{path.name:<42} ignorada: {type(e).__name__}: {e}")
+            continue
+        before = timed(lambda: legacy_run(path), args.repeat)
+        after = timed(lambda: run_page(path, host_file=str(APP_PATH)), args.repeat)
+        print(f"{path.name:<42} antes {before * 1000:9.1f} ms | depois {after * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Compara os backends de pdf_extraction (pymupdf, pypdf2, pdfplumber) sobre os PDFs de
+arquivos/files_pdf: tempo, páginas/s e pico de memória Python (tracemalloc; a memória
+interna de bibliotecas em C, como o MuPDF, não entra na conta).
+
+Cada backend é medido lendo do caminho e lendo dos bytes em memória (como um upload do
+Streamlit). Também compara a antiga concatenação com += ao join de extract_text.
+
+Uso:
+    python benchmarks/benchmark_pdf_extraction.py --repeat 1
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmark_pdf_to_txt import PDF_FOLDER
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "programas"))
+
+import pdf_extraction  # noqa: E402
+
+
+def measure(function, repeat):
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    seconds = (time.perf_counter() - start) / repeat
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def run_backend(backend, pdfs, repeat, in_memory):
+    # Importação da biblioteca e primeira abertura fora da medição
+    for _ in pdf_extraction.iter_pages(str(pdfs[0]), backend):
+        pass
+    seconds = peak = pages = chars = 0
+    for pdf in pdfs:
+        source = pdf.read_bytes() if in_memory else str(pdf)
+        texts, pdf_seconds, pdf_peak = measure(
+            lambda: [text for _, _, text in pdf_extraction.iter_pages(source, backend)], repeat)
+        seconds += pdf_seconds
+        peak = max(peak, pdf_peak)
+        pages += len(texts)
+        chars += sum(len(text) for text in texts)
+    return {'seconds': seconds, 'peak': peak, 'pages': pages, 'chars': chars}
+
+
+def concatenate(pages, separator):
+    """Junção página a página usada antes nas páginas do Streamlit."""
+    text = ""
+    for page_text in pages:
+        if page_text:
+            text += page_text + separator
+    return text
+
+
+def run_join(pages, copies, repeat):
+    """Concatenação com += vs join sobre o texto de copies cópias do corpus."""
+    pages = pages * copies
+    _, concat_seconds, concat_peak = measure(lambda: concatenate(pages, "\n"), repeat)
+    _, join_seconds, join_peak = measure(lambda: "\n".join(page for page in pages if page), repeat)
+    print(f"Junção de {len(pages)} páginas: += {concat_seconds * 1000:.1f} ms (pico {concat_peak / 1024:.0f} KB) | "
+          f"join {join_seconds * 1000:.1f} ms (pico {join_peak / 1024:.0f} KB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", default=str(PDF_FOLDER))
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--backends", nargs="+", default=pdf_extraction.available_backends())
+    parser.add_argument("--join-copies", type=int, default=20, help="cópias do corpus no teste de junção")
+    args = parser.parse_args()
+
+    pdfs = sorted(Path(args.input).glob("*.pdf"))
+    print(f"{len(pdfs)} PDFs | backend padrão: {pdf_extraction.default_backend()}")
+    results = {}
+    for backend in args.backends:
+        for in_memory in (False, True):
+            row = run_backend(backend, pdfs, args.repeat, in_memory)
+            results[backend, in_memory] = row
+            print(f"{backend:<11} {'bytes' if in_memory else 'caminho':<8} {row['seconds']:6.2f}s | "
+                  f"{row['pages'] / row['seconds']:7.1f} páginas/s | pico {row['peak'] / 1024:8.0f} KB | "
+                  f"{row['chars']} caracteres")
+
+    fastest = min(results, key=lambda key: results[key]['seconds'])
+    print(f"Mais rápido: {fastest[0]} ({'bytes' if fastest[1] else 'caminho'})")
+
+    pages = [text for pdf in pdfs for _, _, text in pdf_extraction.iter_pages(str(pdf))]
+    run_join(pages, args.join_copies, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
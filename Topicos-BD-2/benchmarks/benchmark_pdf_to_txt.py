@@ -0,0 +1,64 @@
+"""
+Mede a conversão PDF -> TXT de "2 - pdf_to_txt.py" com diferentes números de
+processos sobre os PDFs de arquivos/files_pdf e confere que as saídas são
+idênticas às da conversão sequencial.
+
+Uso:
+    python benchmarks/benchmark_pdf_to_txt.py --workers 1 2 4 8
+"""
+import argparse
+import filecmp
+import importlib.util
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+PDF_FOLDER = PROJECT_ROOT / "arquivos" / "files_pdf"
+
+
+def load_script(filename, module_name):
+    """Importa um script de programas/ cujo nome não é um identificador Python válido."""
+    sys.path.insert(0, str(PROJECT_ROOT / "programas"))
+    spec = importlib.util.spec_from_file_location(module_name, PROJECT_ROOT / "programas" / filename)
+    module = importlib.util.module_from_spec(spec)
+    # Registrado em sys.modules para que os processos do pool encontrem as funções
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--input", default=str(PDF_FOLDER))
+    args = parser.parse_args()
+
+    pdf_to_txt = load_script("2 - pdf_to_txt.py", "pdf_to_txt")
+    timings = {}
+    with tempfile.TemporaryDirectory() as folder:
+        reference = None
+        for workers in sorted(set(args.workers)):
+            output = os.path.join(folder, f"w{workers}")
+            summary = pdf_to_txt.convert_pdfs_to_txt(args.input, output, workers)
+            timings[workers] = summary
+            if reference is None:
+                reference = output
+            else:
+                names = sorted(os.listdir(reference))
+                _, mismatch, errors = filecmp.cmpfiles(reference, output, names, shallow=False)
+                if mismatch or errors:
+                    raise AssertionError(f"Saídas divergentes com {workers} processos: {mismatch + errors}")
+
+    print("-" * 60)
+    base = timings[min(timings)]['elapsed']
+    for workers, summary in timings.items():
+        slowest = max(summary['results'], key=lambda r: r['seconds'])
+        print(f"{workers:>2} processo(s): {summary['elapsed']:6.2f}s | {summary['pages_per_second']:7.1f} páginas/s | "
+              f"ganho {base / summary['elapsed']:.1f}x | arquivo mais lento: {slowest['filename']} "
+              f"({slowest['seconds']:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
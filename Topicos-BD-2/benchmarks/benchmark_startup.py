@@ -0,0 +1,157 @@
+"""
+Mede a partida do app.py e a primeira renderização de cada página, com orçamentos de tempo
+e o perfil das importações (python -X importtime) de cada fase.
+
+Cada medida roda em um processo novo (partida a frio): o app.py é executado com o
+AppTest do Streamlit (sem servidor nem navegador) até a página inicial; depois a página é
+escolhida em session_state["current_page"], como faz o botão do menu, e executada de novo.
+As importações feitas em cada fase são agrupadas por pacote de primeiro nível.
+
+Os tempos das páginas com spaCy incluem a espera pelo modelo, carregado em segundo plano
+desde a página inicial (ver WARMUP_MODELS no app.py).
+
+Requer streamlit e as dependências das páginas. Termina com código 1 se alguma medida
+passar do orçamento.
+
+Uso:
+    python benchmarks/benchmark_startup.py
+    python benchmarks/benchmark_startup.py --pages Tokenizacao "Word Cloud" --repeat 3 --top 15
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from benchmark_page_loading import APP_PATH, page_mapping
+
+# Orçamentos (s) da página inicial a frio e da primeira renderização de cada página
+HOME_BUDGET = 3.0
+PAGE_BUDGET = 1.5
+# Páginas que esperam por um modelo spaCy
+MODEL_PAGE_BUDGET = 20.0
+MODEL_PAGES = {
+    "Reconhecimento de Entidades Nomeadas.py",
+    "Tokenizacao.py",
+    "Classes Gramaticais.py",
+    "Analise de Dependencias.py",
+    "Deteccao de Limites de Frases.py",
+    "Analise de Similaridade.py",
+}
+# Espera máxima (s) por uma execução do app no AppTest
+RUN_TIMEOUT = 600
+
+# Escrito no stderr entre as fases, para separar as linhas do -X importtime
+PHASE_MARKER = "benchmark_startup: fase pagina"
+# Prefixo da linha com o resultado no stdout (o app também imprime mensagens, ex: do aquecimento)
+RESULT_PREFIX = "benchmark_startup: "
+
+
+def page_budget(page_file):
+    return MODEL_PAGE_BUDGET if page_file in MODEL_PAGES else PAGE_BUDGET
+
+
+def errors(app):
+    return [str(getattr(element, "value", element)) for element in list(app.exception) + list(app.error)]
+
+
+def run_child(page_label):
+    """No processo filho: página inicial e, se page_label, a página; imprime os tempos em JSON."""
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(str(APP_PATH), default_timeout=RUN_TIMEOUT)
+    app.run()
+    result = {'home': time.perf_counter() - start, 'home_errors': errors(app)}
+    if page_label:
+        print(PHASE_MARKER, file=sys.stderr, flush=True)
+        app.session_state["current_page"] = page_label
+        start = time.perf_counter()
+        app.run()
+        result.update(page=time.perf_counter() - start, page_errors=errors(app))
+    print(RESULT_PREFIX + json.dumps(result), flush=True)
+
+
+def parse_importtime(lines):
+    """Tempo cumulativo (s) por pacote de primeiro nível das importações de -X importtime."""
+    totals = defaultdict(float)
+    for line in lines:
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        # Só as importações de nível 0 (as aninhadas já estão no cumulativo delas)
+        if name.startswith("  "):
+            continue
+        totals[name.strip().split(".")[0]] += int(cumulative) / 1e6
+    return totals
+
+
+def measure(page_label=None):
+    """Executa um processo filho com -X importtime; devolve os tempos e o perfil de cada fase."""
+    command = [sys.executable, "-X", "importtime", __file__, "--child", page_label or ""]
+    process = subprocess.run(command, capture_output=True, text=True, cwd=APP_PATH.parent)
+    if process.returncode != 0:
+        raise RuntimeError(process.stderr.strip().splitlines()[-1] if process.stderr.strip() else "falhou")
+    result = json.loads(next(line[len(RESULT_PREFIX):] for line in process.stdout.splitlines()
+                             if line.startswith(RESULT_PREFIX)))
+    stderr = process.stderr.splitlines()
+    split = stderr.index(PHASE_MARKER) if PHASE_MARKER in stderr else len(stderr)
+    result['home_imports'] = parse_importtime(stderr[:split])
+    result['page_imports'] = parse_importtime(stderr[split + 1:])
+    return result
+
+
+def format_imports(totals, top):
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+    return ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in ranked) or "nenhuma"
+
+
+def report(label, seconds, budget, error_list, imports, top):
+    status = "ok" if seconds <= budget else "ACIMA DO ORÇAMENTO"
+    print(f"{label:<42} {seconds:7.2f}s (orçamento {budget:5.1f}s) {status}")
+    print(f"  importações: {format_imports(imports, top)}")
+    for message in error_list:
+        print(f"  erro: {message[:200]}")
+    return seconds <= budget
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", nargs="*", help="trechos do nome dos arquivos das páginas (padrão: todas)")
+    parser.add_argument("--repeat", type=int, default=1, help="processos por medida (usa a mediana)")
+    parser.add_argument("--top", type=int, default=10, help="pacotes mostrados no perfil de importações")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplica os orçamentos (máquinas lentas)")
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        run_child(args.child)
+        return
+
+    pages = {label: page_file for label, page_file in page_mapping().items()
+             if not args.pages or any(part.lower() in page_file.lower() for part in args.pages)}
+    within_budget = True
+
+    runs = [measure() for _ in range(args.repeat)]
+    within_budget &= report("Página inicial (a frio)", statistics.median(run['home'] for run in runs),
+                            HOME_BUDGET * args.scale, runs[0]['home_errors'], runs[0]['home_imports'], args.top)
+
+    for label, page_file in pages.items():
+        try:
+            runs = [measure(label) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"{page_file:<42} falhou: {e}")
+            within_budget = False
+            continue
+        within_budget &= report(page_file, statistics.median(run['page'] for run in runs),
+                                page_budget(page_file) * args.scale, runs[0]['page_errors'],
+                                runs[0]['page_imports'], args.top)
+
+    if not within_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Compara, em "2 - pdf_to_txt.py", a extração completa (todas as páginas em memória e
+depois clean_text) com a extração em fluxo (extract_clean_text: página a página para o
+TextCleaner, parando nas referências).
+
+Para cada PDF de arquivos/files_pdf confere que os textos limpos são idênticos e mede o
+tempo, as páginas extraídas e o pico de memória Python (tracemalloc; a memória interna
+do MuPDF não entra na conta). Como quase todos os artigos do corpus usam o título
+"Referências", que a limpeza não corta, também é gerado um PDF sintético com várias
+páginas depois de "REFERENCES".
+
+Uso:
+    python benchmarks/benchmark_streaming_extraction.py --repeat 3 --reference-pages 30
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import fitz
+
+from benchmark_pdf_to_txt import PDF_FOLDER, load_script
+
+
+def build_long_references_pdf(path, body_pages, reference_pages):
+    """Gera um PDF com body_pages de texto seguidas de uma seção REFERENCES longa."""
+    document = fitz.open()
+    paragraph = "Texto do corpo do artigo com resultados e discussão. " * 6
+    for number in range(body_pages):
+        page = document.new_page()
+        page.insert_textbox(fitz.Rect(72, 72, 540, 770), f"{number + 1}. Seção {number + 1}\n" + paragraph * 8)
+    for number in range(reference_pages):
+        page = document.new_page()
+        heading = "REFERENCES\n" if number == 0 else ""
+        entries = "".join(f"[{number * 40 + i}] Autor, A. Título do trabalho citado. Anais, 2024.\n" for i in range(40))
+        page.insert_textbox(fitz.Rect(72, 72, 540, 770), heading + entries)
+    document.save(path)
+    document.close()
+
+
+def measure(function, repeat):
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    seconds = (time.perf_counter() - start) / repeat
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def compare(pdf_to_txt, pdf_path, repeat):
+    def full():
+        raw_text, pages = pdf_to_txt.extract_raw_text(pdf_path)
+        return pdf_to_txt.clean_text(raw_text), pages
+
+    (full_text, full_pages), full_seconds, full_peak = measure(full, repeat)
+    (stream_text, stream_pages, _), stream_seconds, stream_peak = measure(
+        lambda: pdf_to_txt.extract_clean_text(pdf_path), repeat)
+    if stream_text != full_text:
+        raise AssertionError(f"Texto limpo divergente para {pdf_path}")
+    return {
+        'name': os.path.basename(pdf_path),
+        'pages': (full_pages, stream_pages),
+        'seconds': (full_seconds, stream_seconds),
+        'peak': (full_peak, stream_peak),
+    }
+
+
+def print_row(row):
+    full_seconds, stream_seconds = row['seconds']
+    full_peak, stream_peak = row['peak']
+    print(f"{row['name'][:32]:<32} páginas {row['pages'][0]:>3} -> {row['pages'][1]:>3} | "
+          f"{full_seconds * 1000:7.1f} -> {stream_seconds * 1000:7.1f} ms | "
+          f"pico {full_peak / 1024:7.0f} -> {stream_peak / 1024:7.0f} KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", default=str(PDF_FOLDER))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--body-pages", type=int, default=6, help="páginas de corpo do PDF sintético")
+    parser.add_argument("--reference-pages", type=int, default=30, help="páginas de referências do PDF sintético")
+    args = parser.parse_args()
+
+    pdf_to_txt = load_script("2 - pdf_to_txt.py", "pdf_to_txt")
+    print("Extração completa -> em fluxo")
+    rows = [compare(pdf_to_txt, str(pdf), args.repeat) for pdf in sorted(Path(args.input).glob("*.pdf"))]
+    for row in rows:
+        print_row(row)
+    totals = [sum(row['seconds'][i] for row in rows) for i in (0, 1)]
+    pages = [sum(row['pages'][i] for row in rows) for i in (0, 1)]
+    print(f"Corpus ({len(rows)} PDFs, textos idênticos): {pages[0]} -> {pages[1]} páginas extraídas, "
+          f"{totals[0]:.2f}s -> {totals[1]:.2f}s, maior pico "
+          f"{max(row['peak'][0] for row in rows) / 1024:.0f} -> {max(row['peak'][1] for row in rows) / 1024:.0f} KB")
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "referencias_longas.pdf")
+        build_long_references_pdf(path, args.body_pages, args.reference_pages)
+        print(f"PDF sintético ({args.body_pages} páginas de corpo + {args.reference_pages} de referências):")
+        print_row(compare(pdf_to_txt, path, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Mede a tabela de vetores reduzida (vector_tables) de um modelo spaCy com vetores:
+
+- memória de um processo novo que carrega o modelo e processa os PDFs, com a tabela
+  completa e com a reduzida: RSS e memória anônima (a que não pode ser compartilhada; as
+  páginas do arquivo mapeado ficam fora dela);
+- diferença em Doc.similarity entre pares de PDFs de arquivos/files_pdf e entre pares de
+  trechos, da tabela completa para a reduzida, e a cobertura (palavras com vetor);
+- tokens com as mesmas anotações (tag, POS, dependência), já que o tok2vec do lg também
+  usa os vetores;
+- o mesmo com uma tabela gerada sem os textos de metade dos PDFs, como acontece com PDFs
+  novos enviados pelo usuário (palavras fora do corpus ficam sem vetor).
+
+Uso:
+    python benchmarks/benchmark_vector_tables.py --model pt_core_news_lg --top-rows 50000
+"""
+import argparse
+import importlib
+import itertools
+import multiprocessing
+import random
+import sys
+import tempfile
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from benchmark_pdf_to_txt import PDF_FOLDER, PROJECT_ROOT
+
+sys.path.insert(0, str(PROJECT_ROOT / "programas"))
+
+from pdf_extraction import extract_text  # noqa: E402
+from spacy_models import MODELS, ModelRegistry  # noqa: E402
+from text_chunking import iter_chunks  # noqa: E402
+from vector_tables import CORPUS_FOLDER, DEFAULT_TOP_ROWS, build_table, use_table  # noqa: E402
+
+
+def memory_info():
+    """RSS e memória anônima do processo em bytes, de /proc/self/smaps_rollup (Linux)."""
+    fields = {}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name in ("Rss", "Anonymous"):
+                    fields[name] = int(value.split()[0]) * 1024
+    except OSError:
+        return None
+    return fields
+
+
+def measure_memory(model, table, texts):
+    """Em um processo novo: memória usada para carregar model (com table, se dada) e processar texts."""
+    # A importação do spaCy fica fora da medida
+    importlib.import_module("spacy")
+    registry = ModelRegistry()
+    if table is not None:
+        registry.vector_tables[model] = table
+    before = memory_info()
+    start = time.perf_counter()
+    nlp = registry.get(model)
+    seconds = time.perf_counter() - start
+    for doc in nlp.pipe(texts):
+        doc.vector
+    after = memory_info()
+    if before is None or after is None:
+        return None, seconds
+    return {name: after[name] - before[name] for name in before}, seconds
+
+
+def similarities(nlp, texts, pairs):
+    docs = [nlp.make_doc(text) for text in texts]
+    with warnings.catch_warnings():
+        # W008: documento sem nenhuma palavra com vetor
+        warnings.simplefilter("ignore")
+        return np.array([docs[i].similarity(docs[j]) for i, j in pairs])
+
+
+def coverage(nlp, texts):
+    """Fração das palavras (tokens alfabéticos) com vetor."""
+    flags = [token.has_vector for doc in nlp.tokenizer.pipe(texts) for token in doc if token.is_alpha]
+    return sum(flags) / len(flags) if flags else 0.0
+
+
+def annotations(nlp, texts):
+    return [[(token.tag_, token.pos_, token.dep_) for token in doc] for doc in nlp.pipe(texts)]
+
+
+def agreement(reference, other):
+    pairs = [(a, b) for doc_a, doc_b in zip(reference, other) for a, b in zip(doc_a, doc_b)]
+    return sum(a == b for a, b in pairs) / len(pairs) if pairs else 1.0
+
+
+def report_drift(label, reference, values):
+    diff = np.abs(values - reference)
+    return f"{label} dif. média {diff.mean():.5f}, máx. {diff.max():.5f}" if len(diff) else f"{label} -"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="pt_core_news_lg")
+    parser.add_argument("--top-rows", type=int, default=DEFAULT_TOP_ROWS)
+    parser.add_argument("--input", default=str(PDF_FOLDER))
+    parser.add_argument("--corpus", default=str(CORPUS_FOLDER), help="pasta com os .txt do corpus")
+    parser.add_argument("--chars", type=int, default=1000, help="tamanho dos trechos")
+    parser.add_argument("--chunk-pairs", type=int, default=500)
+    parser.add_argument("--tagged-chunks", type=int, default=100, help="trechos usados na comparação das anotações")
+    args = parser.parse_args()
+
+    pdfs = {path.stem: extract_text(str(path)) for path in sorted(Path(args.input).glob("*.pdf"))}
+    corpus = {path.stem: path.read_text(encoding="utf-8") for path in sorted(Path(args.corpus).glob("*.txt"))}
+    names = list(pdfs)
+    # PDFs "novos": fora do corpus da segunda tabela
+    held_out = set(names[1::2])
+    texts = [pdfs[name] for name in names]
+    chunks = [(name, chunk) for name in names for chunk in iter_chunks(pdfs[name], args.chars) if chunk.strip()]
+    rng = random.Random(0)
+    pdf_pairs = list(itertools.combinations(range(len(names)), 2))
+    chunk_pairs = [tuple(rng.sample(range(len(chunks)), 2)) for _ in range(args.chunk_pairs)]
+    tagged = rng.sample(range(len(chunks)), min(args.tagged_chunks, len(chunks)))
+    chunk_texts = [chunk for _, chunk in chunks]
+
+    nlp = MODELS.get(args.model)
+    reference = {
+        'pdfs': similarities(nlp, texts, pdf_pairs),
+        'chunks': similarities(nlp, chunk_texts, chunk_pairs),
+        'coverage': coverage(nlp, texts),
+        'annotations': annotations(nlp, [chunk_texts[i] for i in tagged]),
+    }
+
+    with tempfile.TemporaryDirectory() as folder:
+        tables = {
+            'corpus todo': (Path(folder) / "todo", list(corpus.values()), set()),
+            f'sem {len(held_out)} PDFs': (Path(folder) / "parcial",
+                                          [text for name, text in corpus.items() if name not in held_out], held_out),
+        }
+        metas = {label: build_table(nlp, corpus_texts, path, top_rows=args.top_rows)
+                 for label, (path, corpus_texts, _) in tables.items()}
+
+        meta = metas['corpus todo']
+        print(f"{args.model}: {meta['original_rows']} -> {meta['rows']} linhas "
+              f"({meta['corpus_words']} palavras do corpus + {args.top_rows} mais frequentes), "
+              f"{meta['original_bytes'] / 1024 / 1024:.0f} MB (float32) -> {meta['bytes'] / 1024 / 1024:.0f} MB (float16)")
+
+        print(f"Memória ao carregar o modelo e processar {len(texts)} PDFs (processo novo):")
+        for label, table in (("completa", None), ("reduzida", str(tables['corpus todo'][0]))):
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(1, mp_context=context) as executor:
+                memory, seconds = executor.submit(measure_memory, args.model, table, texts).result()
+            if memory is None:
+                print(f"  {label:<9} carga {seconds:.2f}s (memória não disponível neste sistema)")
+            else:
+                print(f"  {label:<9} RSS +{memory['Rss'] / 1024 / 1024:6.0f} MB | "
+                      f"anônima +{memory['Anonymous'] / 1024 / 1024:6.0f} MB | carga {seconds:.2f}s")
+
+        print(f"Doc.similarity da tabela completa para a reduzida ({len(pdf_pairs)} pares de PDFs, "
+              f"{len(chunk_pairs)} pares de trechos de {args.chars} caracteres):")
+        print(f"  completa: cobertura {reference['coverage']:.2%}")
+        for label, (path, _, excluded) in tables.items():
+            use_table(nlp, path)
+            # Pares com algum PDF fora do corpus da tabela (todos, para a do corpus todo)
+            pdf_index = [k for k, (i, j) in enumerate(pdf_pairs) if not excluded or {names[i], names[j]} & excluded]
+            chunk_index = [k for k, (i, j) in enumerate(chunk_pairs)
+                           if not excluded or {chunks[i][0], chunks[j][0]} & excluded]
+            values = {
+                'pdfs': similarities(nlp, texts, [pdf_pairs[k] for k in pdf_index]),
+                'chunks': similarities(nlp, chunk_texts, [chunk_pairs[k] for k in chunk_index]),
+            }
+            checked = [texts[i] for i, name in enumerate(names) if not excluded or name in excluded]
+            same = agreement(reference['annotations'], annotations(nlp, [chunk_texts[i] for i in tagged]))
+            print(f"  {label}: {report_drift('PDFs', reference['pdfs'][pdf_index], values['pdfs'])} | "
+                  f"{report_drift('trechos', reference['chunks'][chunk_index], values['chunks'])} | "
+                  f"cobertura {coverage(nlp, checked):.2%} | anotações iguais {same:.2%}")
+
+
+if __name__ == "__main__":
+    main()
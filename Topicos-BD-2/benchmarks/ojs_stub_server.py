@@ -0,0 +1,235 @@
+"""
+Servidor HTTP local que imita as páginas de um anais OJS (sol.sbc.org.br).
+
+Serve uma página de edição com links de galeria PDF e os próprios PDFs
+(usando os arquivos de arquivos/files_pdf), com latência configurável para
+simular a espera de rede. Responde a requisições condicionais (ETag /
+Last-Modified -> 304) e parciais (Range -> 206), e pode cortar a primeira
+transferência de alguns PDFs para simular quedas de conexão. Usado pelos
+benchmarks de download.
+
+Rotas:
+    /index.php/webmedia/issue/archive[/<pagina>]            arquivo de edições (paginado)
+    /index.php/webmedia/issue/view/<edicao>                 página da edição
+    /index.php/webmedia/article/view/<artigo>/<galeria>     página de visualização do PDF
+    /index.php/webmedia/article/download/<artigo>/<galeria> o PDF
+"""
+import hashlib
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+PDF_FOLDER = PROJECT_ROOT / "arquivos" / "files_pdf"
+
+ARCHIVE_RE = re.compile(r'^/index\.php/webmedia/issue/archive(?:/(\d+))?/?$')
+ISSUE_RE = re.compile(r'^/index\.php/webmedia/issue/view/(\d+)/?$')
+VIEW_RE = re.compile(r'^/index\.php/webmedia/article/view/(\d+)/(\d+)/?$')
+DOWNLOAD_RE = re.compile(r'^/index\.php/webmedia/article/download/(\d+)/(\d+)/?$')
+
+
+class OJSStubServer:
+    """
+    Servidor OJS falso executado em uma thread.
+
+    Args:
+        issues (dict): {id_da_edicao: número_de_artigos}.
+        latency (float): Atraso (s) antes de responder cada requisição.
+        port (int): Porta local (0 escolhe uma livre).
+        interrupt (int): Número de PDFs cuja primeira transferência é cortada pela metade.
+    """
+
+    LAST_MODIFIED = "Mon, 23 Sep 2024 12:00:00 GMT"
+    ISSUES_PER_ARCHIVE_PAGE = 2
+
+    def __init__(self, issues=None, latency=0.2, port=0, interrupt=0):
+        self.issues = issues or {1361: 20}
+        self.latency = latency
+        self.pdfs = sorted(PDF_FOLDER.glob("*.pdf"))
+        if not self.pdfs:
+            raise FileNotFoundError(f"Nenhum PDF encontrado em {PDF_FOLDER}")
+        self._pdf_bytes = {}
+        self.requests = Counter()
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self.articles = {}  # galeria -> (edicao, artigo, caminho do pdf)
+        article_id = 30000
+        for issue_id, count in self.issues.items():
+            for _ in range(count):
+                galley_id = article_id + 5000
+                self.articles[galley_id] = (issue_id, article_id, self.pdfs[len(self.articles) % len(self.pdfs)])
+                article_id += 1
+        self.to_interrupt = set(sorted(self.articles)[:interrupt])
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def archive_url(self):
+        return f"{self.base_url}/index.php/webmedia/issue/archive"
+
+    def issue_url(self, issue_id):
+        return f"{self.base_url}/index.php/webmedia/issue/view/{issue_id}"
+
+    def download_urls(self, issue_id=None):
+        return [
+            f"{self.base_url}/index.php/webmedia/article/download/{article_id}/{galley_id}"
+            for galley_id, (issue, article_id, _) in sorted(self.articles.items())
+            if issue_id is None or issue == issue_id
+        ]
+
+    def pdf_bytes(self, galley_id):
+        path = self.articles[galley_id][2]
+        if path not in self._pdf_bytes:
+            self._pdf_bytes[path] = path.read_bytes()
+        return self._pdf_bytes[path]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _record(self, kind, nbytes):
+        with self._lock:
+            self.requests[kind] += 1
+            self.bytes_sent += nbytes
+
+    def _archive_html(self, page):
+        issue_ids = sorted(self.issues)
+        per_page = self.ISSUES_PER_ARCHIVE_PAGE
+        pages = max(1, -(-len(issue_ids) // per_page))
+        if not 1 <= page <= pages:
+            return None
+        items = ''.join(
+            f'<li><a class="title" href="/index.php/webmedia/issue/view/{issue_id}">Edição {issue_id}</a></li>'
+            for issue_id in issue_ids[(page - 1) * per_page:page * per_page]
+        )
+        nav = ''.join(
+            f'<a href="/index.php/webmedia/issue/archive/{number}">{number}</a>' for number in range(1, pages + 1)
+        )
+        return f"<html><body><ul class='issues_archive'>{items}</ul><div class='cmp_pagination'>{nav}</div></body></html>"
+
+    def _issue_html(self, issue_id):
+        items = []
+        for galley_id, (issue, article_id, pdf_path) in sorted(self.articles.items()):
+            if issue != issue_id:
+                continue
+            items.append(
+                f'<div class="obj_article_summary"><h3 class="title">{pdf_path.stem}</h3>'
+                f'<ul class="galleys_links"><li>'
+                f'<a class="obj_galley_link pdf" href="/index.php/webmedia/article/view/{article_id}/{galley_id}">PDF</a>'
+                f'</li></ul></div>'
+            )
+        return f"<html><body><h1>Edição {issue_id}</h1>{''.join(items)}</body></html>"
+
+    def _view_html(self, article_id, galley_id):
+        return (
+            f'<html><body><header><a class="download" '
+            f'href="/index.php/webmedia/article/download/{article_id}/{galley_id}">'
+            f'<span class="label">Baixar</span></a></header></body></html>'
+        )
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body, content_type, kind, extra_headers=None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (extra_headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+                stub._record(kind, len(body))
+
+            def _send_html(self, html, kind):
+                body = html.encode("utf-8")
+                etag = '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+                if self.headers.get("If-None-Match") == etag:
+                    return self._send(304, b"", "text/html; charset=utf-8", f"{kind}_304", {"ETag": etag})
+                return self._send(200, body, "text/html; charset=utf-8", kind, {"ETag": etag})
+
+            def _send_pdf(self, galley_id):
+                body = stub.pdf_bytes(galley_id)
+                etag = '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+                validators = {"ETag": etag, "Last-Modified": stub.LAST_MODIFIED, "Accept-Ranges": "bytes"}
+                if self.headers.get("If-None-Match") == etag:
+                    return self._send(304, b"", "application/pdf", "pdf_304", validators)
+
+                range_header = self.headers.get("Range", "")
+                if_range = self.headers.get("If-Range")
+                if range_header.startswith("bytes=") and if_range in (None, etag, stub.LAST_MODIFIED):
+                    first = int(range_header[len("bytes="):].split("-")[0])
+                    if first >= len(body):
+                        return self._send(416, b"", "application/pdf", "pdf_416",
+                                          {"Content-Range": f"bytes */{len(body)}"})
+                    validators["Content-Range"] = f"bytes {first}-{len(body) - 1}/{len(body)}"
+                    return self._send(206, body[first:], "application/pdf", "pdf_206", validators)
+
+                with stub._lock:
+                    cut = galley_id in stub.to_interrupt
+                    stub.to_interrupt.discard(galley_id)
+                if cut:
+                    # Anuncia o tamanho completo mas envia só metade e fecha a conexão
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/pdf")
+                    self.send_header("Content-Length", str(len(body)))
+                    for name, value in validators.items():
+                        self.send_header(name, value)
+                    self.end_headers()
+                    self.wfile.write(body[:len(body) // 2])
+                    self.wfile.flush()
+                    self.close_connection = True
+                    stub._record("pdf_cut", len(body) // 2)
+                    return
+                return self._send(200, body, "application/pdf", "pdf", validators)
+
+            def do_GET(self):
+                if stub.latency:
+                    time.sleep(stub.latency)
+                path = self.path.split('?', 1)[0]
+
+                match = ARCHIVE_RE.match(path)
+                if match:
+                    html = stub._archive_html(int(match.group(1) or 1))
+                    if html is not None:
+                        return self._send_html(html, "archive")
+
+                match = ISSUE_RE.match(path)
+                if match and int(match.group(1)) in stub.issues:
+                    return self._send_html(stub._issue_html(int(match.group(1))), "issue")
+
+                match = VIEW_RE.match(path)
+                if match and int(match.group(2)) in stub.articles:
+                    return self._send_html(stub._view_html(match.group(1), match.group(2)), "view")
+
+                match = DOWNLOAD_RE.match(path)
+                if match and int(match.group(2)) in stub.articles:
+                    return self._send_pdf(int(match.group(2)))
+
+                self._send(404, b"Not Found", "text/plain", "404")
+
+        return Handler
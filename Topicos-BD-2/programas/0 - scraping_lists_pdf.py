@@ -1,28 +1,20 @@
+import os
 import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 
-def list_pdfs_on_page(url):
-    """
-    Acessa uma URL, encontra e lista todos os links para arquivos PDF,
-    com foco na estrutura da página da SBC.
+from sbc_crawler import resolve_view_pages
+from sbc_download import DownloadManifest, HostRateLimiter, create_session, fetch_page, fetch_with_retry
 
-    Args:
-        url (str): A URL da página web para analisar.
-    """
-    print(f"Acessando URL: {url}")
-    
+def find_pdfs(url, get_html):
+    """Links de PDF da página url (ver list_pdfs_on_page), ou None se ela não pôde ser lida."""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status() # Lança exceção para erros HTTP
+        content = get_html(url, timeout=15)
     except requests.exceptions.RequestException as e:
         print(f"Erro ao acessar a URL {url}: {e}")
-        return
+        return None
 
-    soup = BeautifulSoup(response.content, 'html.parser')
+    soup = BeautifulSoup(content, 'html.parser')
     
     found_pdfs = set() # Usar um set para armazenar URLs únicas
     
@@ -50,27 +42,53 @@ def list_pdfs_on_page(url):
             if "pdf" in link.get_text().lower() or link.find('span', class_='label', string='PDF'):
                  found_pdfs.add(absolute_url) # Adiciona a URL da página de visualização do PDF
 
-    # 3. Faz uma requisição para as URLs de visualização (se encontradas) para extrair o link de download direto
-    download_links_from_views = set()
-    for pdf_view_url in found_pdfs.copy(): # Itera sobre uma cópia, pois o set pode ser modificado
-        if "/article/view/" in urlparse(pdf_view_url).path.lower() and pdf_view_url not in found_pdfs:
-            print(f"  Explorando página de visualização de PDF: {pdf_view_url}")
-            try:
-                view_response = requests.get(pdf_view_url, headers=headers, timeout=10)
-                view_response.raise_for_status()
-                view_soup = BeautifulSoup(view_response.content, 'html.parser')
+    # 3. Faz uma requisição para as URLs de visualização (se encontradas) para extrair o link de download direto.
+    # As páginas são resolvidas em paralelo; cada uma é substituída pelos seus links de download.
+    view_urls = sorted(link for link in found_pdfs if "/article/view/" in urlparse(link).path.lower())
+    for view_url in view_urls:
+        print(f"  Explorando página de visualização de PDF: {view_url}")
+    resolved = resolve_view_pages(view_urls, fetch=lambda page_url: get_html(page_url, timeout=10))
+    for view_url, download_links in resolved.items():
+        if download_links:
+            found_pdfs.discard(view_url)
+            found_pdfs.update(download_links) # Adiciona ao set principal
+    return found_pdfs
 
-                # Procura pelo link de download real dentro da página de visualização
-                for download_link in view_soup.find_all('a', href=True, class_=['pdf', 'btn-primary']):
-                    dl_href = download_link['href']
-                    dl_absolute_url = urljoin(pdf_view_url, dl_href)
-                    dl_parsed_url = urlparse(dl_absolute_url)
+def list_pdfs_on_page(url, cache_folder=None):
+    """
+    Acessa uma URL, encontra e lista todos os links para arquivos PDF,
+    com foco na estrutura da página da SBC.
+
+    Args:
+        url (str): A URL da página web para analisar.
+        cache_folder (str): Se informado, as páginas HTML passam pelo cache de respostas
+            de sbc_download (manifesto + requisições condicionais) guardado nesta pasta.
+    """
+    print(f"Acessando URL: {url}")
+    
+    # Sessão e limite de requisições por host compartilhados por todas as páginas,
+    # inclusive as de visualização buscadas em paralelo
+    session = create_session()
+    rate_limiter = HostRateLimiter()
+    manifest = None
+    if cache_folder:
+        manifest = DownloadManifest(os.path.join(cache_folder, "manifest.json"))
+
+    def get_html(page_url, timeout):
+        if manifest is not None:
+            return fetch_page(session, page_url, manifest, cache_folder, rate_limiter)
+        # Lança exceção para erros HTTP (depois das novas tentativas)
+        with fetch_with_retry(session, page_url, rate_limiter, timeout=timeout) as page_response:
+            return page_response.content
 
-                    if dl_parsed_url.path.lower().endswith('.pdf') or '/download/' in dl_parsed_url.path.lower():
-                        download_links_from_views.add(dl_absolute_url)
-                        found_pdfs.add(dl_absolute_url) # Adiciona ao set principal
-            except requests.exceptions.RequestException as e:
-                print(f"  Erro ao explorar {pdf_view_url}: {e}")
+    try:
+        found_pdfs = find_pdfs(url, get_html)
+    finally:
+        session.close()
+        if manifest is not None:
+            manifest.compact()
+    if found_pdfs is None:
+        return
 
     if found_pdfs:
         print("\nArquivos PDF encontrados:")
@@ -91,11 +109,13 @@ def list_pdfs_on_page(url):
 # --- Bloco de execução principal ---
 if __name__ == "__main__":
     target_url = "https://sol.sbc.org.br/index.php/webmedia/issue/view/1361"
+    # Pasta do cache de páginas HTML (None desativa o cache)
+    cache_folder = ".cache_html"
 
     print("Iniciando a listagem de PDFs.")
     print("-" * 50)
 
-    list_pdfs_on_page(target_url)
+    list_pdfs_on_page(target_url, cache_folder)
 
     print("-" * 50)
     print("Listagem concluída.")
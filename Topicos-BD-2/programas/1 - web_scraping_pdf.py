@@ -3,7 +3,16 @@ import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 
-def scrape_and_download_pdfs_sbc(url, download_folder="sbc_pdfs_baixados"):
+from sbc_download import (DownloadManifest, create_session, download_pdfs_concurrently, fetch_page,
+                          print_download_summary)
+
+# Manifesto (URL -> sha256, tamanho, ETag/Last-Modified, caminho) e cache de HTML,
+# ambos guardados dentro da pasta de downloads
+MANIFEST_FILENAME = "manifest.json"
+HTML_CACHE_FOLDER = ".cache_html"
+
+def scrape_and_download_pdfs_sbc(url, download_folder="sbc_pdfs_baixados", concurrent=False,
+                                 max_workers=8, requests_per_second=4.0, use_manifest=True):
     """
     Acessa uma URL específica da SBC (e.g., https://sol.sbc.org.br/index.php/webmedia/issue/view/1361),
     encontra os links para as páginas de visualização de artigos, constrói os links diretos
@@ -12,6 +21,13 @@ def scrape_and_download_pdfs_sbc(url, download_folder="sbc_pdfs_baixados"):
     Args:
         url (str): A URL da página web para analisar e baixar PDFs.
         download_folder (str): O nome da pasta onde os PDFs serão salvos.
+        concurrent (bool): Se True, baixa os PDFs em paralelo com uma sessão keep-alive
+            compartilhada, limite de taxa por host e novas tentativas com backoff.
+        max_workers (int): Número de downloads simultâneos no modo concorrente.
+        requests_per_second (float): Limite de requisições por segundo por host no modo concorrente.
+        use_manifest (bool): Se True, registra cada download em um manifesto e usa requisições
+            condicionais e retomada por Range, de modo que uma nova execução sobre uma edição
+            inalterada quase não transfere dados. A página da edição passa pelo mesmo cache.
     """
     print("=" * 70)
     print("INICIANDO WEB SCRAPING, LISTAGEM E DOWNLOAD DE PDFs")
@@ -29,14 +45,23 @@ def scrape_and_download_pdfs_sbc(url, download_folder="sbc_pdfs_baixados"):
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
     }
     
+    manifest = session = None
+    if use_manifest:
+        manifest = DownloadManifest(os.path.join(download_folder, MANIFEST_FILENAME))
+        session = create_session(pool_size=max_workers)
+
     try:
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status() # Lança exceção para erros HTTP (4xx ou 5xx)
+        if use_manifest:
+            content = fetch_page(session, url, manifest, os.path.join(download_folder, HTML_CACHE_FOLDER))
+        else:
+            response = requests.get(url, headers=headers, timeout=15)
+            response.raise_for_status() # Lança exceção para erros HTTP (4xx ou 5xx)
+            content = response.content
     except requests.exceptions.RequestException as e:
         print(f"Erro ao acessar a URL principal {url}: {e}")
         return
 
-    soup = BeautifulSoup(response.content, 'html.parser')
+    soup = BeautifulSoup(content, 'html.parser')
     
     # Conjunto para armazenar somente os links diretos de download de PDF construídos
     direct_pdf_download_links = set() 
@@ -76,6 +101,20 @@ def scrape_and_download_pdfs_sbc(url, download_folder="sbc_pdfs_baixados"):
     
     print("-" * 50)
     print("\nIniciando o download dos arquivos PDF...")
+
+    if concurrent or use_manifest:
+        if not concurrent:
+            max_workers = 1
+        print(f"Downloads com {max_workers} worker(s), até {requests_per_second} requisições/s por host.")
+        summary = download_pdfs_concurrently(sorted_pdf_links, download_folder, max_workers=max_workers,
+                                             requests_per_second=requests_per_second,
+                                             session=session, manifest=manifest)
+        if session is not None:
+            session.close()
+        print_download_summary(summary)
+        print(f"\nProcesso de download concluído. Total de {summary['downloaded']} PDFs baixados para '{download_folder}'.")
+        return summary
+
     downloaded_count = 0
 
     for pdf_url in sorted_pdf_links: # Itera sobre os links diretos
@@ -128,8 +167,12 @@ if __name__ == "__main__":
     SBC_TARGET_URL = "https://sol.sbc.org.br/index.php/webmedia/issue/view/1361"
     # Pasta onde os PDFs baixados da SBC serão salvos
     SBC_DOWNLOAD_FOLDER = "files_pdf"
+    # Downloads em paralelo (False mantém o download sequencial, um arquivo por vez)
+    SBC_CONCURRENT = True
+    SBC_MAX_WORKERS = 8
 
-    scrape_and_download_pdfs_sbc(SBC_TARGET_URL, SBC_DOWNLOAD_FOLDER)
+    scrape_and_download_pdfs_sbc(SBC_TARGET_URL, SBC_DOWNLOAD_FOLDER,
+                                 concurrent=SBC_CONCURRENT, max_workers=SBC_MAX_WORKERS)
 
     print("\n" + "=" * 70)
     print("PROGRAMA FINALIZADO.")
@@ -1,157 +1,208 @@
-import fitz  # PyMuPDF
+import hashlib
+import inspect
+import json
 import os
-import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-def clean_text(text):
-    """
-    Realiza operações de limpeza no texto extraído:
-    - Normaliza quebras de linha e remove caracteres de avanço de página.
-    - Tenta remover nomes de autores e afiliações (abordagem heurística, linguagem agnóstica).
-    - Remove as seções ABSTRACT (Inglês) e KEYWORDS (Inglês).
-    - Remove o cabeçalho INTRODUCTION (Inglês) se for um título de seção.
-    - Remove as seções REFERENCES/BIBLIOGRAPHY (Inglês).
-    - Tenta remover números de página.
-    - Normaliza espaços em branco para delimitação de parágrafos e palavras.
+import text_cleaning
+from pdf_extraction import iter_pages
+from text_cleaning import TextCleaner, clean_text
+
+def _cleaner_version():
+    """Carimbo de versão de clean_text: muda sempre que o código do módulo text_cleaning muda."""
+    try:
+        source = inspect.getsource(text_cleaning).encode("utf-8")
+    except (OSError, TypeError):
+        source = clean_text.__code__.co_code
+    return hashlib.sha256(source).hexdigest()[:16]
+
+CLEANER_VERSION = _cleaner_version()
+
+# Subpasta da pasta de saída com o texto bruto extraído de cada PDF (modo incremental)
+RAW_CACHE_FOLDER = ".raw"
+
+# Backend de pdf_extraction usado na conversão; fixo para que o texto bruto (e o limpo) não
+# mude conforme as bibliotecas instaladas e o cache incremental continue válido
+PDF_BACKEND = "pymupdf"
+
+def _sha256_file(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def extract_raw_text(pdf_path):
+    """Extrai o texto bruto de todas as páginas. Returns: (texto, número de páginas)."""
+    full_text = [page_text for _, _, page_text in iter_pages(pdf_path, backend=PDF_BACKEND)]
+    return "\n".join(full_text), len(full_text)
+
+def extract_clean_text(pdf_path, raw_file=None, raw_head=None):
     """
-    # 1. Normaliza quebras de linha e remove caracteres de avanço de página
-    text = text.replace('\r\n', '\n').replace('\r', '\n')
-    text = text.replace('\x0c', '') # Caractere de avanço de página
+    Extrai e limpa o texto de um PDF página a página (ver text_cleaning.TextCleaner).
 
-    lines = text.split('\n')
-    
-    # --- 2. Tentativa de remover Nomes de Autores e Afiliações (altamente heurística) ---
-    # Aplica-se às primeiras linhas. Esta parte é linguagem agnóstica.
-    main_content_start_index = 0
-    # Limita a busca às primeiras 50 linhas para eficiência e relevância
-    for i, line in enumerate(lines[:min(50, len(lines))]):
-        line_lower = line.lower().strip()
-        # Procura por marcadores de início de conteúdo principal (English/Portuguese)
-        if (
-            line_lower.startswith('abstract') or line_lower.startswith('resumo') or
-            line_lower.startswith('introdução') or line_lower.startswith('introduction') or
-            re.match(r'^\d+\.?\s+[A-Z]', line_lower) or # Ex: "1. Título"
-            re.match(r'^[IVX]+\.?\s+[A-Z]', line_lower) # Ex: "I. Título"
-        ):
-            main_content_start_index = i
-            break
-        # Heurística para linhas longas que não parecem ser metadados de autor
-        elif len(line_lower.split()) > 10 and not any(
-            keyword in line_lower for keyword in ['email', 'university', 'department', 'institute', 'college', 'orcid', 'instituição', 'affiliation', 'author']
-        ):
-            main_content_start_index = i
+    A extração para assim que a seção REFERENCES/BIBLIOGRAPHY é confirmada, pois todo o
+    resto seria descartado pela limpeza. Em memória ficam só a página atual e o texto já limpo.
+
+    Args:
+        raw_file (file): Se informado, recebe o texto bruto de cada página extraída.
+        raw_head (list): Se informada, recebe o início do texto bruto (até 10001 caracteres),
+            usado no log de erro.
+
+    Returns:
+        tuple: (texto limpo, páginas extraídas, total de páginas do PDF)
+    """
+    cleaner = TextCleaner()
+    pages = page_count = head_size = 0
+    for page_num, page_count, page_text in iter_pages(pdf_path, backend=PDF_BACKEND):
+        if page_num:
+            page_text = "\n" + page_text
+        if raw_file is not None:
+            raw_file.write(page_text)
+        if raw_head is not None and head_size <= 10000:
+            raw_head.append(page_text[:10001 - head_size])
+            head_size += len(raw_head[-1])
+        pages += 1
+        if cleaner.feed(page_text):
             break
-        
-    # Se um potencial início de conteúdo principal foi encontrado, verifica se o bloco anterior
-    # realmente contém padrões de autor para evitar remover introduções legítimas.
-    if main_content_start_index > 0:
-        potential_author_block = "\n".join(lines[:main_content_start_index]).lower()
-        if any(keyword in potential_author_block for keyword in ['email', 'university', 'department', 'institute', 'college', 'orcid', 'instituição', 'affiliation', 'author']):
-            lines = lines[main_content_start_index:]
-        # Caso contrário, mantém as linhas originais, pois não encontrou padrões fortes de autor.
-
-
-    # Re-junta as linhas para aplicar regex de blocos maiores
-    text = '\n'.join(lines)
-    
-    # --- 3. Remove seções ABSTRACT (Inglês) e KEYWORDS (Inglês) ---
-    # Remove ABSTRACT (Inglês)
-    abstract_pattern_en = re.compile(
-        r'\bABSTRACT\b.*?'  # Captura ABSTRACT
-        r'(?='  # Lookahead para o fim da seção ABSTRACT
-        r'\bKEYWORDS\b'         # Fim se encontrar KEYWORDS (English)
-        r'|\bRESUMO\b'          # Fim se encontrar RESUMO (Portuguese) - para não remover
-        r'|\b(?:1\.\s*Introduction|I\.\s*INTRODUCTION)\b' # Fim se encontrar Introduction (English)
-        r'|\bPALAVRAS-CHAVE\b'  # Fim se encontrar PALAVRAS-CHAVE (Portuguese) - para não remover
-        r'|\b\d+\.\s+[A-Z][a-zA-Z\s]+' # Ou início de nova seção numerada
-        r'|\b[IVX]+\.\s+[A-Z][a-zA-Z\s]+' # Ou início de nova seção romana
-        r'|\n\n[A-Z]'           # Ou duas quebras de linha seguidas por uma letra maiúscula (novo parágrafo/seção)
-        r'|\Z'                  # Ou fim do documento
-        r')',
-        re.IGNORECASE | re.DOTALL
-    )
-    text = abstract_pattern_en.sub('', text)
-
-    # Remove KEYWORDS (Inglês) - se não foi pego pelo ABSTRACT_pattern_en
-    keywords_only_pattern_en = re.compile(
-        r'\bKEYWORDS\b.*?'
-        r'(?='
-        r'\bPALAVRAS-CHAVE\b'  # Fim se encontrar PALAVRAS-CHAVE (Portuguese) - para não remover
-        r'|\b(?:1\.\s*Introduction|I\.\s*INTRODUCTION)\b' # Fim se encontrar Introduction (English)
-        r'|\b\d+\.\s+[A-Z][a-zA-Z\s]+'
-        r'|\b[IVX]+\.\s+[A-Z][a-zA-Z\s]+'
-        r'|\n\n[A-Z]'
-        r'|\Z'
-        r')',
-        re.IGNORECASE | re.DOTALL
-    )
-    text = keywords_only_pattern_en.sub('', text)
-
-    # --- 4. Remove o cabeçalho INTRODUCTION (Inglês) ---
-    # Procura por linhas que são estritamente o cabeçalho INTRODUCTION, com ou sem numeração.
-    # Ex: "1. Introduction", "I. INTRODUCTION", "Introduction"
-    introduction_heading_pattern_en = re.compile(
-        r'^\s*(?:\d+\.?\s*|[IVX]+\.?\s*)?INTRODUCTION\s*$',
-        re.IGNORECASE | re.MULTILINE
-    )
-    # Substitui a linha do cabeçalho por uma string vazia para ser limpa depois
-    text = introduction_heading_pattern_en.sub('\n', text)
-
-    # --- 5. Remove a seção de Referências (Inglês: REFERENCES/BIBLIOGRAPHY) ---
-    # Captura "REFERENCES" ou "BIBLIOGRAPHY" (case-insensitive) e tudo o que segue.
-    references_pattern_en = re.compile(
-        r'\b(?:REFERENCES|BIBLIOGRAPHY)\b.*',
-        re.IGNORECASE | re.DOTALL
-    )
-    text = references_pattern_en.sub('', text)
-
-    # --- 6. Remove números de página ---
-    # Opera linha a linha para remover linhas que contêm APENAS um número de página.
-    lines = text.split('\n')
-    cleaned_lines_without_page_numbers = []
-    
-    # Regex para identificar uma linha que é *apenas* um número de página
-    # Suporta números arábicos (até 4 dígitos) e romanos (até 4 caracteres),
-    # opcionalmente envolvidos por hífens/traços e espaços.
-    page_number_regex = re.compile(r'^\s*[-–—]?\s*(?:\d{1,4}|[ivxlcdmIVXLCDM]{1,4})\s*[-–—]?\s*$')
-
-    for line in lines:
-        stripped_line = line.strip()
-        if not stripped_line:
-            # Mantém linhas vazias para que a estrutura de parágrafos não seja prejudicada antes da normalização final
-            cleaned_lines_without_page_numbers.append(line)
-            continue
-
-        # Verifica se a linha corresponde ao padrão de número de página
-        if page_number_regex.match(stripped_line):
-            # Adiciona uma heurística extra para evitar falsos positivos.
-            # Se a linha for curta (até 9 caracteres) E for puramente numérica ou romana, a removemos.
-            if len(stripped_line) < 10 and (
-                stripped_line.isdigit() or 
-                re.fullmatch(r'[ivxlcdmIVXLCDM]+', stripped_line.replace('-', '').replace('–', '').replace('—', '').strip())
-            ):
-                continue # Remove a linha se for um número de página
-        
-        # Se não for um número de página (ou for um falso positivo), mantém a linha
-        cleaned_lines_without_page_numbers.append(line)
-
-    text = '\n'.join(cleaned_lines_without_page_numbers)
-
-    # --- 7. Normaliza parágrafos e palavras ---
-    # Substitui múltiplas quebras de linha por no máximo duas (simulando quebra de parágrafo)
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    # Substitui múltiplos espaços (e tabulações) por um único espaço
-    text = re.sub(r'[ \t]{2,}', ' ', text)
-    # Remove espaços em branco do início/fim de cada linha
-    text = '\n'.join([line.strip() for line in text.split('\n')])
-    # Remove linhas vazias que podem ter resultado das operações anteriores
-    text = '\n'.join(filter(lambda x: x.strip(), text.split('\n')))
-
-    return text
-
-def convert_pdfs_to_txt(input_folder, output_folder):
+    return cleaner.finish(), pages, page_count
+
+def reclean_raw_text(raw_path, raw_complete):
+    """
+    Limpa de novo o texto bruto guardado em RAW_CACHE_FOLDER.
+
+    Um texto bruto incompleto (a extração parou nas referências) também serve, desde que a
+    limpeza atual confirme REFERENCES/BIBLIOGRAPHY dentro dele: o resto do PDF seria
+    descartado de qualquer forma, e o resultado é o mesmo de clean_text no texto inteiro.
+
+    Returns:
+        tuple: (texto limpo, ou None se o PDF precisa ser extraído de novo; início do texto
+        bruto, para o log de erro)
+    """
+    with open(raw_path, "r", encoding="utf-8") as f:
+        raw_text = f.read()
+    cleaner = TextCleaner()
+    if not cleaner.feed(raw_text) and not raw_complete:
+        return None, raw_text[:10001]
+    return cleaner.finish(), raw_text[:10001]
+
+def convert_pdf_to_txt(pdf_path, txt_path, incremental=False):
+    """
+    Converte um único PDF em TXT limpo.
+
+    Em caso de erro, grava um arquivo <nome>_error.log ao lado do TXT com a
+    mensagem e o início do texto bruto extraído.
+
+    As páginas são extraídas e limpas uma a uma, e as páginas depois da seção de
+    referências não são extraídas (ver extract_clean_text).
+
+    No modo incremental, grava <nome>.meta.json ao lado do TXT (sha256 do PDF,
+    CLEANER_VERSION, se o texto bruto está completo, páginas guardadas e total de páginas)
+    e guarda o texto bruto extraído em RAW_CACHE_FOLDER, inclusive quando a extração parou
+    nas referências. Numa nova execução:
+    - PDF e limpeza inalterados: nada é feito ('skipped');
+    - só a limpeza mudou: o texto bruto em cache é limpo de novo, sem abrir o PDF
+      ('recleaned'), se estiver completo ou se a nova limpeza ainda encontrar as referências
+      nas páginas guardadas (ver reclean_raw_text);
+    - caso contrário, o PDF é extraído normalmente ('converted').
+
+    Returns:
+        dict: filename, status, pages (extraídas nesta execução), pages_skipped (não extraídas por
+        estarem depois das referências), chars, seconds e error (None se ok).
+    """
+    filename = os.path.basename(pdf_path)
+    output_folder = os.path.dirname(txt_path)
+    base_name = os.path.splitext(filename)[0]
+    meta_path = os.path.join(output_folder, f"{base_name}.meta.json")
+    raw_path = os.path.join(output_folder, RAW_CACHE_FOLDER, f"{base_name}.txt")
+    start = time.perf_counter()
+    result = {'filename': filename, 'status': 'converted', 'pages': 0, 'pages_skipped': 0, 'chars': 0,
+              'seconds': 0.0, 'error': None}
+    raw_head = []  # Início do texto bruto, para o log de erro
+    try:
+        pdf_sha256 = meta = None
+        if incremental:
+            pdf_sha256 = _sha256_file(pdf_path)
+            meta = _read_json(meta_path)
+            if meta and meta.get('pdf_sha256') != pdf_sha256:
+                meta = None
+
+        if meta and meta.get('cleaner_version') == CLEANER_VERSION and os.path.exists(txt_path):
+            result['status'] = 'skipped'
+        else:
+            raw_complete = True
+            raw_pages = page_count = None
+            cleaned_final_text = None
+            if meta and os.path.exists(raw_path):
+                # Metadados anteriores a raw_complete sempre guardavam o texto bruto inteiro
+                raw_complete = meta.get('raw_complete', True)
+                cleaned_final_text, head = reclean_raw_text(raw_path, raw_complete)
+                raw_head.append(head)
+            if cleaned_final_text is not None:
+                # O texto bruto em cache continua o mesmo
+                raw_pages, page_count = meta.get('raw_pages'), meta.get('page_count')
+                result['status'] = 'recleaned'
+            elif incremental:
+                raw_head.clear()
+                os.makedirs(os.path.dirname(raw_path), exist_ok=True)
+                with open(raw_path, "w", encoding="utf-8") as raw_file:
+                    cleaned_final_text, result['pages'], page_count = extract_clean_text(pdf_path, raw_file, raw_head)
+                raw_pages = result['pages']
+                raw_complete = raw_pages == page_count
+            else:
+                cleaned_final_text, result['pages'], page_count = extract_clean_text(pdf_path, raw_head=raw_head)
+            if result['status'] == 'converted':
+                result['pages_skipped'] = page_count - result['pages']
+
+            with open(txt_path, "w", encoding="utf-8") as f:
+                f.write(cleaned_final_text)
+            result['chars'] = len(cleaned_final_text)
+
+            if incremental:
+                with open(meta_path, "w", encoding="utf-8") as f:
+                    json.dump({'pdf_sha256': pdf_sha256, 'cleaner_version': CLEANER_VERSION,
+                               'raw_complete': raw_complete, 'raw_pages': raw_pages,
+                               'page_count': page_count}, f)
+
+    except Exception as e:
+        result['error'] = str(e)
+        # Opcional: Salvar o erro em um arquivo de log
+        error_log_path = os.path.join(output_folder, f"{base_name}_error.log")
+        with open(error_log_path, "w", encoding="utf-8") as err_f:
+            err_f.write(f"Erro ao processar '{filename}': {e}\n")
+            err_f.write("Texto original extraído (antes da limpeza):\n")
+            # Registra até os primeiros 10000 caracteres do texto bruto em caso de erro
+            raw_text_head = "".join(raw_head)
+            err_f.write(raw_text_head[:10000] + ("..." if len(raw_text_head) > 10000 else "")) 
+
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+def convert_pdfs_to_txt(input_folder, output_folder, workers=1, incremental=False):
     """
     Lê todos os arquivos PDF na pasta de entrada, converte-os para TXT
     e os salva na pasta de saída após a limpeza.
+
+    Args:
+        input_folder (str): Pasta com os PDFs.
+        output_folder (str): Pasta onde os TXT serão salvos.
+        workers (int): Número de processos usados na conversão. Com 1 (padrão) a
+            conversão é feita no próprio processo; com mais, os PDFs são distribuídos
+            em um pool de processos (None usa um processo por núcleo).
+        incremental (bool): Se True, pula PDFs cujo conteúdo e versão da limpeza não
+            mudaram desde a última execução (ver convert_pdf_to_txt).
+
+    Returns:
+        dict: files, converted, recleaned, skipped, failed, pages, pages_skipped, elapsed, pages_per_second e
+        results (um dict por arquivo, ver convert_pdf_to_txt), ou None se não houver o que converter.
     """
     if not os.path.exists(input_folder):
         print(f"Erro: A pasta de entrada '{input_folder}' não existe.")
@@ -167,41 +218,67 @@ def convert_pdfs_to_txt(input_folder, output_folder):
         print(f"Nenhum arquivo PDF encontrado na pasta '{input_folder}'.")
         return
 
-    print(f"Iniciando conversão de {len(pdf_files)} arquivos PDF para TXT...")
-    for filename in pdf_files:
-        pdf_path = os.path.join(input_folder, filename)
-        txt_filename = os.path.splitext(filename)[0] + ".txt"
-        txt_path = os.path.join(output_folder, txt_filename)
-
-        print(f"Processando '{filename}'...")
-        try:
-            document = fitz.open(pdf_path)
-            full_text = []
-            for page_num in range(document.page_count):
-                page = document.load_page(page_num)
-                # Extrai texto bruto, ignorando colunas visuais para uma saída de coluna única.
-                # page.get_text("text") é a melhor opção para texto puro sem layout complexo.
-                full_text.append(page.get_text("text")) 
-            document.close()
-
-            combined_text = "\n".join(full_text)
-            cleaned_final_text = clean_text(combined_text)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(pdf_files)))
 
-            with open(txt_path, "w", encoding="utf-8") as f:
-                f.write(cleaned_final_text)
-            print(f"Concluído: '{filename}' -> '{txt_filename}'.")
+    print(f"Iniciando conversão de {len(pdf_files)} arquivos PDF para TXT ({workers} processo(s))...")
+    jobs = [
+        (os.path.join(input_folder, filename),
+         os.path.join(output_folder, os.path.splitext(filename)[0] + ".txt"))
+        for filename in pdf_files
+    ]
 
-        except Exception as e:
-            print(f"Erro ao processar '{filename}': {e}")
-            # Opcional: Salvar o erro em um arquivo de log
-            with open(os.path.join(output_folder, f"{os.path.splitext(filename)[0]}_error.log"), "w", encoding="utf-8") as err_f:
-                err_f.write(f"Erro ao processar '{filename}': {e}\n")
-                err_f.write("Texto original extraído (antes da limpeza):\n")
-                # Registra até os primeiros 10000 caracteres do texto bruto em caso de erro
-                err_f.write(combined_text[:10000] + ("..." if len(combined_text) > 10000 else "")) 
-            
+    start = time.perf_counter()
+    if workers == 1:
+        results = []
+        for pdf_path, txt_path in jobs:
+            print(f"Processando '{os.path.basename(pdf_path)}'...")
+            results.append(convert_pdf_to_txt(pdf_path, txt_path, incremental))
+            _report(results[-1])
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(convert_pdf_to_txt, pdf_path, txt_path, incremental) for pdf_path, txt_path in jobs]
+            results = []
+            for future in as_completed(futures):
+                results.append(future.result())
+                _report(results[-1])
+    elapsed = time.perf_counter() - start
 
-    print("Conversão de PDFs para TXT concluída.")
+    total_pages = sum(r['pages'] for r in results)
+    skipped_pages = sum(r['pages_skipped'] for r in results)
+    summary = {
+        'files': len(results),
+        'converted': sum(1 for r in results if r['status'] == 'converted' and not r['error']),
+        'recleaned': sum(1 for r in results if r['status'] == 'recleaned' and not r['error']),
+        'skipped': sum(1 for r in results if r['status'] == 'skipped' and not r['error']),
+        'failed': sum(1 for r in results if r['error']),
+        'pages': total_pages,
+        'pages_skipped': skipped_pages,
+        'elapsed': elapsed,
+        'pages_per_second': total_pages / elapsed if elapsed else 0.0,
+        'results': sorted(results, key=lambda r: r['filename']),
+    }
+    print(f"Conversão de PDFs para TXT concluída: {summary['files']} arquivos, {total_pages} páginas "
+          f"em {elapsed:.2f}s ({summary['pages_per_second']:.1f} páginas/s, {summary['failed']} com erro).")
+    if skipped_pages:
+        print(f"{skipped_pages} páginas depois das referências não precisaram ser extraídas.")
+    if incremental:
+        print(f"Incremental: {summary['converted']} extraídos, {summary['recleaned']} limpos de novo "
+              f"a partir do cache, {summary['skipped']} inalterados.")
+    return summary
+
+def _report(result):
+    txt_filename = os.path.splitext(result['filename'])[0] + ".txt"
+    if result['error']:
+        print(f"Erro ao processar '{result['filename']}': {result['error']}")
+    elif result['status'] == 'skipped':
+        print(f"Inalterado: '{result['filename']}'.")
+    elif result['status'] == 'recleaned':
+        print(f"Limpo novamente (texto bruto em cache): '{result['filename']}' -> '{txt_filename}'.")
+    else:
+        print(f"Concluído: '{result['filename']}' -> '{txt_filename}' "
+              f"({result['pages']} páginas em {result['seconds']:.2f}s).")
 
 # Bloco de execução principal
 if __name__ == "__main__":
@@ -214,10 +291,15 @@ if __name__ == "__main__":
     # Esta pasta será criada automaticamente se não existir.
     output_folder_path = "files_txt"
 
+    # Número de processos de conversão (None usa todos os núcleos; 1 converte sequencialmente).
+    workers = None
+    # Pula PDFs já convertidos cujo conteúdo e limpeza não mudaram.
+    incremental = True
+
     print(f"Início do programa de conversão de PDF para TXT.")
     print(f"Lendo arquivos PDF de: '{input_folder_path}'")
     print(f"Salvando arquivos TXT em: '{output_folder_path}'")
 
-    convert_pdfs_to_txt(input_folder_path, output_folder_path)
+    convert_pdfs_to_txt(input_folder_path, output_folder_path, workers, incremental)
 
     print("\nPrograma concluído.")
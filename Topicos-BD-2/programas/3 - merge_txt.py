@@ -1,73 +1,138 @@
+import codecs
+import hashlib
 import os
 
+from corpus_index import index_path_for, write_index
+
+# Tamanho dos blocos copiados de cada arquivo para o de saída
+CHUNK_SIZE = 1024 * 1024
+
+# Separadores gravados antes e depois de cada documento no arquivo concatenado
+SEPARADOR_INICIO = b"\n"
+SEPARADOR_FIM = b"\n\n"
+
+def copiar_documento(arquivo_entrada, arquivo_saida, chunk_size=CHUNK_SIZE):
+    """
+    Copia um arquivo em blocos, validando o UTF-8 e calculando o sha256 no caminho.
+    As quebras de linha CRLF e CR viram LF, como na leitura em modo texto.
+
+    Returns:
+        tuple: (bytes gravados, sha256 hexadecimal dos bytes gravados)
+
+    Raises:
+        UnicodeDecodeError: Se o conteúdo não for UTF-8 válido.
+    """
+    decodificador = codecs.getincrementaldecoder("utf-8")()
+    digest = hashlib.sha256()
+    tamanho = 0
+    pendente = b""
+    for bloco in iter(lambda: arquivo_entrada.read(chunk_size), b""):
+        decodificador.decode(bloco)
+        bloco = pendente + bloco
+        # Um "\r" no fim do bloco pode ser a primeira metade de um "\r\n"
+        pendente = b"\r" if bloco.endswith(b"\r") else b""
+        bloco = bloco[:len(bloco) - len(pendente)].replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        digest.update(bloco)
+        arquivo_saida.write(bloco)
+        tamanho += len(bloco)
+    decodificador.decode(b"", final=True)
+    if pendente:
+        digest.update(b"\n")
+        arquivo_saida.write(b"\n")
+        tamanho += 1
+    return tamanho, digest.hexdigest()
+
 def concatenar_arquivos_txt(pasta_origem, nome_arquivo_saida="arquivo_saida.txt"):
     """
-    Lê todos os arquivos .txt em uma pasta de origem e concatena seus
-    conteúdos em um único arquivo de saída.
+    Concatena em fluxo os arquivos .txt de uma pasta de origem em um único arquivo
+    de saída e grava ao lado o índice de documentos (corpus_index), com nome,
+    deslocamento, tamanho em bytes e sha256 de cada um.
+
+    Os arquivos são copiados em blocos: a memória usada não cresce com o corpus.
 
     Args:
         pasta_origem (str): O caminho para a pasta que contém os arquivos .txt.
         nome_arquivo_saida (str): O nome do arquivo .txt que será criado.
+
+    Returns:
+        list: Entradas do índice (vazia se nada foi concatenado).
     """
     # Cria o caminho completo para o arquivo de saída
     # caminho_arquivo_saida = os.path.join(pasta_origem, nome_arquivo_saida)
     caminho_arquivo_saida = os.path.join('./', nome_arquivo_saida)
-    
-    # Lista para armazenar o conteúdo de todos os arquivos
-    conteudo_total = []
-    
-    # Contador de arquivos processados
-    arquivos_processados = 0
+    caminho_indice = index_path_for(caminho_arquivo_saida)
+    # Gravados em arquivos temporários e trocados no fim, para que o arquivo e o índice
+    # anteriores continuem válidos se a execução for interrompida
+    caminho_temporario = caminho_arquivo_saida + ".tmp"
+
+    indice = []
 
     print(f"Iniciando a concatenação dos arquivos .txt na pasta: {pasta_origem}")
-    
+
     try:
-        # Itera sobre todos os arquivos e pastas no diretório de origem
-        for nome_arquivo in os.listdir(pasta_origem):
-            # Verifica se o arquivo termina com '.txt'
-            if nome_arquivo.endswith(".txt") and nome_arquivo != nome_arquivo_saida:
+        nomes_arquivos = sorted(os.listdir(pasta_origem))
+    except FileNotFoundError:
+        print(f"ERRO: A pasta '{pasta_origem}' não foi encontrada. Verifique o caminho.")
+        return indice
+
+    try:
+        with open(caminho_temporario, 'wb') as arquivo_saida:
+            for nome_arquivo in nomes_arquivos:
+                # Verifica se o arquivo termina com '.txt'
+                if not nome_arquivo.endswith(".txt") or nome_arquivo == nome_arquivo_saida:
+                    continue
                 caminho_completo = os.path.join(pasta_origem, nome_arquivo)
-                
-                # Abre e lê o conteúdo do arquivo
+                inicio = arquivo_saida.tell()
                 try:
-                    with open(caminho_completo, 'r', encoding='utf-8') as arquivo_entrada:
-                        conteudo = arquivo_entrada.read()
-                        
-                        # Adiciona o conteúdo lido à lista, com uma linha separadora (opcional)
-                        conteudo_total.append("\n")
-                        conteudo_total.append(conteudo)
-                        conteudo_total.append("\n\n")
-                        arquivos_processados += 1
-                        print(f"  -> Arquivo lido com sucesso: {nome_arquivo}")
-                
+                    with open(caminho_completo, 'rb') as arquivo_entrada:
+                        arquivo_saida.write(SEPARADOR_INICIO)
+                        tamanho, sha256 = copiar_documento(arquivo_entrada, arquivo_saida)
+                        arquivo_saida.write(SEPARADOR_FIM)
+                    indice.append({
+                        'name': nome_arquivo,
+                        'offset': inicio + len(SEPARADOR_INICIO),
+                        'length': tamanho,
+                        'sha256': sha256,
+                    })
+                    print(f"  -> Arquivo lido com sucesso: {nome_arquivo}")
+                    continue
                 except UnicodeDecodeError:
                     print(f"  -> ATENÇÃO: Não foi possível ler o arquivo {nome_arquivo} devido a erro de codificação. Pulando.")
                 except Exception as e:
                     print(f"  -> ERRO ao ler o arquivo {nome_arquivo}: {e}")
+                # Descarta o que já tinha sido copiado do arquivo pulado
+                arquivo_saida.seek(inicio)
+                arquivo_saida.truncate()
 
         # Verifica se algum arquivo foi processado
-        if arquivos_processados == 0:
+        if not indice:
+            os.remove(caminho_temporario)
             print("Nenhum arquivo .txt encontrado para processar (ou apenas o arquivo de saída).")
-            return
+            return indice
 
-        # Escreve todo o conteúdo acumulado no arquivo de saída
-        with open(caminho_arquivo_saida, 'w', encoding='utf-8') as arquivo_saida:
-            arquivo_saida.writelines(conteudo_total)
+        write_index(caminho_indice + ".tmp", indice)
+        os.replace(caminho_temporario, caminho_arquivo_saida)
+        os.replace(caminho_indice + ".tmp", caminho_indice)
 
         print("-" * 50)
-        print(f"✅ SUCESSO! {arquivos_processados} arquivo(s) .txt concatenado(s).")
+        print(f"✅ SUCESSO! {len(indice)} arquivo(s) .txt concatenado(s).")
         print(f"Arquivo final gerado em: {caminho_arquivo_saida}")
+        print(f"Índice de documentos em: {caminho_indice}")
         print("-" * 50)
 
-    except FileNotFoundError:
-        print(f"ERRO: A pasta '{pasta_origem}' não foi encontrada. Verifique o caminho.")
     except Exception as e:
         print(f"Ocorreu um erro inesperado: {e}")
+        if os.path.exists(caminho_temporario):
+            os.remove(caminho_temporario)
+        return []
+
+    return indice
 
 # --- EXECUTANDO O PROGRAMA ---
 
-# 1. Defina o caminho para a sua pasta.
-pasta_dos_arquivos = "./files_txt"
+if __name__ == "__main__":
+    # 1. Defina o caminho para a sua pasta.
+    pasta_dos_arquivos = "./files_txt"
 
-# 2. Chame a função
-concatenar_arquivos_txt(pasta_dos_arquivos)
+    # 2. Chame a função
+    concatenar_arquivos_txt(pasta_dos_arquivos)
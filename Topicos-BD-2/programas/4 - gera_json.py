@@ -1,32 +1,27 @@
 import os
 import json
 import re
-import PyPDF2
-import spacy
 from datetime import datetime
 
-# Verificar e carregar modelos de idioma do spaCy
-try:
-    nlp_pt = spacy.load('pt_core_news_sm')
-    nlp_en = spacy.load('en_core_web_sm')
-except OSError:
-    print("Erro: Modelos do spaCy não encontrados.")
-    print("Execute no terminal:")
-    print("python -m spacy download en_core_web_sm")
-    print("python -m spacy download pt_core_news_sm")
-    exit(1)
+from article_store import ArticleJSONLWriter, iter_articles, write_column_store
+from document_segmenter import segment_document
+from language_detection import detect_languages
+from pdf_extraction import extract_text
+from spacy_models import MODELS, ModelNotFoundError
+from text_chunking import iter_chunks, iter_paragraphs
+
+# Modelo spaCy de cada idioma, carregado só quando o primeiro texto daquele idioma é
+# processado (um corpus só em português não carrega o modelo de inglês)
+LANGUAGE_MODELS = {
+    'Português': 'pt_core_news_sm',
+    'Inglês': 'en_core_web_sm',
+}
+DEFAULT_LANGUAGE = 'Inglês'  # Modelo usado quando o idioma é indeterminado
 
 def extract_text_from_pdf(pdf_path):
-    """Extrai texto de um arquivo PDF"""
+    """Extrai texto de um arquivo PDF (backend mais rápido disponível em pdf_extraction)"""
     try:
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ''
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + '\n'
-            return text
+        return extract_text(pdf_path)
     except Exception as e:
         print(f"Erro ao extrair texto de {pdf_path}: {str(e)}")
         return ""
@@ -50,8 +45,17 @@ def detect_language(text):
     else:
         return 'Indeterminado'
 
-def extract_metadata(text, pdf_path, filename):
-    """Extrai metadados do texto do PDF"""
+DATE_RE = re.compile(
+    r'\b\d{2}/\d{2}/\d{4}\b'
+    r'|\b\d{4}-\d{2}-\d{2}\b'
+    r'|\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4}\b'
+)
+# Início de cada referência: "[1]" no começo da linha ou, sem essa numeração, "1.", "•" ou "-"
+BRACKET_REFERENCE_RE = re.compile(r'\n\[\d+\]\s*')
+REFERENCE_SPLIT_RE = re.compile(r'\n\d+\.?\s*|\n•\s*|\n-\s*')
+
+def extract_metadata(text, pdf_path, filename, segments=None):
+    """Extrai metadados do texto do PDF (segments: resultado de segment_document(text), se já calculado)"""
     if not text:
         return {
             'titulo': 'Título não encontrado',
@@ -66,90 +70,47 @@ def extract_metadata(text, pdf_path, filename):
             'artigo_completo': ''
         }
     
-    lines = text.split('\n')
+    # Uma única passada pelo texto encontra todas as seções; cada campo lê só o seu trecho
+    if segments is None:
+        segments = segment_document(text)
     
-    # Extrair título (primeira linha não vazia com pelo menos 3 palavras)
-    title = 'Título não encontrado'
-    for line in lines:
-        if len(line.strip().split()) >= 3:
-            title = line.strip()
-            break
-    
-    # Extrair autores (linhas após o título até o resumo)
-    authors_section = []
-    in_authors = False
-    for line in lines:
-        if line.strip() and not in_authors and title in line:
-            in_authors = True
-            continue
-        if in_authors and ('abstract' in line.lower() or 'resumo' in line.lower() or 'introduction' in line.lower()):
-            break
-        if in_authors and line.strip() and len(line.strip().split()) <= 5:
-            authors_section.append(line.strip())
+    # Título: primeira linha não vazia com pelo menos 3 palavras
+    title = segments.content('title') or 'Título não encontrado'
     
-    # Processar autores
+    # Autores: linhas curtas entre o título e a primeira seção (resumo, palavras-chave, introdução)
     authors = []
-    for author in authors_section[:5]:  # Limite de 5 autores
-        if author:
+    for line in (segments.content('authors') or '').split('\n'):
+        line = line.strip()
+        if line and len(line.split()) <= 5:
             authors.append({
-                'nome': author,
+                'nome': line,
                 'afiliacao': 'Afiliação não encontrada',
                 'orcid': 'ORCID não encontrado'
             })
+            if len(authors) == 5:  # Limite de 5 autores
+                break
     
-    # Extrair resumo
-    abstract = 'Resumo não encontrado'
-    abstract_patterns = [
-        r'(?i)abstract[:\s]*\n(.+?)(?=\n\n|\n\w|\nIntroduction|\nINTRODUCTION)',
-        r'(?i)resumo[:\s]*\n(.+?)(?=\n\n|\n\w|\nIntrodução|\nINTRODUÇÃO)',
-        r'(?i)summary[:\s]*\n(.+?)(?=\n\n|\n\w)'
-    ]
+    # Resumo: seção Abstract/Summary ou, na falta dela, Resumo
+    abstract = segments.content('abstract') or segments.content('resumo') or 'Resumo não encontrado'
     
-    for pattern in abstract_patterns:
-        abstract_match = re.search(pattern, text, re.DOTALL)
-        if abstract_match:
-            abstract = abstract_match.group(1).strip()
-            break
-    
-    # Extrair palavras-chave
-    keywords = []
-    keywords_patterns = [
-        r'(?i)keywords[:\s]*\n(.+?)(?=\n\n|\n\w)',
-        r'(?i)palavras-chave[:\s]*\n(.+?)(?=\n\n|\n\w)'
-    ]
-    
-    for pattern in keywords_patterns:
-        keywords_match = re.search(pattern, text)
-        if keywords_match:
-            keywords_text = keywords_match.group(1)
-            keywords = [k.strip() for k in re.split(r'[;,]', keywords_text) if k.strip()]
-            break
+    # Palavras-chave: seção Keywords/Palavras-chave, separadas por vírgula ou ponto e vírgula
+    keywords_text = segments.content('keywords') or ''
+    keywords = [k.strip().rstrip('.') for k in re.split(r'[;,]', keywords_text) if k.strip().rstrip('.')]
     
     if not keywords:
         keywords = ['Palavras-chave não encontradas']
     
-    # Extrair data
-    date = 'Data não encontrada'
-    date_patterns = [
-        r'\b\d{2}/\d{2}/\d{4}\b',
-        r'\b\d{4}-\d{2}-\d{2}\b',
-        r'\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4}\b'
-    ]
-    
-    for pattern in date_patterns:
-        date_match = re.search(pattern, text)
-        if date_match:
-            date = date_match.group()
-            break
+    # Data: primeira data do texto em qualquer dos formatos, em uma só busca
+    date_match = DATE_RE.search(text)
+    date = date_match.group() if date_match else 'Data não encontrada'
     
-    # Extrair referências
+    # Referências: entradas da seção de referências, separadas pela numeração
     references = []
-    references_pattern = r'(?i)(references|referências|bibliography)[:\s]*\n(.+?)(?=\n\n|\Z)'
-    references_match = re.search(references_pattern, text, re.DOTALL)
-    
-    if references_match:
-        references_text = references_match.group(2)
-        references = [ref.strip() for ref in re.split(r'\n\d+\.?\s*|\n•\s*|\n-\s*', references_text) if ref.strip()]
+    references_text = segments.content('references')
+    if references_text:
+        references_text = '\n' + references_text
+        split_re = BRACKET_REFERENCE_RE if BRACKET_REFERENCE_RE.search(references_text) else REFERENCE_SPLIT_RE
+        references = [ref.strip() for ref in split_re.split(references_text) if ref.strip()]
     
     if not references:
         references = ['Referências não encontradas']
@@ -167,35 +128,156 @@ def extract_metadata(text, pdf_path, filename):
         'artigo_completo': text[:5000]  # Limitar o texto completo para evitar arquivos muito grandes
     }
 
+# Componentes que não contribuem para token.text, token.pos_ e token.lemma_
+# (POS vem do tagger/morphologizer + attribute_ruler; o lematizador só usa POS e morfologia)
+UNUSED_COMPONENTS = ("parser", "ner", "senter")
+
+# Limite de caracteres por artigo (None processa o artigo inteiro; antes era 10.000)
+NLP_MAX_CHARS = None
+
+# Tamanho máximo dos trechos enviados ao spaCy: o artigo é dividido em parágrafos/frases
+# e a memória do processamento depende do trecho, não do tamanho do artigo (None não divide)
+NLP_CHUNK_CHARS = 10000
+
+# Idioma detectado por parágrafo (lingua, em lote): cada parágrafo vai para o modelo do
+# seu idioma, e os sem idioma definido usam o do artigo (False usa o do artigo para tudo)
+PARAGRAPH_LANGUAGE = True
+# Parágrafos maiores que isto são divididos em frases antes da detecção
+PARAGRAPH_CHARS = 2000
+
+def select_nlp(language):
+    """Modelo spaCy do idioma detectado (inglês quando indeterminado), carregado no primeiro uso"""
+    return MODELS.get(LANGUAGE_MODELS.get(language, LANGUAGE_MODELS[DEFAULT_LANGUAGE]))
+
+def _doc_annotations(doc):
+    return [token.text for token in doc], [token.pos_ for token in doc], [token.lemma_ for token in doc]
+
+def _section_cuts(segments):
+    """Posições de início e fim das seções, usadas como cortes adicionais dos parágrafos."""
+    return [position for span in segments for position in (span.start, span.end)]
+
+def _split_text(text, chunk_chars, paragraph_language, cuts=None):
+    """
+    Trechos do texto: parágrafos (cortados também nos limites das seções) ou blocos de
+    chunk_chars. cuts são os limites das seções, se já calculados (ver _section_cuts).
+    """
+    if paragraph_language:
+        if cuts is None:
+            cuts = _section_cuts(segment_document(text))
+        return list(iter_paragraphs(text, min(PARAGRAPH_CHARS, chunk_chars or PARAGRAPH_CHARS), cuts))
+    return list(iter_chunks(text, chunk_chars)) if chunk_chars else [text]
+
+def _detect_piece_languages(pieces):
+    try:
+        return detect_languages(pieces)
+    except ImportError:
+        print("Aviso: lingua não instalado; usando o idioma de cada artigo.")
+        return [None] * len(pieces)
+
+def process_texts_nlp(items, batch_size=16, n_process=1, max_chars=NLP_MAX_CHARS, chunk_chars=NLP_CHUNK_CHARS,
+                      paragraph_language=PARAGRAPH_LANGUAGE):
+    """
+    Processa vários textos com nlp.pipe, só com os componentes necessários para
+    tokenização, POS tagging e lematização. Cada texto é dividido em trechos; com
+    paragraph_language, o idioma de todos os parágrafos é detectado em uma chamada em lote
+    e os parágrafos são agrupados por idioma, cada grupo em lotes do modelo do seu idioma.
+    As anotações dos trechos são concatenadas na ordem original do texto.
+
+    Args:
+        items (list): Pares (texto, idioma do artigo), ou triplas (texto, idioma, limites
+            das seções) quando o texto já foi segmentado, para não segmentá-lo de novo.
+        batch_size (int): Trechos por lote do nlp.pipe.
+        n_process (int): Processos do nlp.pipe (1 processa no processo atual).
+        max_chars (int): Limite de caracteres por texto (None usa o texto inteiro).
+        chunk_chars (int): Tamanho máximo dos trechos (None processa cada texto de uma vez,
+            se paragraph_language for False).
+        paragraph_language (bool): Detecta o idioma por parágrafo em vez de usar o do artigo.
+
+    Returns:
+        list: (tokens, pos_tags, lemmas) de cada item, na ordem de entrada.
+    """
+    pieces = []  # (índice do item, trecho), na ordem dos textos
+    for index, (text, _, *cuts) in enumerate(items):
+        if text:
+            text = text[:max_chars]
+            pieces.extend((index, piece) for piece in _split_text(text, chunk_chars, paragraph_language,
+                                                                  cuts[0] if cuts else None))
+
+    if paragraph_language:
+        languages = _detect_piece_languages([piece for _, piece in pieces])
+    else:
+        languages = [None] * len(pieces)
+    groups = {}
+    for position, ((index, _), language) in enumerate(zip(pieces, languages)):
+        groups.setdefault(select_nlp(language or items[index][1]), []).append(position)
+
+    annotations = [None] * len(pieces)
+    failed = set()
+    for nlp, positions in groups.items():
+        disabled = [name for name in UNUSED_COMPONENTS if name in nlp.pipe_names]
+        done = 0
+        try:
+            docs = nlp.pipe(((pieces[position][1], position) for position in positions), as_tuples=True,
+                            batch_size=batch_size, n_process=n_process, disable=disabled)
+            for doc, position in docs:
+                annotations[position] = _doc_annotations(doc)
+                done += 1
+        except Exception as e:
+            print(f"Erro no processamento NLP em lote: {str(e)}. Processando os trechos restantes um a um.")
+            with nlp.select_pipes(disable=disabled):
+                for position in positions[done:]:
+                    try:
+                        annotations[position] = _doc_annotations(nlp(pieces[position][1]))
+                    except Exception as e:
+                        print(f"Erro no processamento NLP: {str(e)}")
+                        failed.add(pieces[position][0])
+
+    # Reúne os trechos de cada texto na ordem original; um texto com algum trecho não
+    # processado fica sem anotações, como antes
+    results = [([], [], []) for _ in items]
+    for (index, _), piece_annotations in zip(pieces, annotations):
+        if index not in failed:
+            for values, piece_values in zip(results[index], piece_annotations):
+                values.extend(piece_values)
+    return results
+
 def process_text_nlp(text, language):
     """Processa o texto com spaCy para tokenização, POS tagging e lematização"""
-    if not text:
-        return [], [], []
+    return process_texts_nlp([(text, language)])[0]
+
+def _annotate_round(pending, batch_size, n_process):
+    """Processamento de NLP de uma rodada de artigos; gera os metadados completos."""
+    print(f"Processamento de NLP de {len(pending)} artigos (lotes de {batch_size}, {n_process} processo(s))...")
+    annotations = process_texts_nlp(
+        [(text, metadata['idioma'], cuts) for _, metadata, text, cuts in pending],
+        batch_size=batch_size,
+        n_process=n_process
+    )
     
-    try:
-        if language == 'Português':
-            nlp = nlp_pt
-        elif language == 'Inglês':
-            nlp = nlp_en
-        else:
-            nlp = nlp_en  # Default para inglês
-        
-        # Processar apenas os primeiros 10.000 caracteres para evitar problemas de memória
-        doc = nlp(text[:10000])
-        
-        tokens = [token.text for token in doc]
-        pos_tags = [token.pos_ for token in doc]
-        lemmas = [token.lemma_ for token in doc]
+    for (filename, metadata, _, _), (tokens, pos_tags, lemmas) in zip(pending, annotations):
+        metadata['artigo_tokenizado'] = tokens
+        metadata['pos_tagger'] = pos_tags
+        metadata['lema'] = lemmas
         
-        return tokens, pos_tags, lemmas
-    except Exception as e:
-        print(f"Erro no processamento NLP: {str(e)}")
-        return [], [], []
+        print(f"✓ {filename} processado com sucesso")
+        yield metadata
 
-def process_pdfs(pdf_directory):
-    """Processa todos os PDFs em um diretório e retorna os dados estruturados"""
-    articles_data = []
-    
+def iter_processed_pdfs(pdf_directory, batch_size=16, n_process=1, skip=(), articles_per_round=16):
+    """
+    Processa os PDFs de um diretório em rodadas de articles_per_round artigos (extração,
+    metadados e NLP em lote) e gera cada artigo assim que sua rodada termina, de modo que
+    só uma rodada fica em memória.
+
+    Args:
+        pdf_directory (str): Pasta com os PDFs.
+        batch_size (int): Trechos por lote do nlp.pipe.
+        n_process (int): Processos do nlp.pipe; mais de 1 distribui o NLP entre os núcleos.
+        skip (set): storage_key (caminho do PDF) de artigos já processados, que são pulados.
+        articles_per_round (int): Artigos extraídos antes de cada rodada de NLP.
+
+    Yields:
+        dict: Dados estruturados de um artigo.
+    """
     # Verificar se o diretório existe
     if not os.path.exists(pdf_directory):
         print(f"Erro: Diretório '{pdf_directory}' não encontrado!")
@@ -205,19 +287,24 @@ def process_pdfs(pdf_directory):
             print(f"Diretório '{pdf_directory}' criado. Adicione arquivos PDF e execute novamente.")
         except Exception as e:
             print(f"Erro ao criar diretório: {str(e)}")
-        return articles_data
+        return
     
     # Listar arquivos PDF
-    pdf_files = [f for f in os.listdir(pdf_directory) if f.lower().endswith('.pdf')]
+    pdf_files = sorted(f for f in os.listdir(pdf_directory) if f.lower().endswith('.pdf'))
     
     if not pdf_files:
         print(f"Nenhum arquivo PDF encontrado no diretório '{pdf_directory}'")
-        return articles_data
+        return
     
     print(f"Encontrados {len(pdf_files)} arquivos PDF para processar...")
     
+    # Extração e metadados por arquivo; o NLP é feito em lote ao fim de cada rodada
+    pending = []
     for filename in pdf_files:
         pdf_path = os.path.join(pdf_directory, filename)
+        if pdf_path in skip:
+            print(f"Já processado, pulando: {filename}")
+            continue
         print(f"Processando: {filename}")
         
         try:
@@ -228,41 +315,96 @@ def process_pdfs(pdf_directory):
                 print(f"Aviso: Não foi possível extrair texto de {filename}")
                 continue
             
-            # Extrair metadados
-            metadata = extract_metadata(text, pdf_path, filename)
-            
-            # Processamento de NLP
-            tokens, pos_tags, lemmas = process_text_nlp(
-                text, 
-                metadata['idioma']
-            )
-            
-            metadata['artigo_tokenizado'] = tokens
-            metadata['pos_tagger'] = pos_tags
-            metadata['lema'] = lemmas
-            
-            articles_data.append(metadata)
-            print(f"✓ {filename} processado com sucesso")
+            # Extrair metadados; a segmentação também dá os limites das seções usados no NLP
+            segments = segment_document(text)
+            metadata = extract_metadata(text, pdf_path, filename, segments)
+            pending.append((filename, metadata, text[:NLP_MAX_CHARS], _section_cuts(segments)))
             
         except Exception as e:
             print(f"Erro ao processar {filename}: {str(e)}")
+        
+        if len(pending) >= articles_per_round:
+            yield from _annotate_round(pending, batch_size, n_process)
+            pending = []
     
-    return articles_data
+    if pending:
+        yield from _annotate_round(pending, batch_size, n_process)
+
+def process_pdfs(pdf_directory, batch_size=16, n_process=1):
+    """
+    Processa todos os PDFs em um diretório e retorna os dados estruturados
+
+    Args:
+        pdf_directory (str): Pasta com os PDFs.
+        batch_size (int): Trechos por lote do nlp.pipe.
+        n_process (int): Processos do nlp.pipe; mais de 1 distribui o NLP entre os núcleos.
+    """
+    return list(iter_processed_pdfs(pdf_directory, batch_size, n_process, articles_per_round=float('inf')))
+
+def process_pdfs_to_jsonl(pdf_directory, output_jsonl, batch_size=16, n_process=1, articles_per_round=16):
+    """
+    Processa os PDFs gravando cada artigo como uma linha de output_jsonl assim que fica
+    pronto. Se o arquivo já existir, retoma do ponto em que parou: artigos já gravados
+    são pulados e uma última linha incompleta é descartada.
+
+    Returns:
+        int: Total de artigos no arquivo ao final.
+    """
+    with ArticleJSONLWriter(output_jsonl) as writer:
+        if writer.completed:
+            print(f"Retomando: {len(writer.completed)} artigo(s) já em {output_jsonl}")
+        for article in iter_processed_pdfs(pdf_directory, batch_size, n_process,
+                                           skip=writer.completed, articles_per_round=articles_per_round):
+            writer.write(article)
+        return len(writer.completed)
 
 # Configurações
 PDF_DIR = 'arquivos_pdf'  # Nome corrigido
 OUTPUT_JSON = 'artigos.json'
+OUTPUT_JSONL = 'artigos.jsonl'
+# True grava artigos.jsonl em fluxo (uma linha por artigo, com retomada);
+# False gera artigos.json de uma vez no final, como antes
+STREAMING_OUTPUT = True
+NLP_BATCH_SIZE = 16  # Trechos por lote do nlp.pipe
+NLP_N_PROCESS = 1  # Processos do nlp.pipe (ex: os.cpu_count())
+ARTICLES_PER_ROUND = 16  # Artigos extraídos antes de cada rodada de NLP (modo em fluxo)
+# Também grava o formato colunar (Parquet, article_store): artigos.tokens.parquet e artigos.articles.parquet
+COLUMNAR_OUTPUT = True
+COLUMN_STORE_PREFIX = 'artigos'
 
 # Executar processamento
 if __name__ == "__main__":
     print("Iniciando processamento de PDFs...")
-    data = process_pdfs(PDF_DIR)
-    
-    if data:
-        with open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+    try:
+        if STREAMING_OUTPUT:
+            total = process_pdfs_to_jsonl(PDF_DIR, OUTPUT_JSONL, NLP_BATCH_SIZE, NLP_N_PROCESS, ARTICLES_PER_ROUND)
+            if total:
+                print(f"Arquivo {OUTPUT_JSONL} gerado com sucesso!")
+                print(f"Total de artigos processados: {total}")
+                if COLUMNAR_OUTPUT:
+                    write_column_store(iter_articles(OUTPUT_JSONL), COLUMN_STORE_PREFIX)
+                    print(f"Formato colunar gravado com o prefixo {COLUMN_STORE_PREFIX}")
+            else:
+                print("Nenhum dado foi processado.")
+        else:
+            data = process_pdfs(PDF_DIR, NLP_BATCH_SIZE, NLP_N_PROCESS)
         
-        print(f"Arquivo {OUTPUT_JSON} gerado com sucesso!")
-        print(f"Total de artigos processados: {len(data)}")
-    else:
-        print("Nenhum dado foi processado. O arquivo JSON não foi criado.")
+            if data:
+                with open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+            
+                print(f"Arquivo {OUTPUT_JSON} gerado com sucesso!")
+                print(f"Total de artigos processados: {len(data)}")
+                if COLUMNAR_OUTPUT:
+                    write_column_store(data, COLUMN_STORE_PREFIX)
+                    print(f"Formato colunar gravado com o prefixo {COLUMN_STORE_PREFIX}")
+            else:
+                print("Nenhum dado foi processado. O arquivo JSON não foi criado.")
+    except ModelNotFoundError as e:
+        # Só acontece se o corpus tiver textos de um idioma cujo modelo não está instalado;
+        # no modo em fluxo, os artigos já gravados são mantidos para a retomada
+        print(f"Erro: {e}")
+        exit(1)
+    
+    print("Modelos spaCy usados:")
+    MODELS.report()
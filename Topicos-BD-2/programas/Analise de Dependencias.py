@@ -1,31 +1,30 @@
 import streamlit as st
-import spacy
-from spacy import displacy
-import pandas as pd
 from pathlib import Path
 
+from doc_cache import DOCS
+from spacy_models import MODELS
+
 PROJECT_ROOT = Path(__file__).parent
 CSS_PATH = PROJECT_ROOT / "styles" / "styles.css"
 
-@st.cache_resource
 def load_spacy_model():
     try:
         # Tenta carregar o modelo grande em português
-        return spacy.load("pt_core_news_lg")
+        return MODELS.get("pt_core_news_lg")
     except OSError:
         try:
             # Se falhar, tenta o modelo pequeno em português
             st.info("Usando modelo pt_core_news_sm (mais leve)")
-            return spacy.load("pt_core_news_sm")
+            return MODELS.get("pt_core_news_sm")
         except OSError:
             try:
                 # Se falhar, tenta o modelo em inglês
                 st.info("Modelo português não disponível. Usando modelo em inglês...")
-                return spacy.load("en_core_web_sm")
+                return MODELS.get("en_core_web_sm")
             except OSError:
                 # Último recurso: modelo mínimo
                 st.warning("Usando modelo básico do spaCy (funcionalidades limitadas)")
-                return spacy.blank("pt")
+                return MODELS.get("blank:pt")
 
 nlp = load_spacy_model()
 
@@ -135,12 +134,15 @@ text = "No Brasil, investigamos os comentários para compreender a opinião púb
 text_input = st.text_input("Digite algum texto 👇", text)
 
 if text_input:
-    doc = nlp(text_input)
-    
-    # Render Dependency Parse
-    dep_html = displacy.render(doc, style="dep", jupyter=False)
+    doc = DOCS.parse(nlp, text_input)
 
     if st.button('Analisar dependências', type="primary"):
+        import pandas as pd
+        from spacy import displacy
+
+        # Render Dependency Parse
+        dep_html = displacy.render(doc, style="dep", jupyter=False)
+
         st.header("")
         
         # Container com scroll horizontal para o parse de dependências
@@ -1,13 +1,11 @@
 import streamlit as st
 import re
 import json
-from textblob import TextBlob
-import matplotlib.pyplot as plt
-import pandas as pd
-import PyPDF2
 import io
 from pathlib import Path
 
+from analysis_cache import ANALYSES, cached_extract_text, sha256_of
+
 # CORREÇÃO: Definir o PROJECT_ROOT corretamente
 # PROJECT_ROOT = Path(__file__).parent.parent
 #PROJECT_ROOT = Path(os.getcwd())
@@ -120,33 +118,74 @@ def setup_textblob():
             with st.spinner(f'Baixando {corpus}...'):
                 nltk.download(corpus, quiet=True)
 
-# Executa a configuração do TextBlob
-try:
-    setup_textblob()
-except Exception as e:
-    st.warning(f"Alguns recursos do TextBlob podem não funcionar: {e}")
-
 def extract_text_from_pdf(uploaded_file):
     """Extrai texto de arquivo PDF"""
     try:
-        pdf_reader = PyPDF2.PdfReader(uploaded_file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        return text
+        return cached_extract_text(uploaded_file)
     except Exception as e:
         st.error(f"Erro ao extrair texto do PDF: {e}")
         return ""
 
+# Versão da análise de sentimento guardada no cache (mudar ao alterar analyze_sentiment)
+SENTIMENT_VERSION = 2
+
+def translation_mode():
+    """
+    Como o texto em português é analisado, parte da versão no cache: "traducao" (traduzido
+    para o inglês com TextBlob.translate) ou "original" (o TextBlob 0.18 não tem translate).
+    """
+    from textblob import TextBlob
+
+    return "traducao" if hasattr(TextBlob, "translate") else "original"
+
+def translate_to_english(blob):
+    """
+    Traduz o texto do blob para o inglês.
+
+    Returns:
+        tuple: (TextBlob traduzido ou None, se a falha é transitória). Uma falha
+            transitória (rede, limite de requisições, erro do servidor) não vai para o cache.
+    """
+    import socket
+    import urllib.error
+    from textblob import TextBlob
+    from textblob.exceptions import TextBlobError
+
+    try:
+        return TextBlob(str(blob.translate(to='en'))), False
+    except AttributeError:
+        # TextBlob 0.18 removeu translate
+        return None, False
+    except urllib.error.HTTPError as e:
+        return None, e.code == 429 or e.code >= 500
+    except (urllib.error.URLError, socket.timeout, ConnectionError):
+        return None, True
+    except TextBlobError:
+        # NotTranslated/TranslatorError: a tradução devolveu o próprio texto ou não é suportada
+        return None, False
+
 def analyze_sentiment(texto):
     """Analisa o sentimento do texto e retorna informações detalhadas"""
+    from textblob import TextBlob
+
+    # Configuração do TextBlob só quando há texto a analisar (e o resultado não está no cache)
     try:
-        blob = TextBlob(texto)
-        if any(palavra in texto.lower() for palavra in ['é', 'á', 'ã', 'ç', 'õ']):
-            texto_ingles = str(blob.translate(to='en'))
-            blob = TextBlob(texto_ingles)
-    except:
-        blob = TextBlob(texto)
+        setup_textblob()
+    except Exception as e:
+        st.warning(f"Alguns recursos do TextBlob podem não funcionar: {e}")
+
+    # translated: False quando o texto em português foi analisado como está, com polaridade
+    # quase sempre neutra; cacheable: False quando a tradução falhou por um erro transitório
+    translated = True
+    cacheable = True
+    blob = TextBlob(texto)
+    if any(palavra in texto.lower() for palavra in ['é', 'á', 'ã', 'ç', 'õ']):
+        blob_ingles, transient = translate_to_english(blob)
+        if blob_ingles is not None:
+            blob = blob_ingles
+        else:
+            translated = False
+            cacheable = not transient
     
     sentiment = blob.sentiment
     polarity = sentiment.polarity
@@ -185,7 +224,9 @@ def analyze_sentiment(texto):
         'sentiment_label': sentiment_label,
         'sentiment_emoji': sentiment_emoji,
         'sentiment_color': sentiment_color,
-        'sentiment_description': sentiment_description
+        'sentiment_description': sentiment_description,
+        'translated': translated,
+        'cacheable': cacheable
     }
 
 def analyze_categories(texto, categories):
@@ -345,7 +386,17 @@ if analyze_button:
         # 1. ANÁLISE DE SENTIMENTO
         st.header("📊 Análise de Sentimento")
         
-        sentiment_info = analyze_sentiment(texto)
+        texto_digest = sha256_of(texto.encode("utf-8"))
+        sentiment_version = (SENTIMENT_VERSION, translation_mode())
+        sentiment_info = ANALYSES.get(texto_digest, "sentimento", sentiment_version)
+        if sentiment_info is None:
+            sentiment_info = analyze_sentiment(texto)
+            # Uma falha transitória da tradução não vai para o cache compartilhado
+            if sentiment_info['cacheable']:
+                ANALYSES.put(texto_digest, "sentimento", sentiment_version, sentiment_info)
+        if not sentiment_info['translated']:
+            st.warning("Não foi possível traduzir o texto para o inglês; o sentimento foi "
+                       "calculado sobre o texto original e pode estar próximo do neutro.")
         polarity = sentiment_info['polarity']
         subjectivity = sentiment_info['subjectivity']
         palavras_count = len(texto.split())
@@ -446,6 +497,8 @@ if analyze_button:
         percentuais = calculate_percentages(scores)
         axes = calculate_axes(percentuais)
 
+        import matplotlib.pyplot as plt
+
         # Exibição dos eixos
         col1, col2 = st.columns(2)
         
@@ -521,6 +574,8 @@ if analyze_button:
 
         # 5. RESUMO ESTATÍSTICO
         with st.expander("📋 Resumo Estatístico Detalhado"):
+            import pandas as pd
+
             col1, col2 = st.columns(2)
             
             with col1:
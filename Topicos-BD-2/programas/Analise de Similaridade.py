@@ -1,38 +1,35 @@
 import streamlit as st
 from pathlib import Path
-import pdfplumber
-import spacy
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.manifold import TSNE
-import numpy as np
-import tempfile
-import os
 import re
+import time
+import uuid
 from collections import Counter
 
+from analysis_cache import ANALYSES, cached_extract_text, sha256_of
+from background_jobs import CANCELLED, DONE, FAILED, JOBS
+from doc_cache import pipeline_id
+from spacy_models import MODELS
+
 PROJECT_ROOT = Path(__file__).parent
 CSS_PATH = PROJECT_ROOT / "styles" / "styles.css"
+# Intervalo (s) entre as atualizações do progresso da análise
+POLL_INTERVAL = 0.5
 
-@st.cache_resource
 def load_spacy_model():
     try:
         # Carregar modelo com word vectors para similaridade semântica
-        return spacy.load("pt_core_news_lg")
+        return MODELS.get("pt_core_news_lg")
     except OSError:
         try:
             st.info("Modelo português grande não disponível. Tentando modelo pequeno...")
-            return spacy.load("pt_core_news_sm")
+            return MODELS.get("pt_core_news_sm")
         except OSError:
             try:
                 st.info("Modelo português não disponível. Usando modelo em inglês...")
-                return spacy.load("en_core_web_lg")
+                return MODELS.get("en_core_web_lg")
             except OSError:
                 st.warning("Usando modelo básico do spaCy (similaridade limitada)")
-                return spacy.blank("pt")
+                return MODELS.get("blank:pt")
 
 nlp = load_spacy_model()
 
@@ -91,27 +88,6 @@ with col2:
         help="Tamanho máximo: 200MB"
     )
 
-def extract_text_from_pdf(uploaded_file):
-    """Extrai texto de um arquivo PDF carregado"""
-    try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-            tmp_file.write(uploaded_file.getvalue())
-            tmp_path = tmp_file.name
-        
-        text = ""
-        with pdfplumber.open(tmp_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        
-        os.unlink(tmp_path)  # Remove arquivo temporário
-        return text.strip()
-    
-    except Exception as e:
-        st.error(f"Erro ao extrair texto do PDF: {e}")
-        return None
-
 def preprocess_text(text):
     """Pré-processa o texto para análise"""
     # Limpar texto - remover múltiplos espaços e quebras de linha
@@ -120,6 +96,9 @@ def preprocess_text(text):
 
 def calculate_semantic_similarity(text1, text2):
     """Calcula similaridade semântica entre dois textos"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
     # Usar spaCy para similaridade semântica
     doc1 = nlp(text1)
     doc2 = nlp(text2)
@@ -178,8 +157,24 @@ def analyze_text_content(text1, text2):
         "frequent_words2": freq2
     }
 
+# Versão da comparação guardada no cache (junto com o modelo spaCy usado)
+SIMILARITY_VERSION = 1
+
+def compare_texts(text1, text2):
+    """Similaridades e estatísticas dos dois textos, sem os Docs (para guardar no cache)"""
+    similarity_results = calculate_semantic_similarity(text1, text2)
+    similarity = {
+        "spacy_similarity": similarity_results["spacy_similarity"],
+        "cosine_similarity": similarity_results["cosine_similarity"]
+    }
+    return similarity, analyze_text_content(text1, text2)
+
 def create_similarity_visualizations(similarity_results, text_analysis):
     """Cria visualizações para a análise de similaridade"""
+    import pandas as pd
+    import plotly.express as px
+    import plotly.graph_objects as go
+
     # Gauge de similaridade
     fig_gauge = go.Figure(go.Indicator(
         mode = "gauge+number+delta",
@@ -254,6 +249,11 @@ def create_similarity_visualizations(similarity_results, text_analysis):
 
 def create_semantic_space_visualization(text1, text2):
     """Cria visualização do espaço semântico"""
+    import numpy as np
+    import plotly.express as px
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.manifold import TSNE
+
     # Dividir textos em sentenças para análise
     doc1 = nlp(text1)
     doc2 = nlp(text2)
@@ -295,160 +295,228 @@ def create_semantic_space_visualization(text1, text2):
         return fig_tsne
     return None
 
-if pdf_file1 is not None and pdf_file2 is not None:
-    with st.spinner("Processando PDFs e analisando similaridade..."):
-        # Extrair textos
-        text1 = extract_text_from_pdf(pdf_file1)
-        text2 = extract_text_from_pdf(pdf_file2)
-        
-        if text1 and text2:
-            st.success("Textos extraídos com sucesso!")
-            
-            # Pré-processar textos
-            text1_clean = preprocess_text(text1)
-            text2_clean = preprocess_text(text2)
-            
-            # Calcular similaridade
-            similarity_results = calculate_semantic_similarity(text1_clean, text2_clean)
-            
-            # Analisar conteúdo
-            text_analysis = analyze_text_content(text1_clean, text2_clean)
-            
-            # Mostrar resultados de similaridade
-            st.header("Resultados da Similaridade Semântica")
-            
-            col_sim1, col_sim2, col_sim3 = st.columns(3)
-            
-            with col_sim1:
-                if similarity_results["spacy_similarity"] is not None:
-                    st.metric(
-                        "Similaridade SpaCy", 
-                        f"{similarity_results['spacy_similarity']:.2%}",
-                        help="Baseada em embeddings semânticos do spaCy"
-                    )
-                else:
-                    st.metric(
-                        "Similaridade SpaCy",
-                        "N/A",
-                        help="Modelo não suporta similaridade semântica"
-                    )
-            
-            with col_sim2:
-                st.metric(
-                    "Similaridade Cosseno (TF-IDF)",
-                    f"{similarity_results['cosine_similarity']:.2%}",
-                    help="Baseada em vetores TF-IDF e similaridade de cosseno"
-                )
-            
-            with col_sim3:
-                overall_similarity = (
-                    similarity_results["spacy_similarity"] 
-                    if similarity_results["spacy_similarity"] is not None 
-                    else similarity_results["cosine_similarity"]
-                )
-                st.metric(
-                    "Similaridade Geral",
-                    f"{overall_similarity:.2%}",
-                    delta=f"{overall_similarity - 0.5:.2%}" if overall_similarity else None,
-                    delta_color="normal"
-                )
-            
-            # Interpretação da similaridade
-            st.subheader("Interpretação da Similaridade")
-            
-            similarity_levels = [
-                (0.9, 1.0, "Muito Alta", "Os documentos são semanticamente muito similares"),
-                (0.7, 0.9, "Alta", "Os documentos compartilham significados similares"),
-                (0.5, 0.7, "Moderada", "Os documentos têm algumas similaridades"),
-                (0.3, 0.5, "Baixa", "Os documentos são diferentes mas com algum overlap"),
-                (0.0, 0.3, "Muito Baixa", "Os documentos são semanticamente distintos")
-            ]
-            
-            for min_val, max_val, level, description in similarity_levels:
-                if min_val <= overall_similarity < max_val:
-                    st.info(f"**{level}**: {description}")
-                    break
-            
-            # Visualizações
-            st.header("Visualizações")
-            fig_gauge, fig_stats, fig_words1, fig_words2 = create_similarity_visualizations(
-                similarity_results, text_analysis
+def analyze_pdfs(job, pdf_data1, pdf_data2, pair_digest):
+    """
+    Tarefa em segundo plano (background_jobs): extrai os textos, compara os PDFs e calcula
+    o espaço semântico. As similaridades e estatísticas são informadas como resultado
+    parcial antes do t-SNE, a etapa mais demorada.
+    """
+    job.report(0.0, "Extraindo textos dos PDFs...")
+    text1 = cached_extract_text(pdf_data1).strip()
+    text2 = cached_extract_text(pdf_data2).strip()
+    if not text1 or not text2:
+        return None
+    job.check()
+
+    # Pré-processar textos
+    text1_clean = preprocess_text(text1)
+    text2_clean = preprocess_text(text2)
+
+    # Calcular similaridade e analisar conteúdo (ou reaproveitar do cache, pelo par de PDFs)
+    job.report(0.2, "Calculando similaridade e analisando conteúdo...")
+    similarity_results, text_analysis = ANALYSES.get_or_compute(
+        pair_digest, "similaridade", (SIMILARITY_VERSION, pipeline_id(nlp)),
+        lambda: compare_texts(text1_clean, text2_clean)
+    )
+    job.report(0.6, "Calculando o espaço semântico...", partial=(similarity_results, text_analysis))
+    job.check()
+
+    fig_tsne = create_semantic_space_visualization(text1_clean, text2_clean)
+    return similarity_results, text_analysis, fig_tsne
+
+def show_results(similarity_results, text_analysis, fig_tsne, semantic_space_ready):
+    """Métricas, visualizações e resumo da comparação (o t-SNE quando semantic_space_ready)"""
+    # Mostrar resultados de similaridade
+    st.header("Resultados da Similaridade Semântica")
+
+    col_sim1, col_sim2, col_sim3 = st.columns(3)
+
+    with col_sim1:
+        if similarity_results["spacy_similarity"] is not None:
+            st.metric(
+                "Similaridade SpaCy", 
+                f"{similarity_results['spacy_similarity']:.2%}",
+                help="Baseada em embeddings semânticos do spaCy"
             )
-            
-            st.plotly_chart(fig_gauge, use_container_width=True)
-            st.plotly_chart(fig_stats, use_container_width=True)
-            
-            col_words1, col_words2 = st.columns(2)
-            with col_words1:
-                st.plotly_chart(fig_words1, use_container_width=True)
-            with col_words2:
-                st.plotly_chart(fig_words2, use_container_width=True)
-            
-            # Espaço semântico
-            st.subheader("Análise do Espaço Semântico")
-            fig_tsne = create_semantic_space_visualization(text1_clean, text2_clean)
-            if fig_tsne:
-                st.plotly_chart(fig_tsne, use_container_width=True)
-                st.caption("Visualização t-SNE mostrando a proximidade semântica entre sentenças dos dois documentos")
-            
-            # Detalhes técnicos
-            st.header("Detalhes Técnicos")
-            
-            with st.expander("Métodos de Similaridade Utilizados"):
-                st.markdown("""
-                **1. Similaridade SpaCy (Embeddings)**
-                - Usa representações vetoriais de palavras e documentos
-                - Captura relações semânticas e contextuais
-                - Baseado em modelos pré-treinados em grandes corpora
-                
-                **2. Similaridade de Cosseno (TF-IDF)**
-                - Representa documentos como vetores TF-IDF
-                - Calcula o cosseno do ângulo entre os vetores
-                - Mede similaridade baseada em frequência de termos
-                
-                **3. Análise t-SNE**
-                - Redução de dimensionalidade para visualização
-                - Mostra proximidade semântica no espaço 2D
-                - Agrupa sentenças semanticamente similares
-                """)
-            
-            # Resumo executivo
-            st.header("Resumo Executivo")
-            
-            col_sum1, col_sum2 = st.columns(2)
-            
-            with col_sum1:
-                st.subheader("📊 Pontos Fortes da Similaridade")
-                if overall_similarity > 0.7:
-                    st.success("✅ Alta sobreposição temática")
-                    st.success("✅ Contextos semânticos alinhados")
-                    st.success("✅ Potencial para integração de conteúdo")
-                elif overall_similarity > 0.4:
-                    st.warning("⚠️ Similaridade moderada")
-                    st.warning("⚠️ Alguns temas em comum")
-                    st.warning("⚠️ Oportunidade para conexões")
-                else:
-                    st.error("❌ Baixa similaridade semântica")
-                    st.error("❌ Contextos distintos")
-                    st.error("❌ Foco em temas diferentes")
-            
-            with col_sum2:
-                st.subheader("🎯 Recomendações")
-                if overall_similarity > 0.7:
-                    st.info("• Considerar fusão ou integração dos conteúdos")
-                    st.info("• Desenvolver síntese conjunta")
-                    st.info("• Explorar complementaridades")
-                elif overall_similarity > 0.4:
-                    st.info("• Identificar pontos de conexão específicos")
-                    st.info("• Desenvolver comparação crítica")
-                    st.info("• Explorar diferenças como oportunidades")
-                else:
-                    st.info("• Manter como documentos distintos")
-                    st.info("• Desenvolver análises separadas")
-                    st.info("• Considerar contextos de uso específicos")
-            
         else:
-            st.error("Não foi possível extrair texto de um ou ambos os PDFs")
+            st.metric(
+                "Similaridade SpaCy",
+                "N/A",
+                help="Modelo não suporta similaridade semântica"
+            )
+
+    with col_sim2:
+        st.metric(
+            "Similaridade Cosseno (TF-IDF)",
+            f"{similarity_results['cosine_similarity']:.2%}",
+            help="Baseada em vetores TF-IDF e similaridade de cosseno"
+        )
+
+    with col_sim3:
+        overall_similarity = (
+            similarity_results["spacy_similarity"] 
+            if similarity_results["spacy_similarity"] is not None 
+            else similarity_results["cosine_similarity"]
+        )
+        st.metric(
+            "Similaridade Geral",
+            f"{overall_similarity:.2%}",
+            delta=f"{overall_similarity - 0.5:.2%}" if overall_similarity else None,
+            delta_color="normal"
+        )
+
+    # Interpretação da similaridade
+    st.subheader("Interpretação da Similaridade")
+
+    similarity_levels = [
+        (0.9, 1.0, "Muito Alta", "Os documentos são semanticamente muito similares"),
+        (0.7, 0.9, "Alta", "Os documentos compartilham significados similares"),
+        (0.5, 0.7, "Moderada", "Os documentos têm algumas similaridades"),
+        (0.3, 0.5, "Baixa", "Os documentos são diferentes mas com algum overlap"),
+        (0.0, 0.3, "Muito Baixa", "Os documentos são semanticamente distintos")
+    ]
+
+    for min_val, max_val, level, description in similarity_levels:
+        if min_val <= overall_similarity < max_val:
+            st.info(f"**{level}**: {description}")
+            break
+
+    # Visualizações
+    st.header("Visualizações")
+    fig_gauge, fig_stats, fig_words1, fig_words2 = create_similarity_visualizations(
+        similarity_results, text_analysis
+    )
+
+    st.plotly_chart(fig_gauge, use_container_width=True)
+    st.plotly_chart(fig_stats, use_container_width=True)
+
+    col_words1, col_words2 = st.columns(2)
+    with col_words1:
+        st.plotly_chart(fig_words1, use_container_width=True)
+    with col_words2:
+        st.plotly_chart(fig_words2, use_container_width=True)
+
+    # Espaço semântico
+    st.subheader("Análise do Espaço Semântico")
+    if not semantic_space_ready:
+        st.info("⏳ Calculando o espaço semântico...")
+    elif fig_tsne:
+        st.plotly_chart(fig_tsne, use_container_width=True)
+        st.caption("Visualização t-SNE mostrando a proximidade semântica entre sentenças dos dois documentos")
+
+    # Detalhes técnicos
+    st.header("Detalhes Técnicos")
+
+    with st.expander("Métodos de Similaridade Utilizados"):
+        st.markdown("""
+        **1. Similaridade SpaCy (Embeddings)**
+        - Usa representações vetoriais de palavras e documentos
+        - Captura relações semânticas e contextuais
+        - Baseado em modelos pré-treinados em grandes corpora
+
+        **2. Similaridade de Cosseno (TF-IDF)**
+        - Representa documentos como vetores TF-IDF
+        - Calcula o cosseno do ângulo entre os vetores
+        - Mede similaridade baseada em frequência de termos
+
+        **3. Análise t-SNE**
+        - Redução de dimensionalidade para visualização
+        - Mostra proximidade semântica no espaço 2D
+        - Agrupa sentenças semanticamente similares
+        """)
+
+    # Resumo executivo
+    st.header("Resumo Executivo")
+
+    col_sum1, col_sum2 = st.columns(2)
+
+    with col_sum1:
+        st.subheader("📊 Pontos Fortes da Similaridade")
+        if overall_similarity > 0.7:
+            st.success("✅ Alta sobreposição temática")
+            st.success("✅ Contextos semânticos alinhados")
+            st.success("✅ Potencial para integração de conteúdo")
+        elif overall_similarity > 0.4:
+            st.warning("⚠️ Similaridade moderada")
+            st.warning("⚠️ Alguns temas em comum")
+            st.warning("⚠️ Oportunidade para conexões")
+        else:
+            st.error("❌ Baixa similaridade semântica")
+            st.error("❌ Contextos distintos")
+            st.error("❌ Foco em temas diferentes")
+
+    with col_sum2:
+        st.subheader("🎯 Recomendações")
+        if overall_similarity > 0.7:
+            st.info("• Considerar fusão ou integração dos conteúdos")
+            st.info("• Desenvolver síntese conjunta")
+            st.info("• Explorar complementaridades")
+        elif overall_similarity > 0.4:
+            st.info("• Identificar pontos de conexão específicos")
+            st.info("• Desenvolver comparação crítica")
+            st.info("• Explorar diferenças como oportunidades")
+        else:
+            st.info("• Manter como documentos distintos")
+            st.info("• Desenvolver análises separadas")
+            st.info("• Considerar contextos de uso específicos")
+
+def submit_analysis(job_key, pair_digest, session_id):
+    """Submete a análise do par de PDFs (ou reaproveita a de outra sessão com o mesmo par)"""
+    job = JOBS.submit(job_key, session_id, analyze_pdfs, pdf_file1.getvalue(), pdf_file2.getvalue(), pair_digest)
+    st.session_state.similarity_job = job.id
+    st.session_state.pop("similarity_cancelled", None)
+    return job
+
+if pdf_file1 is not None and pdf_file2 is not None:
+    # A análise roda em segundo plano (background_jobs): a página continua respondendo, mostra
+    # os resultados parciais e não recomeça o trabalho quando algum widget muda
+    pair_digest = sha256_of((sha256_of(pdf_file1) + sha256_of(pdf_file2)).encode("utf-8"))
+    job_key = ("similaridade", pair_digest, pipeline_id(nlp))
+    # Identifica a sessão no executor (uma análise pedida por várias sessões só é cancelada
+    # quando todas desistem dela)
+    session_id = st.session_state.setdefault("job_session_id", uuid.uuid4().hex)
+    job = JOBS.get(st.session_state.get("similarity_job"), session_id)
+    if job is not None and job.key != job_key:
+        # Outro par de PDFs: desiste da análise anterior
+        JOBS.cancel(job.id, session_id)
+        job = None
+    # Um par cuja análise a sessão cancelou só é analisado de novo a pedido
+    if job is None and st.session_state.get("similarity_cancelled") != job_key:
+        job = submit_analysis(job_key, pair_digest, session_id)
+
+    if job is None or job.status == CANCELLED:
+        st.info("ℹ️ Análise cancelada")
+        if st.button("🔄 Analisar novamente"):
+            submit_analysis(job_key, pair_digest, session_id)
+            st.rerun()
+    elif job.status == FAILED:
+        st.error(f"Erro ao analisar os PDFs: {job.error}")
+    elif job.status == DONE and job.result is None:
+        st.error("Não foi possível extrair texto de um ou ambos os PDFs")
+    else:
+        partial = job.partial_results()
+        if not job.done:
+            st.progress(int(job.progress * 100), text=job.message)
+            if st.button("⏹️ Cancelar análise"):
+                # Mesmo que a análise continue para outras sessões, esta desiste dela
+                JOBS.cancel(job.id, session_id)
+                del st.session_state["similarity_job"]
+                st.session_state.similarity_cancelled = job_key
+                st.rerun()
+
+        if job.status == DONE:
+            similarity_results, text_analysis, fig_tsne = job.result
+            st.success("Textos extraídos com sucesso!")
+            show_results(similarity_results, text_analysis, fig_tsne, True)
+        elif partial:
+            similarity_results, text_analysis = partial[-1]
+            st.success("Textos extraídos com sucesso!")
+            show_results(similarity_results, text_analysis, None, False)
+
+        if not job.done:
+            # Executa o script de novo para atualizar o progresso e os resultados parciais
+            time.sleep(POLL_INTERVAL)
+            st.rerun()
 else:
     if pdf_file1 or pdf_file2:
         st.warning("⚠️ Por favor, carregue ambos os arquivos PDF para análise")
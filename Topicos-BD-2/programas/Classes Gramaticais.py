@@ -1,29 +1,26 @@
 import streamlit as st
-import spacy
 from pathlib import Path
-import pdfplumber
-import pandas as pd
-import plotly.express as px
 from collections import Counter
-import tempfile
-import os
 import sys
 
+from analysis_cache import ANALYSES, cached_extract_text, sha256_of
+from doc_cache import DOCS, pipeline_id
+from spacy_models import MODELS
+
 PROJECT_ROOT = Path(__file__).parent
 CSS_PATH = PROJECT_ROOT / "styles" / "styles.css"
 IMAGES_PATH = PROJECT_ROOT / "images"
 
-@st.cache_resource
 def load_spacy_model():
     try:
-        return spacy.load("pt_core_news_sm")
+        return MODELS.get("pt_core_news_sm")
     except OSError:
         try:
             st.info("Modelo português não disponível. Usando modelo em inglês...")
-            return spacy.load("en_core_web_sm")
+            return MODELS.get("en_core_web_sm")
         except OSError:
             st.warning("Usando modelo básico do spaCy (funcionalidades limitadas)")
-            return spacy.blank("pt")
+            return MODELS.get("blank:pt")
 
 nlp = load_spacy_model()
 
@@ -78,29 +75,20 @@ uploaded_file = st.file_uploader(
 )
 
 def extract_text_from_pdf(uploaded_file):
-    """Extrai texto de um arquivo PDF carregado"""
+    """Extrai texto de um arquivo PDF carregado, lido direto da memória"""
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-            tmp_file.write(uploaded_file.getvalue())
-            tmp_path = tmp_file.name
-        
-        text = ""
-        with pdfplumber.open(tmp_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        
-        os.unlink(tmp_path)  # Remove arquivo temporário
-        return text.strip()
+        return cached_extract_text(uploaded_file).strip()
     
     except Exception as e:
         st.error(f"Erro ao extrair texto do PDF: {e}")
         return None
 
+# Versão da análise gramatical guardada no cache (junto com o modelo spaCy usado)
+GRAMMAR_VERSION = 1
+
 def analyze_grammar(text):
     """Executa análise gramatical completa no texto"""
-    doc = nlp(text)
+    doc = DOCS.parse(nlp, text)
     
     # Estatísticas básicas
     total_tokens = len(doc)
@@ -126,7 +114,6 @@ def analyze_grammar(text):
             })
     
     return {
-        "doc": doc,
         "stats": {
             "total_tokens": total_tokens,
             "total_sentences": total_sentences,
@@ -137,6 +124,9 @@ def analyze_grammar(text):
 
 def create_visualizations(pos_counts):
     """Cria visualizações para as estatísticas gramaticais"""
+    import pandas as pd
+    import plotly.express as px
+
     if pos_counts:
         df = pd.DataFrame({
             "Classe Gramatical": list(pos_counts.keys()),
@@ -247,10 +237,13 @@ if uploaded_file is not None:
         text = extract_text_from_pdf(uploaded_file)
         
         if text:
+            import pandas as pd
+
             st.success("Texto extraído com sucesso!")
             
             # Analisar gramática
-            analysis = analyze_grammar(text)
+            analysis = ANALYSES.get_or_compute(sha256_of(uploaded_file), "gramatica",
+                                               (GRAMMAR_VERSION, pipeline_id(nlp)), lambda: analyze_grammar(text))
             
             # Mostrar estatísticas
             col1, col2, col3 = st.columns(3)
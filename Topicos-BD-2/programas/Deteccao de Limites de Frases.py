@@ -1,28 +1,26 @@
 import streamlit as st
 from pathlib import Path
-import pdfplumber
-import spacy
-import pandas as pd
-import plotly.express as px
 from collections import Counter
-import tempfile
-import os
 import re
 
+from doc_cache import DOCS
+from document_segmenter import segment_document
+from pdf_extraction import extract_text
+from spacy_models import MODELS
+
 PROJECT_ROOT = Path(__file__).parent
 CSS_PATH = PROJECT_ROOT / "styles" / "styles.css"
 
-@st.cache_resource
 def load_spacy_model():
     try:
-        return spacy.load("pt_core_news_sm")
+        return MODELS.get("pt_core_news_sm")
     except OSError:
         try:
             st.info("Modelo português não disponível. Usando modelo em inglês...")
-            return spacy.load("en_core_web_sm")
+            return MODELS.get("en_core_web_sm")
         except OSError:
             st.warning("Usando modelo básico do spaCy (funcionalidades limitadas)")
-            return spacy.blank("pt")
+            return MODELS.get("blank:pt")
 
 nlp = load_spacy_model()
 
@@ -68,45 +66,24 @@ uploaded_file = st.file_uploader(
 )
 
 def extract_text_from_pdf(uploaded_file):
-    """Extrai texto de um arquivo PDF carregado"""
+    """Extrai texto de um arquivo PDF carregado, lido direto da memória"""
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-            tmp_file.write(uploaded_file.getvalue())
-            tmp_path = tmp_file.name
-        
-        text = ""
-        with pdfplumber.open(tmp_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        
-        os.unlink(tmp_path)  # Remove arquivo temporário
-        return text.strip()
+        return extract_text(uploaded_file).strip()
     
     except Exception as e:
         st.error(f"Erro ao extrair texto do PDF: {e}")
         return None
 
 def extract_abstract(text):
-    """Extrai o resumo do texto do PDF usando padrões comuns"""
-    # Padrões para identificar resumo em português e inglês
-    patterns = [
-        r'RESUMO\s*[\n\r]+(.*?)(?=\n\s*\n|\n\s*INTRODUÇÃO|\n\s*ABSTRACT|\n\s*1\s|\n\s*1\.|\Z)',
-        r'ABSTRACT\s*[\n\r]+(.*?)(?=\n\s*\n|\n\s*INTRODUCTION|\n\s*RESUMO|\n\s*1\s|\n\s*1\.|\Z)',
-        r'Resumo\s*[\n\r]+(.*?)(?=\n\s*\n|\n\s*Introdução|\n\s*Abstract|\n\s*1\s|\n\s*1\.|\Z)',
-        r'Abstract\s*[\n\r]+(.*?)(?=\n\s*\n|\n\s*Introduction|\n\s*Resumo|\n\s*1\s|\n\s*1\.|\Z)'
-    ]
+    """Extrai o resumo do texto do PDF a partir das seções encontradas pelo segmentador"""
+    # Seção RESUMO ou, na falta dela, ABSTRACT (português primeiro)
+    segments = segment_document(text)
+    abstract = segments.content('resumo') or segments.content('abstract')
+    if abstract:
+        # Limpar o texto removendo múltiplos espaços e quebras de linha
+        return re.sub(r'\s+', ' ', abstract)
     
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-        if match:
-            abstract = match.group(1).strip()
-            # Limpar o texto removendo múltiplos espaços e quebras de linha
-            abstract = re.sub(r'\s+', ' ', abstract)
-            return abstract
-    
-    # Se não encontrar por padrões, tentar pegar o primeiro parágrafo significativo
+    # Se não encontrar as seções, tentar pegar o primeiro parágrafo significativo
     paragraphs = re.split(r'\n\s*\n', text)
     for para in paragraphs:
         if len(para.strip()) > 100:  # Parágrafo com pelo menos 100 caracteres
@@ -116,7 +93,7 @@ def extract_abstract(text):
 
 def analyze_sentence_boundaries(text):
     """Analisa os limites de frases no texto"""
-    doc = nlp(text)
+    doc = DOCS.parse(nlp, text)
     
     # Estatísticas das frases
     sentences = list(doc.sents)
@@ -162,6 +139,9 @@ def analyze_sentence_boundaries(text):
 
 def create_visualizations(analysis):
     """Cria visualizações para a análise de frases"""
+    import pandas as pd
+    import plotly.express as px
+
     # Gráfico de distribuição de tamanho de frases
     sentence_lengths = [sent["Palavras"] for sent in analysis["sentence_data"]]
     
@@ -205,6 +185,8 @@ if uploaded_file is not None:
         text = extract_text_from_pdf(uploaded_file)
         
         if text:
+            import pandas as pd
+
             st.success("Texto extraído com sucesso!")
             
             # Extrair resumo
@@ -1,7 +1,5 @@
 import streamlit as st
 from pathlib import Path
-import requests
-from PIL import Image
 import io
 import time
 
@@ -50,6 +48,9 @@ def remove_watermark(image):
 
 def generate_image(prompt):
     """Gera imagem usando apenas Pollinations"""
+    import requests
+    from PIL import Image
+
     try:
         # URL do Pollinations
         url = "https://image.pollinations.ai/prompt/"
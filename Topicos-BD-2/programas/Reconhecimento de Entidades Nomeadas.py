@@ -1,18 +1,17 @@
 import streamlit as st
-import spacy 
-from spacy import displacy 
-import pandas as pd
 from pathlib import Path
 
+from doc_cache import DOCS
+from spacy_models import MODELS
+
 PROJECT_ROOT = Path(__file__).parent
 CSS_PATH = PROJECT_ROOT / "styles" / "styles.css"
 #IMAGES_PATH = PROJECT_ROOT / "images"
 #conceitos_image_path = IMAGES_PATH / "conceitos_fluxograma.png"
 
-@st.cache_resource
 def load_spacy_model(model_name):
     try:
-        return spacy.load(model_name)
+        return MODELS.get(model_name)
     except OSError:
         st.error(f"Modelo {model_name} não encontrado. Instale com: python -m spacy download {model_name}")
         return None
@@ -96,9 +95,12 @@ text_input = st.text_input("Digite algum texto 👇", text)
 
 # Processar texto apenas se o modelo estiver carregado
 if nlp is not None:
-    doc = nlp(text_input)
-    
     if st.button('Analisar Entidades', type="primary"):
+        import pandas as pd
+        from spacy import displacy
+
+        doc = DOCS.parse(nlp, text_input)
+
         # Render NER
         ner_html = displacy.render(doc, style="ent", jupyter=False)
         
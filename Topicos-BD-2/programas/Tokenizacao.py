@@ -2,7 +2,9 @@ import streamlit as st
 from pathlib import Path
 import re
 import pandas as pd
-import spacy
+
+from doc_cache import DOCS
+from spacy_models import MODELS
 
 PROJECT_ROOT = Path(__file__).parent
 CSS_PATH = PROJECT_ROOT / "styles" / "styles.css"
@@ -23,25 +25,24 @@ def load_css(css_path):
         st.error(f"Erro ao carregar CSS: {e}")
 load_css(CSS_PATH)
 
-@st.cache_resource
 def load_spacy_model():
     try:
         # Tenta carregar o modelo grande em português
-        return spacy.load("pt_core_news_lg")
+        return MODELS.get("pt_core_news_lg")
     except OSError:
         try:
             # Se falhar, tenta o modelo pequeno em português
             st.info("Usando modelo pt_core_news_sm (mais leve)")
-            return spacy.load("pt_core_news_sm")
+            return MODELS.get("pt_core_news_sm")
         except OSError:
             try:
                 # Se falhar, tenta o modelo em inglês
                 st.info("Modelo português não disponível. Usando modelo em inglês...")
-                return spacy.load("en_core_web_sm")
+                return MODELS.get("en_core_web_sm")
             except OSError:
                 # Último recurso: modelo mínimo
                 st.warning("Usando modelo básico do spaCy (funcionalidades limitadas)")
-                return spacy.blank("pt")
+                return MODELS.get("blank:pt")
 
 nlp = load_spacy_model()
 
@@ -309,7 +310,7 @@ if texto_input:
             st.write(f"- {palavra}: {' - '.join(silabas)}")
 
     if tipo_tokenizacao == "Palavras":
-        doc = nlp(texto_input)
+        doc = DOCS.parse(nlp, texto_input)
         # Coletando informações dos tokens em um único DataFrame
         dados_tokens = []
         for token in doc:
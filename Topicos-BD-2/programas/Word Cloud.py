@@ -1,16 +1,17 @@
 import streamlit as st
-import PyPDF2
 import os
 import re
 from collections import Counter
 from unidecode import unidecode
-from lingua import Language, LanguageDetectorBuilder
-from wordcloud import WordCloud
-import numpy as np
-from PIL import Image
 import io
+import time
+import uuid
 from pathlib import Path
 
+from background_jobs import DONE, FAILED, JOBS
+from language_detection import get_detector
+from pdf_extraction import extract_text
+
 PROJECT_ROOT = Path(__file__).parent
 CSS_PATH = PROJECT_ROOT / "styles" / "styles.css"
 IMAGES_PATH = PROJECT_ROOT / "images"
@@ -18,6 +19,8 @@ fluxograma_image_path = IMAGES_PATH / "fluxograma.png"
 stopwords_path = PROJECT_ROOT / "arquivos" / "files_txt" / "stopwords.txt"
 pasta_pdf = PROJECT_ROOT / "arquivos" / "files_pdf"
 mascara_path = IMAGES_PATH / "shape.png"
+# Intervalo (s) entre as atualizações do progresso do processamento
+POLL_INTERVAL = 0.5
 
 # Carregar CSS externo com codificação correta
 def load_css(css_path):
@@ -36,21 +39,12 @@ st.title("☁️ Gerador de Word Clouds")
 def remover_acentos(texto):
     return unidecode(texto)
 
-def processar_pdf(caminho_arquivo):
-    """Extrai e processa o texto de um arquivo PDF"""
+def processar_pdf(caminho_arquivo, erros):
+    """Extrai e processa o texto de um arquivo PDF (os erros são acrescentados a erros)"""
     try:
-        with open(caminho_arquivo, 'rb') as arquivo:
-            leitor = PyPDF2.PdfReader(arquivo)
-            texto_completo = ""
-            
-            for pagina in leitor.pages:
-                texto_pagina = pagina.extract_text()
-                if texto_pagina:
-                    texto_completo += texto_pagina + " "
-            
-            return texto_completo
+        return extract_text(caminho_arquivo, separator=" ")
     except Exception as e:
-        st.error(f"Erro ao processar {caminho_arquivo}: {e}")
+        erros.append(f"Erro ao processar {caminho_arquivo}: {e}")
         return ""
 
 def processar_texto(texto):
@@ -70,10 +64,8 @@ def processar_texto(texto):
     return texto_final
 
 def inicializar_detector_idioma():
-    """Inicializa o detector de idioma para português e inglês"""
-    languages = [Language.PORTUGUESE, Language.ENGLISH]
-    detector = LanguageDetectorBuilder.from_languages(*languages).build()
-    return detector
+    """Detector de idioma para português e inglês (construído uma vez e compartilhado pelo processo)"""
+    return get_detector()
 
 def is_palavra_portugues(palavra, detector):
     """
@@ -89,7 +81,7 @@ def is_palavra_portugues(palavra, detector):
         
         # Considera como português apenas se for detectado como PORTUGUESE
         # e não for ENGLISH
-        if detected_language == Language.PORTUGUESE:
+        if detected_language is not None and detected_language.name == "PORTUGUESE":
             return True
         else:
             return False
@@ -142,6 +134,10 @@ def carregar_stopwords_padrao():
 def gerar_wordcloud(palavras_ocorrencias, quantidade_palavras, fonte_min, fonte_max, mascara_path):
     """Gera uma word cloud baseada nas palavras e ocorrências"""
     try:
+        import numpy as np
+        from PIL import Image
+        from wordcloud import WordCloud
+
         # Filtra as palavras pela quantidade selecionada
         palavras_selecionadas = dict(palavras_ocorrencias[:quantidade_palavras])
         
@@ -185,12 +181,233 @@ def gerar_wordcloud(palavras_ocorrencias, quantidade_palavras, fonte_min, fonte_
         st.error(f"Erro ao gerar word cloud: {e}")
         return None
 
+def contar_palavras(job, caminhos, stopwords_combinadas):
+    """
+    Tarefa em segundo plano (background_jobs): conta as palavras em português dos PDFs.
+    Informa o progresso e, a cada PDF, as palavras válidas dele como resultado parcial.
+    """
+    job.report(0.0, "Inicializando detector de idiomas...")
+    detector_idioma = inicializar_detector_idioma()
+
+    todas_palavras = []
+    palavras_filtradas_info = []
+    erros = []
+    total_arquivos = len(caminhos)
+
+    for indice, caminho_completo in enumerate(caminhos):
+        job.check()
+        job.report(indice / total_arquivos, f"Processando: ({indice+1}/{total_arquivos}) {caminho_completo.name}")
+
+        texto_pdf = processar_pdf(caminho_completo, erros)
+        texto_processado = processar_texto(texto_pdf)
+
+        # Divide em palavras e adiciona ao array
+        palavras = texto_processado.lower().split()
+        palavras_sem_acentos = [remover_acentos(palavra) for palavra in palavras]
+
+        # Filtra palavras
+        palavras_validas = []
+        for palavra in palavras_sem_acentos:
+            palavra = palavra.strip()
+
+            # Verifica comprimento mínimo
+            if len(palavra) < 5:
+                palavras_filtradas_info.append(f"'{palavra}' - tamanho < 5")
+                continue
+
+            # Verifica se é sigla
+            if is_sigla(palavra):
+                palavras_filtradas_info.append(f"'{palavra}' - sigla")
+                continue
+
+            # Verifica se é palavra em português usando Lingua-py
+            if not is_palavra_portugues(palavra, detector_idioma):
+                palavras_filtradas_info.append(f"'{palavra}' - não é português")
+                continue
+
+            # Verifica se está nas stopwords combinadas
+            if palavra in stopwords_combinadas:
+                palavras_filtradas_info.append(f"'{palavra}' - stopword")
+                continue
+
+            palavras_validas.append(palavra)
+
+        todas_palavras.extend(palavras_validas)
+        job.report(partial=(caminho_completo.name, Counter(palavras_validas)))
+
+    job.report(1.0, "Processamento concluído! Gerando resultados...")
+
+    # Ordena em ordem alfabética
+    todas_palavras.sort()
+
+    # Cria array com palavras e ocorrências
+    contador_palavras = Counter(todas_palavras)
+
+    # Filtra palavras com menos de 2 ocorrências
+    palavras_ocorrencias = [(palavra, quantidade) for palavra, quantidade in contador_palavras.items()
+                          if quantidade >= 2]
+
+    # Ordena por ocorrências (decrescente)
+    palavras_ocorrencias.sort(key=lambda x: x[1], reverse=True)
+
+    return {
+        'arquivos': total_arquivos,
+        'palavras_validas': len(todas_palavras),
+        'palavras_filtradas_info': palavras_filtradas_info,
+        'contador_palavras': contador_palavras,
+        'palavras_ocorrencias': palavras_ocorrencias,
+        'erros': erros
+    }
+
+def mostrar_progresso(job):
+    """Progresso da tarefa e palavras mais frequentes dos PDFs já processados"""
+    st.progress(int(job.progress * 100))
+    st.text(f"Progresso: {int(job.progress * 100)}% - {job.message}")
+
+    parciais = job.partial_results()
+    if parciais:
+        contador_parcial = Counter()
+        for _, contador_arquivo in parciais:
+            contador_parcial.update(contador_arquivo)
+        st.write(f"**Mais frequentes nos {len(parciais)} PDFs processados até agora:**")
+        st.write(", ".join(f"{palavra} ({quantidade})" for palavra, quantidade in contador_parcial.most_common(15)))
+
+def mostrar_resultados(resultado):
+    """Estatísticas, listas e downloads da contagem de palavras"""
+    palavras_filtradas_info = resultado['palavras_filtradas_info']
+    contador_palavras = resultado['contador_palavras']
+    palavras_ocorrencias = resultado['palavras_ocorrencias']
+
+    for erro in resultado['erros']:
+        st.error(erro)
+
+    st.success("✅ Processamento concluído!")
+
+    # Estatísticas de filtragem
+    st.subheader("📊 Estatísticas de Filtragem")
+    col1, col2, col3 = st.columns(3)
+
+    total_palavras_processadas = len(palavras_filtradas_info) + resultado['palavras_validas']
+    palavras_unicas_iniciais = len(contador_palavras)
+    palavras_apos_filtro = len(palavras_ocorrencias)
+
+    with col1:
+        st.metric("Palavras processadas", total_palavras_processadas)
+        st.metric("Palavras filtradas", len(palavras_filtradas_info))
+
+    with col2:
+        st.metric("Palavras válidas", resultado['palavras_validas'])
+        st.metric("Palavras únicas iniciais", palavras_unicas_iniciais)
+
+    with col3:
+        st.metric("Arquivos processados", resultado['arquivos'])
+        st.metric("Palavras após filtro (≥2 ocorrências)", palavras_apos_filtro)
+
+    # Mostra exemplos de palavras filtradas
+    with st.expander("🔍 Ver exemplos de palavras filtradas"):
+        if palavras_filtradas_info:
+            # Agrupa por motivo de filtragem
+            filtros = {}
+            for info in palavras_filtradas_info[:200]:  # Mostra apenas os 200 primeiros
+                partes = info.split(' - ')
+                if len(partes) == 2:
+                    motivo = partes[1]
+                    palavra = partes[0].replace("'", "")
+                    if motivo not in filtros:
+                        filtros[motivo] = set()
+                    filtros[motivo].add(palavra)
+
+            for motivo, palavras_set in filtros.items():
+                # Convertendo o set para lista para poder fazer slice
+                palavras_lista = list(palavras_set)
+                st.write(f"**{motivo}:** {', '.join(palavras_lista[:10])}")
+                if len(palavras_lista) > 10:
+                    st.write(f"... e mais {len(palavras_lista) - 10} palavras")
+        else:
+            st.write("Nenhuma palavra foi filtrada.")
+
+    # Mostra palavras removidas por terem menos de 2 ocorrências
+    palavras_removidas_baixa_frequencia = [palavra for palavra, quantidade in contador_palavras.items() 
+                                         if quantidade < 2]
+
+    if palavras_removidas_baixa_frequencia:
+        with st.expander("🔍 Ver palavras removidas (menos de 2 ocorrências)"):
+            st.write(f"**Total de palavras removidas por baixa frequência:** {len(palavras_removidas_baixa_frequencia)}")
+            # Agrupa em colunas para melhor visualização
+            col1, col2, col3 = st.columns(3)
+            palavras_por_coluna = len(palavras_removidas_baixa_frequencia) // 3 + 1
+
+            with col1:
+                for palavra in palavras_removidas_baixa_frequencia[:palavras_por_coluna]:
+                    st.write(f"- {palavra}")
+
+            with col2:
+                for palavra in palavras_removidas_baixa_frequencia[palavras_por_coluna:palavras_por_coluna*2]:
+                    st.write(f"- {palavra}")
+
+            with col3:
+                for palavra in palavras_removidas_baixa_frequencia[palavras_por_coluna*2:]:
+                    st.write(f"- {palavra}")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("📈 Top 15 Palavras Mais Frequentes")
+        if palavras_ocorrencias:
+            for i, (palavra, quantidade) in enumerate(palavras_ocorrencias[:15], 1):
+                st.write(f"{i}. **{palavra}** - {quantidade} ocorrências")
+        else:
+            st.write("Nenhuma palavra atende aos critérios de filtragem")
+
+    with col2:
+        st.subheader("📉 Palavras Menos Frequentes")
+        if palavras_ocorrencias:
+            palavras_menos_frequentes = palavras_ocorrencias[-15:] if len(palavras_ocorrencias) >= 15 else palavras_ocorrencias
+            for i, (palavra, quantidade) in enumerate(palavras_menos_frequentes, 1):
+                st.write(f"{i}. **{palavra}** - {quantidade} ocorrências")
+        else:
+            st.write("Nenhuma palavra atende aos critérios de filtragem")
+
+    # Mostra tabela completa
+    st.subheader("📋 Lista Completa de Palavras e Ocorrências")
+
+    if palavras_ocorrencias:
+        # Cria DataFrame para melhor visualização
+        import pandas as pd
+        df = pd.DataFrame(palavras_ocorrencias, columns=['Palavra', 'Ocorrências'])
+
+        st.dataframe(df, use_container_width=True)
+
+        # Opção de download - botões na mesma linha
+        st.subheader("💾 Download dos Resultados")
+        col_download1, col_download2 = st.columns(2)
+
+        with col_download1:
+            # Salva como CSV
+            csv = df.to_csv(index=False)
+            st.download_button(
+                label="📥 Baixar como CSV",
+                data=csv,
+                file_name="analise_palavras_portugues.csv",
+                mime="text/csv",
+                use_container_width=True
+            )
+
+        with col_download2:
+            # Salva como TXT
+            texto_resultado = "Palavra\tOcorrências\n"
+            for palavra, quantidade in palavras_ocorrencias:
+                texto_resultado += f"{palavra}\t{quantidade}\n"
+
+            st.download_button(
+                label="📥 Baixar como TXT",
+                data=texto_resultado,
+                file_name="analise_palavras_portugues.txt",
+                mime="text/plain",
+                use_container_width=True
+            )
+
 def main():
-    # Inicializa o detector de idioma
-    with st.spinner("Inicializando detector de idiomas..."):
-        detector_idioma = inicializar_detector_idioma()
-    st.write("✅ Detector de idiomas inicializado")
-    
     # Verifica se a patopwords carregadas do arquivo padrãosta existe
     if not pasta_pdf.exists():
         st.error(f"A pasta '{pasta_pdf}' não foi encontrada!")
@@ -237,212 +454,43 @@ def main():
         
         st.write(f"**Total de stopwords ativas:** {len(stopwords_combinadas)} palavras")
     
-    # Processa todos os PDFs
-    if st.button("🔍 Processar PDFs"):
-        with st.spinner("Processando arquivos PDF..."):
-            todas_palavras = []
-            palavras_filtradas_info = []
-            
-            # Cria a barra de progresso
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            
-            total_arquivos = len(arquivos_pdf)
-            
-            for indice, arquivo_pdf in enumerate(arquivos_pdf):
-                caminho_completo = pasta_pdf / arquivo_pdf
-                
-                # Atualiza a barra de progresso (0-100%)
-                percentual = int((indice / total_arquivos) * 100)
-                progress_bar.progress(percentual)
-                status_text.text(f"Progresso: {percentual}% - Processando: ({indice+1}/{total_arquivos})")
-                
-                texto_pdf = processar_pdf(caminho_completo)
-                texto_processado = processar_texto(texto_pdf)
-                
-                # Divide em palavras e adiciona ao array
-                palavras = texto_processado.lower().split()
-                palavras_sem_acentos = [remover_acentos(palavra) for palavra in palavras]
-                
-                # Filtra palavras
-                palavras_validas = []
-                for palavra in palavras_sem_acentos:
-                    palavra = palavra.strip()
-                    
-                    # Verifica comprimento mínimo
-                    if len(palavra) < 5:
-                        palavras_filtradas_info.append(f"'{palavra}' - tamanho < 5")
-                        continue
-                    
-                    # Verifica se é sigla
-                    if is_sigla(palavra):
-                        palavras_filtradas_info.append(f"'{palavra}' - sigla")
-                        continue
-                    
-                    # Verifica se é palavra em português usando Lingua-py
-                    if not is_palavra_portugues(palavra, detector_idioma):
-                        palavras_filtradas_info.append(f"'{palavra}' - não é português")
-                        continue
-                    
-                    # Verifica se está nas stopwords combinadas
-                    if palavra in stopwords_combinadas:
-                        palavras_filtradas_info.append(f"'{palavra}' - stopword")
-                        continue
-                    
-                    palavras_validas.append(palavra)
-                
-                todas_palavras.extend(palavras_validas)
-            
-            # Completa a barra de progresso (100%)
-            progress_bar.progress(100)
-            status_text.text("Processamento concluído! Gerando resultados...")
-            
-            # Ordena em ordem alfabética
-            todas_palavras.sort()
-            
-            # Cria array com palavras e ocorrências
-            contador_palavras = Counter(todas_palavras)
-            
-            # Filtra palavras com menos de 2 ocorrências
-            palavras_ocorrencias = [(palavra, quantidade) for palavra, quantidade in contador_palavras.items() 
-                                  if quantidade >= 2]
-            
-            # Ordena por ocorrências (decrescente)
-            palavras_ocorrencias.sort(key=lambda x: x[1], reverse=True)
-            
-            # Limpa o status text
-            status_text.empty()
-            
+    # Processa todos os PDFs em segundo plano: a página continua respondendo e a tarefa
+    # sobrevive às novas execuções do script (cliques em widgets)
+    # Identifica a sessão no executor (uma tarefa pedida por várias sessões só é cancelada
+    # quando todas desistem dela)
+    session_id = st.session_state.setdefault('job_session_id', uuid.uuid4().hex)
+    job = JOBS.get(st.session_state.get('wordcloud_job'), session_id)
+    if job is not None and not job.done:
+        st.subheader("⏳ Processando arquivos PDF...")
+        mostrar_progresso(job)
+        if st.button("⏹️ Cancelar processamento"):
+            # Mesmo que a tarefa continue para outras sessões, esta desiste dela
+            JOBS.cancel(job.id, session_id)
+            del st.session_state['wordcloud_job']
+            st.rerun()
+        # Executa o script de novo para atualizar o progresso (a nuvem só depois do processamento)
+        time.sleep(POLL_INTERVAL)
+        st.rerun()
+    elif st.button("🔍 Processar PDFs"):
+        # PDFs (com a data de modificação) e stopwords iguais reaproveitam a tarefa de outra sessão
+        caminhos = [pasta_pdf / arquivo_pdf for arquivo_pdf in arquivos_pdf]
+        chave = ("wordcloud", tuple((caminho.name, caminho.stat().st_mtime) for caminho in caminhos),
+                 tuple(sorted(stopwords_combinadas)))
+        job = JOBS.submit(chave, session_id, contar_palavras, caminhos, stopwords_combinadas)
+        st.session_state.wordcloud_job = job.id
+        st.rerun()
+    elif job is not None:
+        if job.status == DONE:
             # Armazena os resultados na sessão para uso posterior
-            st.session_state.palavras_ocorrencias = palavras_ocorrencias
-            
-            # Mostra resultados
-            st.success("✅ Processamento concluído!")
-            
-            # Estatísticas de filtragem
-            st.subheader("📊 Estatísticas de Filtragem")
-            col1, col2, col3 = st.columns(3)
-            
-            total_palavras_processadas = len(palavras_filtradas_info) + len(todas_palavras)
-            palavras_unicas_iniciais = len(contador_palavras)
-            palavras_apos_filtro = len(palavras_ocorrencias)
-            
-            with col1:
-                st.metric("Palavras processadas", total_palavras_processadas)
-                st.metric("Palavras filtradas", len(palavras_filtradas_info))
-            
-            with col2:
-                st.metric("Palavras válidas", len(todas_palavras))
-                st.metric("Palavras únicas iniciais", palavras_unicas_iniciais)
-            
-            with col3:
-                st.metric("Arquivos processados", len(arquivos_pdf))
-                st.metric("Palavras após filtro (≥2 ocorrências)", palavras_apos_filtro)
-            
-            # Mostra exemplos de palavras filtradas
-            with st.expander("🔍 Ver exemplos de palavras filtradas"):
-                if palavras_filtradas_info:
-                    # Agrupa por motivo de filtragem
-                    filtros = {}
-                    for info in palavras_filtradas_info[:200]:  # Mostra apenas os 200 primeiros
-                        partes = info.split(' - ')
-                        if len(partes) == 2:
-                            motivo = partes[1]
-                            palavra = partes[0].replace("'", "")
-                            if motivo not in filtros:
-                                filtros[motivo] = set()
-                            filtros[motivo].add(palavra)
-                    
-                    for motivo, palavras_set in filtros.items():
-                        # Convertendo o set para lista para poder fazer slice
-                        palavras_lista = list(palavras_set)
-                        st.write(f"**{motivo}:** {', '.join(palavras_lista[:10])}")
-                        if len(palavras_lista) > 10:
-                            st.write(f"... e mais {len(palavras_lista) - 10} palavras")
-                else:
-                    st.write("Nenhuma palavra foi filtrada.")
-            
-            # Mostra palavras removidas por terem menos de 2 ocorrências
-            palavras_removidas_baixa_frequencia = [palavra for palavra, quantidade in contador_palavras.items() 
-                                                 if quantidade < 2]
-            
-            if palavras_removidas_baixa_frequencia:
-                with st.expander("🔍 Ver palavras removidas (menos de 2 ocorrências)"):
-                    st.write(f"**Total de palavras removidas por baixa frequência:** {len(palavras_removidas_baixa_frequencia)}")
-                    # Agrupa em colunas para melhor visualização
-                    col1, col2, col3 = st.columns(3)
-                    palavras_por_coluna = len(palavras_removidas_baixa_frequencia) // 3 + 1
-                    
-                    with col1:
-                        for palavra in palavras_removidas_baixa_frequencia[:palavras_por_coluna]:
-                            st.write(f"- {palavra}")
-                    
-                    with col2:
-                        for palavra in palavras_removidas_baixa_frequencia[palavras_por_coluna:palavras_por_coluna*2]:
-                            st.write(f"- {palavra}")
-                    
-                    with col3:
-                        for palavra in palavras_removidas_baixa_frequencia[palavras_por_coluna*2:]:
-                            st.write(f"- {palavra}")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.subheader("📈 Top 15 Palavras Mais Frequentes")
-                if palavras_ocorrencias:
-                    for i, (palavra, quantidade) in enumerate(palavras_ocorrencias[:15], 1):
-                        st.write(f"{i}. **{palavra}** - {quantidade} ocorrências")
-                else:
-                    st.write("Nenhuma palavra atende aos critérios de filtragem")
-            
-            with col2:
-                st.subheader("📉 Palavras Menos Frequentes")
-                if palavras_ocorrencias:
-                    palavras_menos_frequentes = palavras_ocorrencias[-15:] if len(palavras_ocorrencias) >= 15 else palavras_ocorrencias
-                    for i, (palavra, quantidade) in enumerate(palavras_menos_frequentes, 1):
-                        st.write(f"{i}. **{palavra}** - {quantidade} ocorrências")
-                else:
-                    st.write("Nenhuma palavra atende aos critérios de filtragem")
-            
-            # Mostra tabela completa
-            st.subheader("📋 Lista Completa de Palavras e Ocorrências")
-            
-            if palavras_ocorrencias:
-                # Cria DataFrame para melhor visualização
-                import pandas as pd
-                df = pd.DataFrame(palavras_ocorrencias, columns=['Palavra', 'Ocorrências'])
-                
-                st.dataframe(df, use_container_width=True)
-                
-                # Opção de download - botões na mesma linha
-                st.subheader("💾 Download dos Resultados")
-                col_download1, col_download2 = st.columns(2)
-                
-                with col_download1:
-                    # Salva como CSV
-                    csv = df.to_csv(index=False)
-                    st.download_button(
-                        label="📥 Baixar como CSV",
-                        data=csv,
-                        file_name="analise_palavras_portugues.csv",
-                        mime="text/csv",
-                        use_container_width=True
-                    )
-                
-                with col_download2:
-                    # Salva como TXT
-                    texto_resultado = "Palavra\tOcorrências\n"
-                    for palavra, quantidade in palavras_ocorrencias:
-                        texto_resultado += f"{palavra}\t{quantidade}\n"
-                    
-                    st.download_button(
-                        label="📥 Baixar como TXT",
-                        data=texto_resultado,
-                        file_name="analise_palavras_portugues.txt",
-                        mime="text/plain",
-                        use_container_width=True
-                    )
-    
+            st.session_state.palavras_ocorrencias = job.result['palavras_ocorrencias']
+            mostrar_resultados(job.result)
+        elif job.status == FAILED:
+            st.error(f"Erro ao processar os PDFs: {job.error}")
+        else:
+            st.info("ℹ️ Processamento cancelado")
+    elif 'wordcloud_job' in st.session_state:
+        st.info("ℹ️ O resultado do processamento expirou. Processe os PDFs novamente.")
+
     # Seção para Word Cloud - MOVIDA PARA FORA DO BLOCO "Processar PDFs"
     if 'palavras_ocorrencias' in st.session_state:
         st.subheader("☁️ Gerar Nuvem de Palavras")
@@ -0,0 +1,204 @@
+"""
+Cache persistente de resultados de análises, em SQLite, que sobrevive a reinícios do app.
+
+Cada resultado (qualquer objeto serializável com pickle) é guardado com a chave
+(sha256 do conteúdo analisado, nome da análise, versão). A versão deve mudar sempre que
+o resultado mudar para o mesmo conteúdo (ex: outro modelo spaCy ou outra regra), e assim
+resultados antigos deixam de ser usados sem precisar apagar nada.
+
+Quando a soma dos resultados passa de max_bytes, os menos usados recentemente são
+apagados. O banco usa WAL e transações IMMEDIATE nas gravações, de modo que vários
+processos do app na mesma máquina podem compartilhar o arquivo.
+
+Exemplo:
+    from analysis_cache import ANALYSES, sha256_of
+    resultado = ANALYSES.get_or_compute(sha256_of(pdf), "gramatica", 1, lambda: analisar(pdf))
+"""
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+
+DEFAULT_PATH = Path(os.environ.get(
+    "ANALYSIS_CACHE_PATH",
+    Path(__file__).resolve().parent.parent / "arquivos" / "cache" / "analises.sqlite3"))
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# Espera máxima (s) por outro processo que esteja gravando
+BUSY_TIMEOUT = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    digest TEXT NOT NULL,
+    analysis TEXT NOT NULL,
+    version TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (digest, analysis, version)
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+"""
+
+_MISSING = object()
+
+
+def sha256_of(source):
+    """
+    sha256 (hexadecimal) de bytes, de um caminho ou de um arquivo aberto/carregado
+    (ex: UploadedFile do Streamlit).
+    """
+    digest = hashlib.sha256()
+    if isinstance(source, (bytes, bytearray)):
+        digest.update(source)
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+    elif hasattr(source, "getvalue"):
+        digest.update(source.getvalue())
+    else:
+        position = source.tell()
+        digest.update(source.read())
+        source.seek(position)
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """
+    Resultados de análises em um arquivo SQLite.
+
+    Args:
+        path: Arquivo do banco (criado no primeiro uso).
+        max_bytes (int): Tamanho máximo somado dos resultados guardados.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        # Uma conexão por operação: conexões sqlite3 não podem ser usadas por várias threads
+        if not self._ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        if not self._ready:
+            with self._lock:
+                # auto_vacuum só vale se definido antes de criar as tabelas
+                connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                connection.execute("PRAGMA journal_mode = WAL")
+                connection.executescript(SCHEMA)
+                self._ready = True
+        return connection
+
+    def get(self, digest, analysis, version, default=None):
+        """Resultado guardado para (digest, analysis, version), ou default."""
+        key = (digest, analysis, str(version))
+        row = None
+        try:
+            with closing(self._connect()) as connection:
+                row = connection.execute(
+                    "SELECT value FROM results WHERE digest = ? AND analysis = ? AND version = ?", key).fetchone()
+                if row is not None:
+                    connection.execute(
+                        "UPDATE results SET last_used = ? WHERE digest = ? AND analysis = ? AND version = ?",
+                        (time.time(),) + key)
+        except sqlite3.Error as e:
+            print(f"Aviso: cache de análises indisponível ({e})")
+        value = default
+        if row is not None:
+            try:
+                value = pickle.loads(row[0])
+            except Exception:
+                row = None
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def put(self, digest, analysis, version, value):
+        """Guarda o resultado e apaga os menos usados se o total passar de max_bytes."""
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            return
+        try:
+            with closing(self._connect()) as connection:
+                connection.execute("BEGIN IMMEDIATE")
+                try:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                        (digest, analysis, str(version), data, len(data), time.time()))
+                    evicted = self._evict(connection)
+                    connection.execute("COMMIT")
+                except BaseException:
+                    connection.execute("ROLLBACK")
+                    raise
+                if evicted:
+                    connection.execute("PRAGMA incremental_vacuum")
+        except sqlite3.Error as e:
+            print(f"Aviso: não foi possível gravar no cache de análises ({e})")
+
+    def _evict(self, connection):
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return 0
+        victims = []
+        for rowid, size in connection.execute("SELECT rowid, size FROM results ORDER BY last_used"):
+            if excess <= 0:
+                break
+            victims.append((rowid,))
+            excess -= size
+        connection.executemany("DELETE FROM results WHERE rowid = ?", victims)
+        return len(victims)
+
+    def get_or_compute(self, digest, analysis, version, compute):
+        """
+        Resultado guardado ou, se não houver, compute() (guardado se não for None).
+
+        Args:
+            digest (str): sha256 do conteúdo analisado (ver sha256_of).
+            analysis (str): Nome da análise.
+            version: Versão da análise (ex: número + modelo usado); convertida em str.
+            compute: Função sem argumentos que calcula o resultado.
+        """
+        value = self.get(digest, analysis, version, default=_MISSING)
+        if value is _MISSING:
+            value = compute()
+            if value is not None:
+                self.put(digest, analysis, version, value)
+        return value
+
+    def stats(self):
+        """Resultados e bytes guardados no arquivo, e acertos/faltas neste processo."""
+        entries, size = 0, 0
+        try:
+            with closing(self._connect()) as connection:
+                entries, size = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        except sqlite3.Error:
+            pass
+        return {'entries': entries, 'bytes': size, 'hits': self.hits, 'misses': self.misses}
+
+
+# Cache compartilhado pelas páginas do app
+ANALYSES = AnalysisCache()
+
+# Versão do texto extraído: muda com o backend de extração
+PDF_TEXT_VERSION = 1
+
+
+def cached_extract_text(source):
+    """pdf_extraction.extract_text(source), guardado pelo sha256 do PDF."""
+    from pdf_extraction import default_backend, extract_text
+
+    return ANALYSES.get_or_compute(sha256_of(source), "texto_pdf", (PDF_TEXT_VERSION, default_backend()),
+                                   lambda: extract_text(source))
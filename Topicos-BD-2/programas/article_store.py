@@ -0,0 +1,219 @@
+"""
+Gravação e leitura dos artigos gerados por "4 - gera_json.py".
+
+JSONL: cada artigo é uma linha JSON compacta, gravada assim que é processado. Uma
+execução interrompida pode ser retomada: ArticleJSONLWriter descarta uma última linha
+incompleta e informa quais artigos (pela storage_key) já estão no arquivo.
+
+Colunar (Parquet, requer pyarrow): write_column_store grava os tokens, POS e lemas em
+<prefixo>.tokens.parquet, uma linha por token com colunas codificadas por dicionário e
+um row group por artigo, e os demais metadados em <prefixo>.articles.parquet.
+ArticleColumnStore lê um artigo (só o seu row group) ou uma coluna sem ler o resto.
+
+Exemplo:
+    from article_store import iter_articles
+    for artigo in iter_articles("artigos.jsonl", fields=("titulo", "lema")):
+        ...
+
+    from article_store import ArticleColumnStore
+    store = ArticleColumnStore("artigos")
+    artigo = store.get_article(0)
+"""
+import json
+import os
+
+# Campo que identifica o artigo (caminho do PDF de origem)
+ARTICLE_KEY = 'storage_key'
+
+
+def _truncate_partial_line(path):
+    """Remove uma última linha sem '\\n' (gravação interrompida). Returns: bytes removidos."""
+    with open(path, "rb+") as f:
+        size = f.seek(0, os.SEEK_END)
+        position = size
+        while position > 0:
+            step = min(64 * 1024, position)
+            f.seek(position - step)
+            block = f.read(step)
+            newline = block.rfind(b"\n")
+            if newline != -1:
+                position = position - step + newline + 1
+                break
+            position -= step
+        if position < size:
+            f.truncate(position)
+        return size - position
+
+
+class ArticleJSONLWriter:
+    """
+    Acrescenta artigos a um arquivo JSONL, uma linha por artigo.
+
+    Args:
+        path (str): Arquivo de saída; se já existir, os artigos gravados são mantidos.
+        key (str): Campo que identifica cada artigo para a retomada.
+    """
+
+    def __init__(self, path, key=ARTICLE_KEY):
+        self.path = path
+        self.key = key
+        self.completed = set()
+        if os.path.exists(path):
+            removed = _truncate_partial_line(path)
+            if removed:
+                print(f"Aviso: última linha incompleta de {path} descartada ({removed} bytes).")
+            for article in iter_articles(path, fields=(key,)):
+                self.completed.add(article.get(key))
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, article):
+        """Grava o artigo e descarrega o buffer, para que sobreviva a uma interrupção."""
+        self._file.write(json.dumps(article, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._file.flush()
+        self.completed.add(article.get(self.key))
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_articles(path, fields=None):
+    """
+    Lê os artigos de um arquivo JSONL um a um, sem carregar o arquivo inteiro.
+
+    Args:
+        path (str): Arquivo JSONL.
+        fields (tuple): Se informado, cada artigo traz só estes campos.
+
+    Yields:
+        dict: Um artigo por linha válida (linhas incompletas ou inválidas são ignoradas).
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                article = json.loads(line)
+            except ValueError:
+                continue
+            if fields is not None:
+                article = {field: article.get(field) for field in fields}
+            yield article
+
+
+# Listas paralelas por token do artigo -> coluna na tabela de tokens
+TOKEN_FIELDS = {'artigo_tokenizado': 'token', 'pos_tagger': 'pos', 'lema': 'lemma'}
+TOKENS_SUFFIX = ".tokens.parquet"
+ARTICLES_SUFFIX = ".articles.parquet"
+
+
+def _token_schema():
+    import pyarrow as pa
+
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([('token', dictionary), ('pos', dictionary), ('lemma', dictionary)])
+
+
+def _decode_column(column):
+    """Lista Python de uma coluna codificada por dicionário (uma string por valor distinto)."""
+    values = []
+    for chunk in column.chunks:
+        dictionary = chunk.dictionary.to_pylist()
+        values.extend([dictionary[index] for index in chunk.indices.to_pylist()])
+    return values
+
+
+def write_column_store(articles, prefix):
+    """
+    Grava artigos (ex: iter_articles de um JSONL) no formato colunar, em fluxo.
+
+    Args:
+        articles (iterable): Dicionários no formato de "4 - gera_json.py".
+        prefix (str): Prefixo dos arquivos <prefix>.tokens.parquet e <prefix>.articles.parquet.
+
+    Returns:
+        int: Número de artigos gravados.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _token_schema()
+    rows = []
+    row_groups = 0
+    with pq.ParquetWriter(prefix + TOKENS_SUFFIX, schema, compression="zstd") as writer:
+        for article in articles:
+            columns = {column: article.get(field) or [] for field, column in TOKEN_FIELDS.items()}
+            row = {key: value for key, value in article.items() if key not in TOKEN_FIELDS}
+            row['token_count'] = len(columns['token'])
+            # Um row group por artigo: ler um artigo lê só o seu row group
+            # (artigos sem tokens não têm row group)
+            row['row_group'] = row_groups if row['token_count'] else None
+            if row['token_count']:
+                writer.write_table(pa.table(
+                    {column: pa.array(values, pa.string()).dictionary_encode() for column, values in columns.items()},
+                    schema=schema), row_group_size=row['token_count'])
+                row_groups += 1
+            rows.append(row)
+    pq.write_table(pa.Table.from_pylist(rows), prefix + ARTICLES_SUFFIX, compression="zstd")
+    return len(rows)
+
+
+class ArticleColumnStore:
+    """
+    Leitura do formato colunar gravado por write_column_store.
+
+    A tabela de metadados (pequena) é carregada ao abrir; tokens, POS e lemas só são
+    lidos sob demanda, por artigo (row group) ou por coluna.
+    """
+
+    def __init__(self, prefix):
+        import pyarrow.parquet as pq
+
+        self.prefix = prefix
+        self._tokens = pq.ParquetFile(prefix + TOKENS_SUFFIX)
+        self.articles = pq.read_table(prefix + ARTICLES_SUFFIX).to_pylist()
+        self._by_key = {article.get(ARTICLE_KEY): index for index, article in enumerate(self.articles)}
+
+    def __len__(self):
+        return len(self.articles)
+
+    def _index(self, article):
+        return self._by_key[article] if isinstance(article, str) else article
+
+    def get_article(self, article, fields=tuple(TOKEN_FIELDS)):
+        """
+        Um artigo completo, no mesmo formato do JSON.
+
+        Args:
+            article: Posição do artigo ou sua storage_key.
+            fields (tuple): Listas por token a carregar (artigo_tokenizado, pos_tagger, lema).
+        """
+        result = dict(self.articles[self._index(article)])
+        row_group = result.pop('row_group')
+        result.pop('token_count')
+        columns = [TOKEN_FIELDS[field] for field in fields]
+        table = self._tokens.read_row_group(row_group, columns=columns) if row_group is not None else None
+        for field, column in zip(fields, columns):
+            result[field] = _decode_column(table.column(column)) if table is not None else []
+        return result
+
+    def column(self, field):
+        """
+        Um campo de todos os artigos: lista por token (um list por artigo) ou metadado.
+
+        Args:
+            field (str): Ex: 'lema', 'pos_tagger', 'titulo', 'idioma'.
+        """
+        if field not in TOKEN_FIELDS:
+            return [article.get(field) for article in self.articles]
+        values = _decode_column(self._tokens.read(columns=[TOKEN_FIELDS[field]]).column(0))
+        result, start = [], 0
+        for article in self.articles:
+            result.append(values[start:start + article['token_count']])
+            start += article['token_count']
+        return result
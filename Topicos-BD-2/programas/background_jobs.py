@@ -0,0 +1,282 @@
+"""
+Tarefas longas em segundo plano, compartilhadas pelas sessões do Streamlit.
+
+Sem o executor, uma análise longa (ex: processar todos os PDFs no Word Cloud) roda na
+thread do script sob st.spinner: a página fica bloqueada e qualquer clique em um widget
+reinicia o script e descarta o trabalho feito. JobRunner roda as tarefas em um pool de
+threads; a página guarda o id da tarefa em st.session_state, consulta o estado a cada
+execução do script e mostra o progresso e os resultados parciais enquanto a tarefa roda.
+
+Cada tarefa tem uma chave (ex: os arquivos e parâmetros da análise): pedidos com a mesma
+chave, de qualquer sessão, recebem a tarefa já existente em vez de repetir o trabalho.
+Tarefas concluídas ficam guardadas por retention segundos (até max_finished), para que
+quem pediu depois também receba o resultado.
+
+A tarefa guarda as sessões que a pediram e só é cancelada quando todas desistem dela:
+por cancel(job_id, session_id) ou por deixarem de consultá-la (get com o session_id) por
+abandon_after segundos, como acontece quando a aba do navegador é fechada.
+
+A função da tarefa recebe o Job como primeiro argumento e informa o andamento com
+job.report(); o cancelamento é cooperativo: job.check() levanta JobCancelled depois que a
+tarefa foi cancelada, e deve ser chamado entre as etapas.
+
+Exemplo:
+    from background_jobs import JOBS
+
+    def contar(job, caminhos):
+        for indice, caminho in enumerate(caminhos):
+            job.check()
+            job.report(indice / len(caminhos), f"Processando {caminho}", partial=...)
+        return resultado
+
+    job = JOBS.submit(("contagem", tuple(caminhos)), session_id, contar, caminhos)
+    st.session_state.job_id = job.id
+    ...
+    job = JOBS.get(st.session_state.job_id, session_id)  # a cada execução do script
+"""
+import concurrent.futures
+import itertools
+import threading
+import time
+
+DEFAULT_WORKERS = 2
+# Tempo (s) que uma tarefa concluída fica disponível
+DEFAULT_RETENTION = 30 * 60
+DEFAULT_MAX_FINISHED = 50
+# Tempo (s) sem consultas de uma sessão após o qual ela deixa de esperar pela tarefa
+DEFAULT_ABANDON_AFTER = 5 * 60
+
+# Estados de uma tarefa
+PENDING = "pendente"
+RUNNING = "executando"
+DONE = "concluída"
+FAILED = "falhou"
+CANCELLED = "cancelada"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Levantada por Job.check() em uma tarefa cancelada."""
+
+
+class Job:
+    """
+    Uma tarefa submetida ao JobRunner.
+
+    Os atributos são lidos pelas páginas a cada execução do script; só a thread da tarefa
+    e o JobRunner os alteram.
+
+    Args:
+        job_id (str): Identificador da tarefa.
+        key: Chave usada para reaproveitar a tarefa entre pedidos iguais.
+    """
+
+    def __init__(self, job_id, key):
+        self.id = job_id
+        self.key = key
+        self.status = PENDING
+        self.progress = 0.0
+        self.message = ""
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+        # Sessões que esperam pela tarefa -> última consulta (time.monotonic); ela só é
+        # cancelada quando todas desistem
+        self.subscribers = {}
+        self._partial = []
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._future = None
+
+    @property
+    def done(self):
+        return self.status in FINISHED
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def report(self, progress=None, message=None, partial=None):
+        """
+        Atualiza o andamento da tarefa.
+
+        Args:
+            progress (float): Fração concluída, de 0 a 1.
+            message (str): Descrição da etapa atual.
+            partial: Resultado parcial, acrescentado aos anteriores (ver partial_results).
+        """
+        with self._lock:
+            if progress is not None:
+                self.progress = min(max(progress, 0.0), 1.0)
+            if message is not None:
+                self.message = message
+            if partial is not None:
+                self._partial.append(partial)
+
+    def partial_results(self):
+        """Resultados parciais informados até agora, na ordem em que chegaram."""
+        with self._lock:
+            return list(self._partial)
+
+    def check(self):
+        """Levanta JobCancelled se a tarefa foi cancelada."""
+        if self._cancel.is_set():
+            raise JobCancelled(self.id)
+
+    def _finish(self, status, result=None, error=None):
+        with self._lock:
+            self.status = status
+            self.result = result
+            self.error = error
+            if status == DONE:
+                self.progress = 1.0
+            self.finished = time.time()
+
+
+class JobRunner:
+    """
+    Pool de threads que executa tarefas com id, progresso, cancelamento e resultados
+    guardados por um tempo.
+
+    Args:
+        workers (int): Tarefas executadas ao mesmo tempo; as demais esperam na fila.
+        retention (float): Tempo (s) que uma tarefa concluída fica disponível.
+        max_finished (int): Máximo de tarefas concluídas guardadas (as mais antigas saem).
+        abandon_after (float): Tempo (s) sem consultas após o qual uma sessão deixa de
+            esperar pela tarefa (None nunca).
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, retention=DEFAULT_RETENTION, max_finished=DEFAULT_MAX_FINISHED,
+                 abandon_after=DEFAULT_ABANDON_AFTER):
+        self.retention = retention
+        self.max_finished = max_finished
+        self.abandon_after = abandon_after
+        self.submitted = 0
+        self.reused = 0
+        self._jobs = {}
+        self._by_key = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._pool = concurrent.futures.ThreadPoolExecutor(workers, thread_name_prefix="job")
+
+    def submit(self, key, session_id, function, *args, **kwargs):
+        """
+        Executa function(job, *args, **kwargs) em segundo plano, ou reaproveita a tarefa
+        com a mesma chave que ainda não falhou nem foi cancelada.
+
+        Args:
+            key: Chave da tarefa (qualquer valor que possa ser chave de dict).
+            session_id (str): Sessão que pede a tarefa (passa a esperar por ela).
+            function: Função da tarefa; o valor devolvido vira job.result.
+
+        Returns:
+            Job: A tarefa (nova ou existente).
+        """
+        with self._lock:
+            self._prune()
+            job = self._by_key.get(key)
+            if job is not None and not job.cancelled and job.status not in (FAILED, CANCELLED):
+                job.subscribers[session_id] = time.monotonic()
+                self.reused += 1
+                return job
+            job = Job(str(next(self._ids)), key)
+            job.subscribers[session_id] = time.monotonic()
+            self._jobs[job.id] = job
+            self._by_key[key] = job
+            self.submitted += 1
+        job._future = self._pool.submit(self._run, job, function, args, kwargs)
+        return job
+
+    def _run(self, job, function, args, kwargs):
+        if job.cancelled:
+            job._finish(CANCELLED)
+            return
+        job.status = RUNNING
+        try:
+            result = function(job, *args, **kwargs)
+        except JobCancelled:
+            job._finish(CANCELLED)
+        except Exception as e:
+            job._finish(FAILED, error=f"{type(e).__name__}: {e}")
+        else:
+            job._finish(CANCELLED if job.cancelled else DONE, result=result)
+
+    def get(self, job_id, session_id=None):
+        """
+        Tarefa com job_id, ou None se não existe (ou já saiu da retenção). Com session_id,
+        registra a consulta da sessão, se ela ainda espera pela tarefa.
+        """
+        if job_id is None:
+            return None
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(job_id)
+            if job is not None and session_id in job.subscribers:
+                job.subscribers[session_id] = time.monotonic()
+            return job
+
+    def cancel(self, job_id, session_id):
+        """
+        Desiste da tarefa para a sessão session_id (chamadas repetidas não têm efeito). Ela
+        é cancelada quando nenhuma sessão a espera mais: se ainda está na fila, nem começa;
+        se já está rodando, para no próximo job.check().
+
+        Returns:
+            bool: Se a tarefa foi de fato cancelada.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.done or job.subscribers.pop(session_id, None) is None or job.subscribers:
+                return False
+            job._cancel.set()
+        self._cancel_future(job)
+        return True
+
+    @staticmethod
+    def _cancel_future(job):
+        if job._future is not None and job._future.cancel():
+            job._finish(CANCELLED)
+
+    def _prune(self):
+        # Chamado com self._lock
+        if self.abandon_after is not None:
+            # Tarefas em andamento sem nenhuma sessão que ainda as consulte
+            now = time.monotonic()
+            for job in self._jobs.values():
+                if job.done or job.cancelled:
+                    continue
+                for session_id, last_seen in list(job.subscribers.items()):
+                    if now - last_seen > self.abandon_after:
+                        del job.subscribers[session_id]
+                if not job.subscribers:
+                    job._cancel.set()
+                    self._cancel_future(job)
+        now = time.time()
+        finished = sorted((job for job in self._jobs.values() if job.done), key=lambda job: job.finished)
+        expired = [job for job in finished if now - job.finished > self.retention]
+        expired += [job for job in finished[:max(len(finished) - self.max_finished, 0)] if job not in expired]
+        for job in expired:
+            del self._jobs[job.id]
+            if self._by_key.get(job.key) is job:
+                del self._by_key[job.key]
+
+    def stats(self):
+        """Tarefas por estado, submetidas e reaproveitadas."""
+        with self._lock:
+            self._prune()
+            counts = {status: 0 for status in (PENDING, RUNNING) + FINISHED}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return {'submitted': self.submitted, 'reused': self.reused, **counts}
+
+    def shutdown(self):
+        """Cancela as tarefas na fila e espera as que estão rodando."""
+        with self._lock:
+            for job in self._jobs.values():
+                job._cancel.set()
+        self._pool.shutdown(cancel_futures=True)
+
+
+# Executor compartilhado pelas páginas do app
+JOBS = JobRunner()
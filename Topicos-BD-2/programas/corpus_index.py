@@ -0,0 +1,94 @@
+"""
+Índice de documentos do corpus concatenado por "3 - merge_txt.py".
+
+Ao lado do arquivo concatenado fica um índice JSONL (<arquivo>.index.jsonl) com uma
+linha por documento: nome, deslocamento em bytes, tamanho em bytes e sha256 do
+conteúdo. MergedCorpus mapeia o arquivo em memória (mmap) e devolve qualquer
+documento por fatiamento direto, sem reler o corpus inteiro.
+
+Exemplo:
+    from corpus_index import MergedCorpus
+    with MergedCorpus("arquivo_saida.txt") as corpus:
+        texto = corpus["30296-985-24742-1-10-20240923-pt.txt"]
+"""
+import hashlib
+import json
+import mmap
+import os
+
+INDEX_SUFFIX = ".index.jsonl"
+
+
+def index_path_for(merged_path):
+    """Caminho do índice de um arquivo concatenado."""
+    return str(merged_path) + INDEX_SUFFIX
+
+
+def write_index(index_path, entries):
+    """
+    Grava o índice (uma linha JSON por documento).
+
+    Args:
+        entries (list): Dicionários com 'name', 'offset', 'length' e 'sha256'.
+    """
+    with open(index_path, "w", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def read_index(index_path):
+    """Lê o índice. Returns: lista de dicionários na ordem do arquivo concatenado."""
+    with open(index_path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class MergedCorpus:
+    """Acesso aleatório aos documentos de um arquivo concatenado via mmap."""
+
+    def __init__(self, merged_path, index_path=None):
+        self.merged_path = str(merged_path)
+        self.entries = read_index(index_path or index_path_for(merged_path))
+        self._by_name = {entry['name']: entry for entry in self.entries}
+        self._file = open(self.merged_path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        # mmap não aceita arquivos vazios
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        for entry in self.entries:
+            if entry['offset'] + entry['length'] > size:
+                self.close()
+                raise ValueError(f"Índice não corresponde a {self.merged_path}: {entry['name']} fora do arquivo")
+
+    def names(self):
+        return list(self._by_name)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def __iter__(self):
+        return iter(self._by_name)
+
+    def get_bytes(self, name):
+        """Bytes do documento (cópia da fatia do mmap)."""
+        entry = self._by_name[name]
+        return self._map[entry['offset']:entry['offset'] + entry['length']]
+
+    def __getitem__(self, name):
+        return self.get_bytes(name).decode("utf-8")
+
+    def verify(self, name):
+        """Confere o sha256 do documento com o gravado no índice."""
+        return hashlib.sha256(self.get_bytes(name)).hexdigest() == self._by_name[name]['sha256']
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,128 @@
+"""
+Cache de documentos spaCy já processados, compartilhado por todas as páginas do app.
+
+O mesmo texto costuma ser analisado em várias páginas (Tokenização, Classes Gramaticais,
+Dependências, Detecção de Frases, NER) e a cada rerun do Streamlit. DocCache guarda cada
+Doc serializado com DocBin (tokens, POS, lemas, morfologia, dependências, frases e
+entidades), com a chave (sha256 do texto, modelo, componentes ativos), e descarta os
+menos usados quando passa de max_bytes.
+
+Se houver um serviço de inferência registrado em services para o modelo (ver
+inference_service), as faltas são processadas por ele, em micro-lotes com os pedidos das
+outras sessões, em vez de chamar nlp na thread da sessão.
+
+Exemplo:
+    from doc_cache import DOCS
+    doc = DOCS.parse(nlp, texto)
+    DOCS.stats()
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Limite padrão do cache (soma dos DocBin serializados)
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+
+
+def model_name(nlp):
+    """Nome do pacote do modelo (ex: pt_core_news_sm)."""
+    return f"{nlp.meta.get('lang', nlp.lang)}_{nlp.meta.get('name', '')}"
+
+
+def pipeline_id(nlp):
+    """
+    Identificação do pipeline: idioma, nome e versão do modelo, componentes ativos e tabela
+    de vetores (a reduzida de vector_tables muda os vetores e as anotações do tok2vec).
+    """
+    return (f"{model_name(nlp)}-{nlp.meta.get('version', '')}", tuple(nlp.pipe_names),
+            getattr(nlp.vocab.vectors, "name", None))
+
+
+class DocCache:
+    """
+    Docs serializados (DocBin) em ordem de uso, até max_bytes.
+
+    Args:
+        max_bytes (int): Tamanho máximo somado das entradas; as menos usadas saem primeiro.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # nome do modelo -> InferenceService que processa as faltas
+        self.services = {}
+
+    def parse(self, nlp, text):
+        """
+        nlp(text), reaproveitando o resultado de uma chamada anterior com o mesmo texto e
+        o mesmo pipeline.
+
+        Args:
+            nlp: Pipeline spaCy (a chave usa o modelo e os componentes ativos).
+            text (str): Texto a processar.
+
+        Returns:
+            Doc: Documento processado (um objeto novo a cada chamada).
+        """
+        from spacy.tokens import DocBin
+
+        key = (hashlib.sha256(text.encode("utf-8")).hexdigest(),) + pipeline_id(nlp)
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if data is not None:
+            return next(DocBin().from_bytes(data).get_docs(nlp.vocab))
+
+        # O serviço roda o pipeline completo: só atende quem não desativou componentes
+        service = self.services.get(model_name(nlp)) if not nlp.disabled else None
+        if service is not None:
+            data = service.submit(text).result()
+            doc = service.to_doc(data, nlp.vocab)
+        else:
+            doc = nlp(text)
+            data = DocBin(docs=[doc]).to_bytes()
+        self._store(key, data)
+        return doc
+
+    def _store(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        """Acertos, faltas, descartes, entradas e bytes ocupados."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._size,
+            }
+
+
+# Cache compartilhado pelo processo
+DOCS = DocCache()
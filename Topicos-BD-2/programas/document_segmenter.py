@@ -0,0 +1,189 @@
+"""
+Segmentação de artigos em seções tipadas, em uma única passada pelas linhas do texto.
+
+segment_document devolve os trechos (Span) de título, autores, abstract, resumo,
+palavras-chave, corpo e referências, com deslocamentos em caracteres no texto original.
+Quem precisa de uma seção lê só o seu trecho, sem procurar os títulos de novo.
+
+Um título de seção é uma linha que começa pelo rótulo (em maiúsculas ou com inicial
+maiúscula, opcionalmente numerado, ex: "1 INTRODUÇÃO", "Abstract.", "Keywords:") e
+termina nele ou continua depois de um separador (":", ".", "-", "—"). O número da seção
+pode vir sozinho na linha anterior, como o PyMuPDF costuma extrair.
+
+Exemplo:
+    from document_segmenter import segment_document
+    segments = segment_document(texto)
+    resumo = segments.content('abstract')
+"""
+import re
+from collections import namedtuple
+
+# kind: tipo da seção; start/end: trecho inteiro (com o rótulo);
+# content_start: início do conteúdo, depois do rótulo
+Span = namedtuple('Span', 'kind start end content_start')
+
+KINDS = ('title', 'authors', 'abstract', 'resumo', 'keywords', 'body', 'references')
+
+# Rótulo -> tipo da seção
+SECTION_LABELS = {
+    'abstract': 'abstract',
+    'summary': 'abstract',
+    'resumo': 'resumo',
+    'keywords': 'keywords',
+    'key words': 'keywords',
+    'palavras-chave': 'keywords',
+    'index terms': 'keywords',
+    'introdução': 'body',
+    'introduction': 'body',
+    'referências': 'references',
+    'referências bibliográficas': 'references',
+    'references': 'references',
+    'bibliography': 'references',
+    'bibliografia': 'references',
+}
+
+
+def _label_alternatives():
+    forms = set()
+    for label in SECTION_LABELS:
+        forms.update({label.upper(), label.capitalize(), label.title()})
+    # Os rótulos mais longos primeiro ("Referências Bibliográficas" antes de "Referências")
+    return "|".join(re.escape(form) for form in sorted(forms, key=len, reverse=True))
+
+
+HEADING_RE = re.compile(
+    r"(?:(?:\d+|[IVX]+)\.?\s+)?(?P<label>" + _label_alternatives() + r")"
+    r"(?:\s*$|\s*[:.\-—–]\s*(?P<rest>.*)$)")
+SECTION_NUMBER_RE = re.compile(r"(?:\d+|[IVX]+)\.?")
+
+# Seções aceitas em cada fase do documento
+FRONT_KINDS = ('abstract', 'resumo', 'keywords', 'body', 'references')
+BODY_KINDS = ('references',)
+# Seções do início que terminam em uma linha em branco
+PARAGRAPH_KINDS = ('abstract', 'resumo', 'keywords')
+# Sem nenhum título de seção, os autores vão até esta quantidade de linhas após o título
+AUTHORS_MAX_LINES = 30
+
+
+class DocumentSegments:
+    """Texto do artigo e seus trechos, em ordem de início."""
+
+    def __init__(self, text, spans):
+        self.text = text
+        self.spans = spans
+
+    def get(self, kind):
+        """Primeiro trecho do tipo kind (None se não houver)."""
+        return next((span for span in self.spans if span.kind == kind), None)
+
+    def content(self, kind):
+        """Conteúdo (sem o rótulo e sem espaços nas pontas) do primeiro trecho de kind, ou None."""
+        span = self.get(kind)
+        if span is None:
+            return None
+        return self.text[span.content_start:span.end].strip() or None
+
+    def __iter__(self):
+        return iter(self.spans)
+
+
+def _iter_lines(text):
+    """Gera (início, fim sem a quebra de linha, início da próxima linha)."""
+    start = 0
+    length = len(text)
+    while start < length:
+        newline = text.find("\n", start)
+        if newline == -1:
+            yield start, length, length
+            return
+        yield start, newline, newline + 1
+        start = newline + 1
+
+
+def segment_document(text):
+    """
+    Divide o texto de um artigo em seções, percorrendo cada linha uma única vez.
+
+    Args:
+        text (str): Texto extraído do PDF.
+
+    Returns:
+        DocumentSegments: Trechos encontrados (cada tipo aparece no máximo uma vez).
+    """
+    spans = []
+    current = None  # (kind, start, content_start) da seção aberta
+    phase = 'title'
+    seen = set()
+    pending_number = None  # início de uma linha só com o número da seção
+    has_content = False
+    authors_lines = 0
+
+    def close(end):
+        nonlocal current
+        if current is not None:
+            kind, start, content_start = current
+            spans.append(Span(kind, start, max(end, content_start), content_start))
+            seen.add(kind)
+            current = None
+
+    for line_start, line_end, next_start in _iter_lines(text):
+        line = text[line_start:line_end]
+        stripped = line.strip()
+
+        if not stripped:
+            pending_number = None
+            if current is not None and current[0] in PARAGRAPH_KINDS and has_content:
+                close(line_start)
+            continue
+
+        if phase == 'title':
+            if len(stripped.split()) >= 3:
+                offset = line_start + len(line) - len(line.lstrip())
+                spans.append(Span('title', offset, offset + len(stripped), offset))
+                seen.add('title')
+                current = ('authors', next_start, next_start)
+                phase = 'front'
+            continue
+
+        if SECTION_NUMBER_RE.fullmatch(stripped):
+            pending_number = line_start
+            continue
+
+        match = HEADING_RE.match(stripped)
+        kind = SECTION_LABELS.get(match.group('label').lower()) if match else None
+        allowed = FRONT_KINDS if phase == 'front' else BODY_KINDS if phase == 'body' else ()
+        if kind in allowed and kind not in seen:
+            heading_start = pending_number if pending_number is not None else line_start
+            close(heading_start)
+            if match.group('rest'):
+                content_start = line_start + len(line) - len(line.lstrip()) + match.start('rest')
+            else:
+                content_start = next_start
+            current = (kind, heading_start, content_start)
+            has_content = bool(match.group('rest'))
+            if kind == 'body':
+                phase = 'body'
+            elif kind == 'references':
+                phase = 'references'
+            pending_number = None
+            continue
+
+        pending_number = None
+        has_content = True
+        if current is not None and current[0] == 'authors':
+            authors_lines += 1
+            if authors_lines >= AUTHORS_MAX_LINES:
+                close(next_start)
+
+    close(len(text))
+
+    # Sem título de introdução, o corpo começa depois da última seção do início
+    if 'body' not in seen and phase != 'title':
+        front_end = max((span.end for span in spans if span.kind != 'references'), default=0)
+        references = next((span for span in spans if span.kind == 'references'), None)
+        body_end = references.start if references is not None else len(text)
+        if body_end > front_end:
+            spans.append(Span('body', front_end, body_end, front_end))
+
+    spans.sort(key=lambda span: span.start)
+    return DocumentSegments(text, spans)
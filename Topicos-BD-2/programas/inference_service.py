@@ -0,0 +1,167 @@
+"""
+Serviço de inferência spaCy em processos, compartilhado pelas sessões do Streamlit.
+
+Cada sessão do Streamlit roda em uma thread e, sem o serviço, todas chamam o mesmo nlp um
+texto por vez, serializadas pelo GIL. InferenceService recebe os pedidos de todas as
+sessões em uma fila e uma thread despachante os junta em micro-lotes: espera um processo
+livre (enquanto isso os pedidos se acumulam) e completa o lote por no máximo max_latency
+segundos ou até max_batch textos. Cada lote vai para um processo do pool, que o processa
+com nlp.pipe e devolve um DocBin serializado por texto.
+
+Exemplo:
+    from inference_service import get_service
+    service = get_service("pt_core_news_sm", workers=2)
+    future = service.submit(texto)
+    doc = service.to_doc(future.result(), nlp.vocab)
+"""
+import concurrent.futures
+import multiprocessing
+import queue
+import threading
+import time
+
+from spacy_models import MODELS
+
+DEFAULT_MAX_BATCH = 32
+DEFAULT_MAX_LATENCY = 0.010  # segundos
+
+# Pipeline do processo do pool (carregado pelo inicializador)
+_worker_nlp = None
+
+
+def _init_worker(model_name, exclude, vector_table):
+    global _worker_nlp
+    if vector_table is not None:
+        MODELS.vector_tables[model_name] = vector_table
+    _worker_nlp = MODELS.get(model_name, exclude=exclude)
+
+
+def _process_batch(texts):
+    from spacy.tokens import DocBin
+
+    return [DocBin(docs=[doc]).to_bytes() for doc in _worker_nlp.pipe(texts, batch_size=len(texts))]
+
+
+class InferenceService:
+    """
+    Pool de processos com o modelo model_name, alimentado em micro-lotes.
+
+    Args:
+        model_name (str): Modelo spaCy carregado em cada processo (via spacy_models).
+        exclude (tuple): Componentes excluídos do pipeline.
+        workers (int): Processos do pool.
+        max_batch (int): Textos por micro-lote.
+        max_latency (float): Espera máxima (s) para completar um micro-lote.
+    """
+
+    def __init__(self, model_name, exclude=(), workers=1, max_batch=DEFAULT_MAX_BATCH,
+                 max_latency=DEFAULT_MAX_LATENCY):
+        self.model_name = model_name
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self.requests = 0
+        self.batches = 0
+        # spawn: o servidor do Streamlit tem várias threads, e fork copiaria locks em uso
+        self._pool = concurrent.futures.ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_name, tuple(exclude), MODELS.vector_tables.get(model_name)))
+        self._slots = threading.Semaphore(workers)
+        self._queue = queue.Queue()
+        self._dispatcher = threading.Thread(target=self._dispatch, name=f"inference-{model_name}", daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, text):
+        """
+        Enfileira um texto.
+
+        Returns:
+            concurrent.futures.Future: Resolve nos bytes de um DocBin com o Doc do texto.
+        """
+        future = concurrent.futures.Future()
+        self._queue.put((text, future))
+        return future
+
+    @staticmethod
+    def to_doc(data, vocab):
+        """Doc de um resultado de submit, com o vocabulário de quem o pediu."""
+        from spacy.tokens import DocBin
+
+        return next(DocBin().from_bytes(data).get_docs(vocab))
+
+    def _dispatch(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            deadline = time.monotonic() + self.max_latency
+            # Enquanto todos os processos estão ocupados, os pedidos se acumulam na fila
+            self._slots.acquire()
+            batch = [item]
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+            self._send(batch)
+
+    def _send(self, batch):
+        # Pedidos cancelados antes do envio ficam fora do lote
+        batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            self._slots.release()
+            return
+        self.requests += len(batch)
+        self.batches += 1
+        futures = [future for _, future in batch]
+        try:
+            result = self._pool.submit(_process_batch, [text for text, _ in batch])
+        except Exception as e:
+            self._slots.release()
+            for future in futures:
+                future.set_exception(e)
+            return
+        result.add_done_callback(lambda done: self._deliver(done, futures))
+
+    def _deliver(self, done, futures):
+        self._slots.release()
+        try:
+            results = done.result()
+        except BaseException as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+        for future, data in zip(futures, results):
+            future.set_result(data)
+
+    def stats(self):
+        """Pedidos atendidos, micro-lotes enviados e tamanho médio dos lotes."""
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'mean_batch': self.requests / self.batches if self.batches else 0.0,
+            'queued': self._queue.qsize(),
+        }
+
+    def close(self):
+        """Encerra o despachante e o pool (pedidos já enfileirados são atendidos antes)."""
+        self._queue.put(None)
+        self._dispatcher.join()
+        self._pool.shutdown()
+
+
+_services = {}
+_lock = threading.Lock()
+
+
+def get_service(model_name, workers=1, **options):
+    """Serviço compartilhado pelo processo para model_name, criado na primeira chamada."""
+    with _lock:
+        service = _services.get(model_name)
+        if service is None:
+            service = _services[model_name] = InferenceService(model_name, workers=workers, **options)
+        return service
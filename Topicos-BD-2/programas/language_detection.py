@@ -0,0 +1,61 @@
+"""
+Detecção de idioma por trecho com o lingua, para escolher o modelo spaCy de cada parte
+do artigo (os artigos costumam ter abstract em inglês e corpo em português).
+
+O detector é construído uma única vez por processo, só para os idiomas com modelo spaCy,
+e os trechos são classificados em lote com detect_languages_in_parallel_of (lingua 2),
+que distribui o trabalho entre os núcleos.
+
+Exemplo:
+    from language_detection import detect_languages
+    idiomas = detect_languages(["Este trabalho apresenta...", "This paper presents..."])
+    # ['Português', 'Inglês']
+"""
+import threading
+
+# Nome do idioma no lingua (Language.<nome>) -> rótulo usado nos artigos
+LINGUA_LANGUAGES = {'PORTUGUESE': 'Português', 'ENGLISH': 'Inglês'}
+# Trechos mais curtos não são classificados (nomes, números de página, e-mails)
+MIN_DETECTION_CHARS = 20
+
+_detector = None
+_lock = threading.Lock()
+
+
+def get_detector():
+    """Detector do lingua para os idiomas de LINGUA_LANGUAGES, construído no primeiro uso."""
+    global _detector
+    if _detector is None:
+        with _lock:
+            if _detector is None:
+                from lingua import Language, LanguageDetectorBuilder
+
+                languages = [getattr(Language, name) for name in LINGUA_LANGUAGES]
+                _detector = LanguageDetectorBuilder.from_languages(*languages).build()
+    return _detector
+
+
+def detect_languages(texts, min_chars=MIN_DETECTION_CHARS):
+    """
+    Detecta o idioma de vários textos em uma única chamada em lote.
+
+    Args:
+        texts (list): Textos a classificar.
+        min_chars (int): Textos com menos caracteres (sem espaços nas pontas) ficam sem idioma.
+
+    Returns:
+        list: Rótulo ('Português', 'Inglês') de cada texto, na ordem de entrada, ou None
+        quando o idioma não pôde ser determinado.
+
+    Raises:
+        ImportError: Se o lingua não estiver instalado.
+    """
+    positions = [index for index, text in enumerate(texts) if len(text.strip()) >= min_chars]
+    languages = [None] * len(texts)
+    if not positions:
+        return languages
+    detected = get_detector().detect_languages_in_parallel_of([texts[index] for index in positions])
+    for index, language in zip(positions, detected):
+        if language is not None:
+            languages[index] = LINGUA_LANGUAGES.get(language.name)
+    return languages
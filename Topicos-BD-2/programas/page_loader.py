@@ -0,0 +1,97 @@
+"""
+Execução das páginas do app.py a partir de código compilado em cache.
+
+O Streamlit executa o app.py de novo a cada interação. Em vez de ler e compilar o
+arquivo da página toda vez, compile_page guarda o code object por caminho e só recompila
+quando o arquivo muda (mtime ou tamanho diferentes). run_page executa a página em um
+namespace próprio, sem misturar nomes com o app.py ou com outras páginas.
+
+A duração da primeira execução de cada página no processo (que inclui esperar pelos
+modelos que ela usa) é registrada e impressa no console do servidor.
+
+Exemplo:
+    from page_loader import run_page
+    run_page(PROGRAMS_PATH / "Tokenizacao.py", host_file=__file__)
+"""
+import builtins
+import os
+import threading
+import time
+
+# caminho -> (mtime_ns, tamanho, code object); mantido enquanto o processo do servidor viver
+_CODE_CACHE = {}
+_lock = threading.Lock()
+
+# Importado na primeira execução do app.py: marca o início do servidor
+STARTED_AT = time.perf_counter()
+# rótulo -> duração (s) da primeira execução no processo
+_FIRST_RUNS = {}
+
+
+def compile_page(page_path):
+    """
+    Code object da página, compilado só na primeira chamada ou depois de uma alteração.
+
+    Raises:
+        OSError: Se o arquivo não puder ser lido.
+        SyntaxError: Se a página tiver erro de sintaxe.
+    """
+    path = os.fspath(page_path)
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _CODE_CACHE.get(path)
+    if cached is not None and cached[:2] == key:
+        return cached[2]
+    with open(path, "r", encoding="utf-8") as f:
+        source = f.read()
+    code = compile(source, path, "exec")
+    with _lock:
+        _CODE_CACHE[path] = key + (code,)
+    return code
+
+
+def run_page(page_path, host_file=None):
+    """
+    Executa a página em um namespace novo, como se fosse o script principal.
+
+    Args:
+        page_path: Arquivo .py da página.
+        host_file (str): Valor de __file__ na página. As páginas calculam PROJECT_ROOT
+            como Path(__file__).parent e esperam o caminho do app.py que as executa
+            (None usa o caminho da própria página).
+
+    Returns:
+        dict: Namespace da página depois da execução.
+    """
+    namespace = {
+        "__name__": "__main__",
+        "__file__": host_file if host_file is not None else os.fspath(page_path),
+        "__builtins__": builtins,
+    }
+    start = time.perf_counter()
+    try:
+        exec(compile_page(page_path), namespace)
+    finally:
+        record_first_run(os.path.basename(os.fspath(page_path)), start)
+    return namespace
+
+
+def record_first_run(label, start):
+    """Registra e imprime a duração da primeira execução de label (desde start) no processo."""
+    with _lock:
+        if label in _FIRST_RUNS:
+            return
+        now = time.perf_counter()
+        _FIRST_RUNS[label] = now - start
+    print(f"Primeira execução de {label}: {now - start:.2f}s ({now - STARTED_AT:.2f}s após o início do servidor)")
+
+
+def first_runs():
+    """Duração (s) da primeira execução de cada página já executada."""
+    return dict(_FIRST_RUNS)
+
+
+def clear_cache():
+    """Descarta os code objects em cache (a próxima execução recompila cada página)."""
+    with _lock:
+        _CODE_CACHE.clear()
@@ -0,0 +1,133 @@
+"""
+Extração de texto de PDFs compartilhada pelos scripts e páginas de programas/.
+
+Três backends intercambiáveis: 'pymupdf' (fitz), 'pypdf2' e 'pdfplumber'. A origem
+pode ser um caminho, os bytes do PDF ou um arquivo aberto/em memória (ex: o
+UploadedFile do st.file_uploader), lido diretamente, sem arquivo temporário.
+As páginas são unidas com um único join, em tempo linear.
+
+Exemplo:
+    from pdf_extraction import extract_text
+    texto = extract_text(uploaded_file)
+"""
+import io
+import os
+
+# Backends em ordem de preferência: o mais rápido primeiro
+# (ver benchmarks/benchmark_pdf_extraction.py)
+BACKEND_PREFERENCE = ('pymupdf', 'pypdf2', 'pdfplumber')
+
+
+def _pdf_bytes(source):
+    """Bytes de um PDF em memória (bytes, BytesIO, UploadedFile ou arquivo aberto)."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if hasattr(source, 'getvalue'):
+        return source.getvalue()
+    source.seek(0)
+    return source.read()
+
+
+def _is_path(source):
+    return isinstance(source, (str, os.PathLike))
+
+
+def _pages_pymupdf(source):
+    import fitz  # PyMuPDF
+
+    document = fitz.open(source) if _is_path(source) else fitz.open(stream=_pdf_bytes(source), filetype="pdf")
+    try:
+        for page_num in range(document.page_count):
+            # Texto puro, ignorando colunas visuais para uma saída de coluna única
+            yield page_num, document.page_count, document.load_page(page_num).get_text("text")
+    finally:
+        document.close()
+
+
+def _pages_pypdf2(source):
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(source if _is_path(source) else io.BytesIO(_pdf_bytes(source)))
+    page_count = len(reader.pages)
+    for page_num, page in enumerate(reader.pages):
+        yield page_num, page_count, page.extract_text() or ""
+
+
+def _pages_pdfplumber(source):
+    import pdfplumber
+
+    with pdfplumber.open(source if _is_path(source) else io.BytesIO(_pdf_bytes(source))) as pdf:
+        page_count = len(pdf.pages)
+        for page_num, page in enumerate(pdf.pages):
+            yield page_num, page_count, page.extract_text() or ""
+            # Libera o cache de objetos da página já lida
+            page.close()
+
+
+# nome -> (módulo importado pelo backend, função geradora de páginas)
+BACKENDS = {
+    'pymupdf': ('fitz', _pages_pymupdf),
+    'pypdf2': ('PyPDF2', _pages_pypdf2),
+    'pdfplumber': ('pdfplumber', _pages_pdfplumber),
+}
+
+
+def register_backend(name, module_name, pages_function):
+    """
+    Registra um novo backend.
+
+    Args:
+        module_name (str): Módulo de que o backend depende (usado para saber se está disponível).
+        pages_function (callable): Função origem -> gerador de (página, total de páginas, texto).
+    """
+    BACKENDS[name] = (module_name, pages_function)
+
+
+def available_backends():
+    """Backends registrados cujas bibliotecas estão instaladas."""
+    import importlib.util
+
+    return [name for name, (module_name, _) in BACKENDS.items() if importlib.util.find_spec(module_name)]
+
+
+def default_backend():
+    """O backend mais rápido entre os instalados (ordem de BACKEND_PREFERENCE)."""
+    available = available_backends()
+    for name in BACKEND_PREFERENCE:
+        if name in available:
+            return name
+    if available:
+        return available[0]
+    raise ImportError("Nenhuma biblioteca de PDF instalada (PyMuPDF, PyPDF2 ou pdfplumber)")
+
+
+def iter_pages(source, backend=None):
+    """
+    Extrai o texto página a página; só a página atual fica em memória.
+
+    Args:
+        source: Caminho, bytes ou arquivo (aberto ou em memória) com o PDF.
+        backend (str): Nome em BACKENDS; None usa default_backend().
+
+    Yields:
+        tuple: (número da página a partir de 0, total de páginas, texto da página)
+    """
+    name = backend or default_backend()
+    if name not in BACKENDS:
+        raise ValueError(f"Backend de PDF desconhecido: {name} (disponíveis: {', '.join(BACKENDS)})")
+    return BACKENDS[name][1](source)
+
+
+def extract_text(source, backend=None, separator="\n"):
+    """
+    Extrai o texto de todas as páginas não vazias, unidas por separator.
+
+    Args:
+        source: Caminho, bytes ou arquivo (aberto ou em memória) com o PDF.
+        backend (str): Nome em BACKENDS; None usa default_backend().
+        separator (str): Texto inserido entre as páginas.
+
+    Returns:
+        str: Texto extraído.
+    """
+    return separator.join(page_text for _, _, page_text in iter_pages(source, backend) if page_text)
@@ -0,0 +1,233 @@
+import json
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+import requests
+
+from sbc_download import DownloadManifest, HostRateLimiter, create_session, fetch_page, fetch_with_retry
+
+# Padrões de caminho das páginas de um OJS (ex: https://sol.sbc.org.br/index.php/webmedia/...)
+ARCHIVE_PATH_RE = re.compile(r'/issue/archive(?:/\d+)?/?$')
+ISSUE_PATH_RE = re.compile(r'/issue/view/\d+/?$')
+# Página de visualização de uma galeria PDF: /article/view/<artigo>/<galeria>
+GALLEY_VIEW_PATH_RE = re.compile(r'/article/view/\d+/\d+/?$')
+DOWNLOAD_PATH_RE = re.compile(r'/article/download/\d+/\d+(?:/\d+)?/?$')
+
+
+def classify_url(url):
+    """Retorna 'archive', 'issue', 'view', 'download' ou None conforme o tipo de página OJS."""
+    path = urlparse(url).path
+    if ARCHIVE_PATH_RE.search(path):
+        return 'archive'
+    if ISSUE_PATH_RE.search(path):
+        return 'issue'
+    if GALLEY_VIEW_PATH_RE.search(path):
+        return 'view'
+    if DOWNLOAD_PATH_RE.search(path):
+        return 'download'
+    return None
+
+
+def extract_links(page_url, content):
+    """
+    Extrai os links OJS relevantes de uma página, já classificados.
+
+    Apenas links do mesmo domínio são considerados.
+
+    Returns:
+        list: Pares (url_absoluta, tipo).
+    """
+    soup = BeautifulSoup(content, 'html.parser')
+    netloc = urlparse(page_url).netloc
+    links = []
+    for link in soup.find_all('a', href=True):
+        absolute_url = urljoin(page_url, link['href']).split('#', 1)[0]
+        if urlparse(absolute_url).netloc != netloc:
+            continue
+        kind = classify_url(absolute_url)
+        if kind:
+            links.append((absolute_url, kind))
+    return links
+
+
+class SBCCrawler:
+    """
+    Rastreador de anais OJS com fronteira sem duplicatas.
+
+    Começa em uma página de arquivo (/issue/archive) ou em várias edições
+    (/issue/view/<id>), segue a paginação do arquivo, abre as edições e resolve
+    as páginas de visualização das galerias PDF em paralelo. Cada link de
+    download direto é gravado no JSONL assim que é encontrado.
+
+    Args:
+        output_jsonl (str): Arquivo de saída, uma linha JSON por PDF
+            ({"url", "view_url", "issue_url"}). Se já existir, as URLs presentes
+            são ignoradas e as novas são acrescentadas no final.
+        max_workers (int): Número de páginas buscadas em paralelo.
+        requests_per_second (float): Limite de requisições por segundo por host.
+        cache_folder (str): Se informado, as páginas passam pelo cache de respostas
+            de sbc_download guardado nesta pasta.
+    """
+
+    def __init__(self, output_jsonl, max_workers=8, requests_per_second=4.0, retries=3, cache_folder=None):
+        self.output_jsonl = output_jsonl
+        self.max_workers = max_workers
+        self.retries = retries
+        self.cache_folder = cache_folder
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+        self.manifest = DownloadManifest(os.path.join(cache_folder, "manifest.json")) if cache_folder else None
+        self.seen = set()
+        self.found = set()
+        self.stats = {'archive': 0, 'issue': 0, 'view': 0, 'errors': 0, 'new_pdfs': 0}
+        if os.path.exists(output_jsonl):
+            with open(output_jsonl, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        self.found.add(json.loads(line)['url'])
+
+    def _fetch(self, session, url):
+        if self.manifest is not None:
+            return fetch_page(session, url, self.manifest, self.cache_folder, self.rate_limiter, self.retries)
+        with fetch_with_retry(session, url, self.rate_limiter, retries=self.retries, timeout=15) as response:
+            return response.content
+
+    def crawl(self, start_urls):
+        """
+        Percorre a fronteira a partir de start_urls até esgotá-la.
+
+        Returns:
+            dict: Contagem de páginas por tipo, erros, PDFs novos e tempo total.
+        """
+        start = time.perf_counter()
+        frontier = deque()
+        for url in start_urls:
+            kind = classify_url(url)
+            if kind not in ('archive', 'issue'):
+                kind = 'issue'
+            if url not in self.seen:
+                self.seen.add(url)
+                frontier.append((url, kind, None))
+
+        session = create_session(pool_size=self.max_workers)
+        pending = {}
+        with open(self.output_jsonl, 'a', encoding='utf-8') as out, \
+                ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while frontier or pending:
+                # Mantém o pool cheio; páginas de arquivo e edição têm prioridade
+                # sobre as de visualização por estarem no início da fila
+                while frontier and len(pending) < self.max_workers * 2:
+                    url, kind, parent = frontier.popleft()
+                    pending[executor.submit(self._fetch, session, url)] = (url, kind, parent)
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, kind, parent = pending.pop(future)
+                    try:
+                        content = future.result()
+                    except requests.exceptions.RequestException as e:
+                        self.stats['errors'] += 1
+                        print(f"  Erro ao acessar {url}: {e}")
+                        continue
+                    self.stats[kind] += 1
+                    self._handle_page(url, kind, parent, content, frontier, out)
+        session.close()
+        if self.manifest is not None:
+            self.manifest.compact()
+        self.stats['seconds'] = time.perf_counter() - start
+        return self.stats
+
+    def _handle_page(self, url, kind, parent, content, frontier, out):
+        links = extract_links(url, content)
+        if kind == 'view':
+            downloads = [link for link, link_kind in links if link_kind == 'download']
+            if not downloads:
+                # Sem botão de download na página: usa o padrão view -> download do OJS
+                downloads = [urljoin(url, urlparse(url).path.replace('/view/', '/download/'))]
+            for download_url in downloads:
+                self._emit(download_url, url, parent, out)
+            return
+
+        print(f"Página {kind}: {url}")
+        for link, link_kind in links:
+            if link in self.seen:
+                continue
+            if link_kind == 'download':
+                self.seen.add(link)
+                self._emit(link, None, url, out)
+            elif link_kind == 'view' and kind == 'issue':
+                self.seen.add(link)
+                frontier.append((link, 'view', url))
+            elif link_kind in ('archive', 'issue') and kind == 'archive':
+                self.seen.add(link)
+                frontier.appendleft((link, link_kind, url))
+
+    def _emit(self, download_url, view_url, issue_url, out):
+        if download_url in self.found:
+            return
+        self.found.add(download_url)
+        self.stats['new_pdfs'] += 1
+        out.write(json.dumps({'url': download_url, 'view_url': view_url, 'issue_url': issue_url},
+                             ensure_ascii=False) + '\n')
+        out.flush()
+
+
+def resolve_view_pages(view_urls, max_workers=8, requests_per_second=4.0, session=None, fetch=None):
+    """
+    Resolve, em paralelo, páginas /article/view/ para os seus links de download direto.
+
+    Args:
+        fetch (callable): Função url -> conteúdo usada no lugar do GET padrão
+            (ex: para passar pelo cache de respostas). Deve ser segura entre threads.
+
+    Returns:
+        dict: {url_de_visualizacao: [urls_de_download]}; páginas com erro ficam com lista vazia.
+    """
+    own_session = session is None and fetch is None
+    if own_session:
+        session = create_session(pool_size=max_workers)
+    rate_limiter = HostRateLimiter(requests_per_second)
+
+    def default_fetch(view_url):
+        with fetch_with_retry(session, view_url, rate_limiter, timeout=10) as response:
+            return response.content
+
+    def resolve(view_url):
+        try:
+            content = (fetch or default_fetch)(view_url)
+        except requests.exceptions.RequestException as e:
+            print(f"  Erro ao explorar {view_url}: {e}")
+            return []
+        return [link for link, kind in extract_links(view_url, content) if kind == 'download']
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(view_urls, executor.map(resolve, view_urls)))
+    finally:
+        if own_session:
+            session.close()
+
+
+def read_download_links(jsonl_path):
+    """Lê as URLs de download gravadas por SBCCrawler, na ordem em que foram encontradas."""
+    with open(jsonl_path, 'r', encoding='utf-8') as f:
+        return [json.loads(line)['url'] for line in f if line.strip()]
+
+
+# --- Bloco de execução principal ---
+if __name__ == "__main__":
+    # Página de arquivo com todas as edições do WebMedia (ou uma lista de edições específicas)
+    START_URLS = ["https://sol.sbc.org.br/index.php/webmedia/issue/archive"]
+    OUTPUT_JSONL = "links_pdfs.jsonl"
+
+    print("Iniciando o rastreamento dos anais.")
+    print("-" * 50)
+    crawler = SBCCrawler(OUTPUT_JSONL, max_workers=8, cache_folder=".cache_html")
+    stats = crawler.crawl(START_URLS)
+    print("-" * 50)
+    print(f"Páginas: {stats['archive']} de arquivo, {stats['issue']} edições, {stats['view']} de visualização "
+          f"| Erros: {stats['errors']} | {stats['new_pdfs']} PDFs novos em {stats['seconds']:.1f}s")
+    print(f"Links gravados em: {os.path.abspath(OUTPUT_JSONL)}")
@@ -0,0 +1,421 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Códigos HTTP que indicam falha temporária do servidor e merecem nova tentativa
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def create_session(pool_size=8, headers=None):
+    """
+    Cria uma sessão HTTP compartilhada com conexões keep-alive.
+
+    Args:
+        pool_size (int): Número máximo de conexões mantidas abertas por host.
+            Deve ser pelo menos o número de workers que usarão a sessão.
+        headers (dict): Cabeçalhos enviados em todas as requisições.
+    """
+    session = requests.Session()
+    session.headers.update(headers or HEADERS)
+    # As novas tentativas são feitas por fetch_with_retry, por isso max_retries=0
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class HostRateLimiter:
+    """
+    Limita o número de requisições por segundo para cada host.
+
+    É seguro para uso entre threads: cada chamada a wait() reserva o próximo
+    horário livre do host e dorme até ele, fora do lock.
+    """
+
+    def __init__(self, requests_per_second=4.0):
+        self.min_interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        if not self.min_interval:
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _retry_delay(response, attempt, backoff):
+    """Espera antes da próxima tentativa: Retry-After do servidor ou backoff exponencial."""
+    retry_after = response.headers.get('Retry-After', '') if response is not None else ''
+    return float(retry_after) if retry_after.isdigit() else backoff * (2 ** attempt)
+
+
+def fetch_with_retry(session, url, rate_limiter=None, retries=3, backoff=0.5, timeout=30, **kwargs):
+    """
+    Faz um GET com limite de taxa por host e novas tentativas com backoff exponencial.
+
+    Tenta novamente em erros de conexão, timeouts e nos códigos de RETRY_STATUS_CODES,
+    respeitando o cabeçalho Retry-After quando o servidor o envia. Outros erros HTTP
+    (ex: 404) são lançados imediatamente.
+
+    Returns:
+        requests.Response: A resposta bem-sucedida (status < 400).
+    """
+    attempt = 0
+    while True:
+        if rate_limiter is not None:
+            rate_limiter.wait(url)
+        try:
+            response = session.get(url, timeout=timeout, **kwargs)
+            if response.status_code not in RETRY_STATUS_CODES:
+                response.raise_for_status()
+                return response
+            if attempt >= retries:
+                response.raise_for_status()
+            delay = _retry_delay(response, attempt, backoff)
+            response.close()
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if attempt >= retries:
+                raise
+            delay = backoff * (2 ** attempt)
+        attempt += 1
+        time.sleep(delay)
+
+
+def pdf_filename_from_url(pdf_url, index=0):
+    """Gera um nome de arquivo seguro a partir do último segmento da URL de download."""
+    path_segments = urlparse(pdf_url).path.split('/')
+    filename = f"{path_segments[-1]}.pdf"
+    filename = "".join(c for c in filename if c.isalnum() or c in ('.', '_', '-')).strip()
+    if not filename or filename == '.pdf':
+        filename = f"downloaded_sbc_pdf_{index + 1}.pdf"
+    return filename
+
+
+class DownloadManifest:
+    """
+    Manifesto persistente dos recursos já baixados, gravado em JSON.
+
+    Cada URL é mapeada para {sha256, size, etag, last_modified, path}, o que permite
+    refazer a execução com requisições condicionais (If-None-Match/If-Modified-Since)
+    e sem criar cópias como nome_1.pdf. É seguro para uso entre threads.
+
+    Cada atualização acrescenta só uma linha a um diário (path + '.log', JSONL), em vez de
+    regravar o manifesto inteiro; o diário é incorporado ao manifesto (gravado de forma
+    atômica) ao abrir e em compact(). Uma execução interrompida não perde o que já foi
+    concluído: uma última linha incompleta do diário é ignorada.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.log_path = f"{path}.log"
+        self._lock = threading.Lock()
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (ValueError, IOError) as e:
+                print(f"Aviso: manifesto '{path}' ilegível, recomeçando do zero ({e}).")
+        if os.path.exists(self.log_path):
+            self._replay_log()
+            self.compact()
+
+    def _replay_log(self):
+        with open(self.log_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Linha incompleta de uma execução interrompida
+                    continue
+                self.entries[record['url']] = record['entry']
+
+    def get(self, url):
+        with self._lock:
+            entry = self.entries.get(url)
+            return dict(entry) if entry else None
+
+    def paths(self):
+        with self._lock:
+            return {url: entry['path'] for url, entry in self.entries.items()}
+
+    def update(self, url, entry):
+        with self._lock:
+            self.entries[url] = entry
+            folder = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(folder, exist_ok=True)
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'url': url, 'entry': entry}, ensure_ascii=False) + '\n')
+
+    def compact(self):
+        """Grava o manifesto completo e descarta o diário (chamar ao fim de cada execução)."""
+        with self._lock:
+            self._save()
+            if os.path.exists(self.log_path):
+                os.remove(self.log_path)
+
+    def _save(self):
+        folder = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(folder, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def _is_cached(entry, file_path):
+    return (
+        entry is not None and entry.get('path') == file_path
+        and os.path.exists(file_path) and os.path.getsize(file_path) == entry.get('size')
+    )
+
+
+def fetch_to_file(session, url, file_path, manifest=None, rate_limiter=None, retries=3, chunk_size=65536,
+                  backoff=0.5):
+    """
+    Baixa url para file_path usando o manifesto como cache de respostas.
+
+    - Se o manifesto já tem a URL e o arquivo local está íntegro, envia uma requisição
+      condicional; uma resposta 304 encerra a operação sem transferir o corpo.
+    - O corpo é gravado em file_path + '.part' e só é renomeado no final. Se um '.part'
+      sobrou de uma execução interrompida (ou a conexão cai no meio da transferência),
+      a transferência continua com um cabeçalho Range; If-Range garante que um recurso
+      alterado no servidor seja baixado do zero.
+    - As novas tentativas (com backoff, como em fetch_with_retry) são feitas só aqui, para
+      que cada uma possa continuar do '.part'; o GET interno não repete a requisição.
+
+    Returns:
+        dict: url, path, status ('unchanged', 'downloaded' ou 'resumed'), bytes
+        (transferidos nesta execução), seconds e error (None se ok).
+    """
+    start = time.perf_counter()
+    result = {'url': url, 'path': file_path, 'status': None, 'bytes': 0, 'seconds': 0.0, 'error': None}
+    entry = manifest.get(url) if manifest is not None else None
+    part_path = f"{file_path}.part"
+
+    for attempt in range(retries + 1):
+        headers = {}
+        validator = entry and (entry.get('etag') or entry.get('last_modified'))
+        if _is_cached(entry, file_path):
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        resume_from = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if resume_from:
+            headers['Range'] = f"bytes={resume_from}-"
+            if validator:
+                headers['If-Range'] = validator
+        try:
+            with fetch_with_retry(session, url, rate_limiter, retries=0, stream=True,
+                                  headers=headers) as response:
+                if response.status_code == 304:
+                    result['status'] = 'unchanged'
+                    result['error'] = None
+                    break
+                if response.status_code == 206:
+                    digest = hashlib.sha256()
+                    with open(part_path, 'rb') as f:
+                        for chunk in iter(lambda: f.read(chunk_size), b''):
+                            digest.update(chunk)
+                    mode, result['status'] = 'ab', 'resumed'
+                else:
+                    digest = hashlib.sha256()
+                    mode, result['status'] = 'wb', 'downloaded'
+                    # Guarda os validadores já no início para que um '.part' deixado
+                    # por esta transferência possa ser retomado com If-Range depois
+                    entry = {
+                        'sha256': None,
+                        'size': None,
+                        'etag': response.headers.get('ETag'),
+                        'last_modified': response.headers.get('Last-Modified'),
+                        'path': file_path,
+                    }
+                    if manifest is not None:
+                        manifest.update(url, entry)
+                with open(part_path, mode) as f:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        f.write(chunk)
+                        digest.update(chunk)
+                        result['bytes'] += len(chunk)
+                os.replace(part_path, file_path)
+                if manifest is not None:
+                    manifest.update(url, {
+                        'sha256': digest.hexdigest(),
+                        'size': os.path.getsize(file_path),
+                        'etag': response.headers.get('ETag'),
+                        'last_modified': response.headers.get('Last-Modified'),
+                        'path': file_path,
+                    })
+                result['error'] = None
+                break
+        except requests.exceptions.HTTPError as e:
+            # 416: o '.part' não corresponde mais ao recurso; descarta e baixa do zero
+            if e.response is not None and e.response.status_code == 416 and os.path.exists(part_path):
+                os.remove(part_path)
+                continue
+            result['error'] = str(e)
+            if e.response is None or e.response.status_code not in RETRY_STATUS_CODES or attempt >= retries:
+                break
+            time.sleep(_retry_delay(e.response, attempt, backoff))
+        except (requests.exceptions.ChunkedEncodingError, requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout) as e:
+            # Transferência interrompida: o '.part' é mantido e a próxima tentativa continua dele
+            result['error'] = str(e)
+            if attempt < retries:
+                time.sleep(backoff * (2 ** attempt))
+        except (requests.exceptions.RequestException, IOError) as e:
+            result['error'] = str(e)
+            break
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def download_pdf(session, pdf_url, file_path, rate_limiter=None, retries=3, manifest=None):
+    """
+    Baixa um único PDF para file_path (ver fetch_to_file).
+
+    Returns:
+        dict: url, path, status, bytes, seconds (latência total do arquivo) e error (None se ok).
+    """
+    return fetch_to_file(session, pdf_url, file_path, manifest, rate_limiter, retries)
+
+
+def fetch_page(session, url, manifest, cache_folder, rate_limiter=None, retries=3):
+    """
+    Obtém o HTML de uma página através do mesmo cache de respostas usado pelos PDFs.
+
+    O corpo fica em cache_folder, com nome derivado do hash da URL; em uma nova
+    execução, uma resposta 304 devolve a cópia local.
+
+    Returns:
+        bytes: O conteúdo da página.
+    """
+    os.makedirs(cache_folder, exist_ok=True)
+    file_path = os.path.join(cache_folder, hashlib.sha256(url.encode('utf-8')).hexdigest()[:32] + '.html')
+    result = fetch_to_file(session, url, file_path, manifest, rate_limiter, retries)
+    if result['error']:
+        raise requests.exceptions.RequestException(result['error'])
+    with open(file_path, 'rb') as f:
+        return f.read()
+
+
+def download_pdfs_concurrently(pdf_urls, download_folder, max_workers=8, requests_per_second=4.0,
+                               retries=3, session=None, manifest=None):
+    """
+    Baixa vários PDFs em paralelo usando uma sessão keep-alive compartilhada.
+
+    Os nomes dos arquivos são definidos antes do início dos downloads, na thread
+    principal, para que dois workers nunca escrevam no mesmo caminho.
+
+    Args:
+        pdf_urls (list): URLs de download direto.
+        download_folder (str): Pasta de destino.
+        max_workers (int): Número máximo de downloads simultâneos.
+        requests_per_second (float): Limite de requisições por segundo por host (0 desativa).
+        retries (int): Número de novas tentativas por arquivo.
+        session (requests.Session): Sessão a reutilizar; uma nova é criada se None.
+        manifest (DownloadManifest): Se informado, cada URL mantém o seu arquivo entre
+            execuções e arquivos inalterados não são baixados novamente.
+
+    Returns:
+        dict: results (um dict por arquivo, ver fetch_to_file), downloaded, unchanged,
+        resumed, failed, total_bytes (transferidos), elapsed, files_per_second e mb_per_second.
+    """
+    os.makedirs(download_folder, exist_ok=True)
+    own_session = session is None
+    if own_session:
+        session = create_session(pool_size=max_workers)
+    rate_limiter = HostRateLimiter(requests_per_second)
+
+    # Reserva nomes únicos (evita sobrescrever arquivos de outras URLs ou colisões no lote)
+    known_paths = manifest.paths() if manifest is not None else {}
+    taken = set(known_paths.values())
+    jobs = []
+    for index, pdf_url in enumerate(pdf_urls):
+        if pdf_url in known_paths:
+            jobs.append((pdf_url, known_paths[pdf_url]))
+            continue
+        filename = pdf_filename_from_url(pdf_url, index)
+        name, ext = os.path.splitext(filename)
+        file_path = os.path.join(download_folder, filename)
+        counter = 1
+        while file_path in taken or (manifest is None and os.path.exists(file_path)):
+            file_path = os.path.join(download_folder, f"{name}_{counter}{ext}")
+            counter += 1
+        taken.add(file_path)
+        jobs.append((pdf_url, file_path))
+
+    results = []
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(download_pdf, session, pdf_url, file_path, rate_limiter, retries, manifest)
+                for pdf_url, file_path in jobs
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                filename = os.path.basename(result['path'])
+                if result['error']:
+                    print(f"  Erro ao baixar '{result['url']}': {result['error']}")
+                elif result['status'] == 'unchanged':
+                    print(f"  Inalterado, mantido: '{filename}'")
+                else:
+                    action = "Download retomado" if result['status'] == 'resumed' else "Download concluído"
+                    print(f"  {action}: '{filename}' "
+                          f"({result['bytes'] / 1024:.1f} KB em {result['seconds']:.2f}s)")
+    finally:
+        if own_session:
+            session.close()
+        if manifest is not None:
+            manifest.compact()
+    elapsed = time.perf_counter() - start
+
+    ok = [r for r in results if not r['error']]
+    total_bytes = sum(r['bytes'] for r in ok)
+    return {
+        'results': results,
+        'downloaded': sum(1 for r in ok if r['status'] != 'unchanged'),
+        'unchanged': sum(1 for r in ok if r['status'] == 'unchanged'),
+        'resumed': sum(1 for r in ok if r['status'] == 'resumed'),
+        'failed': len(results) - len(ok),
+        'total_bytes': total_bytes,
+        'elapsed': elapsed,
+        'files_per_second': len(ok) / elapsed if elapsed else 0.0,
+        'mb_per_second': total_bytes / (1024 * 1024) / elapsed if elapsed else 0.0,
+    }
+
+
+def print_download_summary(summary):
+    """Exibe a latência por arquivo e a vazão agregada de um lote de downloads."""
+    latencies = sorted(r['seconds'] for r in summary['results'] if not r['error'])
+    print("-" * 50)
+    print(f"Arquivos baixados: {summary['downloaded']} (retomados: {summary['resumed']}) | "
+          f"Inalterados: {summary['unchanged']} | Falhas: {summary['failed']}")
+    print(f"Transferido: {summary['total_bytes'] / (1024 * 1024):.2f} MB | Tempo total: {summary['elapsed']:.2f}s | "
+          f"Vazão: {summary['files_per_second']:.2f} arquivos/s, {summary['mb_per_second']:.2f} MB/s")
+    if latencies:
+        p95 = latencies[min(len(latencies) - 1, int(round(0.95 * (len(latencies) - 1))))]
+        print(f"Latência por arquivo: mín {latencies[0]:.2f}s | "
+              f"mediana {latencies[len(latencies) // 2]:.2f}s | p95 {p95:.2f}s | máx {latencies[-1]:.2f}s")
+    print("-" * 50)
@@ -0,0 +1,262 @@
+"""
+Registro de modelos spaCy carregados sob demanda.
+
+Cada pipeline, identificado pelo nome do modelo e pelos componentes excluídos, é
+carregado só no primeiro uso e mantido em uma única instância por processo, compartilhada
+pelo gera_json e por todas as páginas do app. O registro guarda o tempo de carga e o
+aumento de memória (RSS) de cada pipeline e pode descarregar os que ficaram sem uso por
+mais de idle_timeout segundos. A importação do spaCy fica fora da medida, e o aumento de
+memória só é registrado quando nenhuma outra carga rodou ao mesmo tempo (senão fica
+desconhecido), para que a memória de um pipeline não seja atribuída a outro.
+
+warm_up carrega uma lista de modelos em segundo plano; quem pede um modelo que ainda está
+sendo carregado espera pela mesma carga em vez de começar outra.
+
+Modelos registrados em vector_tables são carregados sem a tabela de vetores completa, com a
+tabela reduzida (float16, mapeada em memória) gerada por vector_tables.py no lugar.
+
+Exemplo:
+    from spacy_models import MODELS
+    nlp = MODELS.get("pt_core_news_sm")
+    nlp_tags = MODELS.get("pt_core_news_sm", exclude=("parser", "ner"))
+    MODELS.report()
+"""
+import gc
+import importlib
+import os
+import threading
+import time
+
+# Nomes "blank:<idioma>" criam um pipeline vazio com spacy.blank (só tokenização)
+BLANK_PREFIX = "blank:"
+
+
+class ModelNotFoundError(OSError):
+    """Modelo spaCy não instalado."""
+
+
+def rss_bytes():
+    """Memória residente do processo em bytes (None se não for possível medir)."""
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def pipeline_label(key):
+    """Nome legível de uma chave (modelo, componentes excluídos)."""
+    name, exclude = key
+    return f"{name} (sem {', '.join(exclude)})" if exclude else name
+
+
+class ModelRegistry:
+    """
+    Pipelines spaCy por (modelo, componentes excluídos), carregados no primeiro get() e
+    reaproveitados depois.
+
+    Args:
+        loader: loader(nome, exclude) -> Language; por padrão spacy.load (ou spacy.blank
+            para nomes "blank:<idioma>").
+        idle_timeout (float): Segundos sem uso após os quais unload_idle descarrega um
+            pipeline (None nunca descarrega).
+    """
+
+    def __init__(self, loader=None, idle_timeout=None):
+        self._loader = loader
+        self.idle_timeout = idle_timeout
+        self._models = {}
+        self._stats = {}
+        self._last_used = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        # Cargas em andamento e total de cargas iniciadas: a diferença de RSS só vale para
+        # uma carga que não se sobrepôs a nenhuma outra
+        self._loading = 0
+        self._load_starts = 0
+        self._monitor = None
+        self._warm_up = None
+        # nome do modelo -> pasta da tabela de vetores reduzida (ver vector_tables)
+        self.vector_tables = {}
+
+    def _load(self, name, exclude):
+        if self._loader is not None:
+            return self._loader(name, exclude)
+        import spacy
+
+        if name.startswith(BLANK_PREFIX):
+            return spacy.blank(name[len(BLANK_PREFIX):])
+        table = self.vector_tables.get(name)
+        if table is not None:
+            from vector_tables import use_table
+
+            # "vectors" em exclude: a tabela completa nem é lida do disco
+            model = spacy.load(name, exclude=list(exclude) + ["vectors"])
+            try:
+                return use_table(model, table)
+            except (OSError, ValueError) as e:
+                print(f"Aviso: tabela de vetores reduzida de {name} ignorada ({e}); usando a completa")
+        return spacy.load(name, exclude=list(exclude))
+
+    def get(self, name, exclude=()):
+        """
+        O pipeline do modelo name sem os componentes de exclude, carregando-o se ainda não
+        foi usado neste processo (ou se foi descarregado por falta de uso).
+
+        Raises:
+            ModelNotFoundError: Se o modelo não estiver instalado.
+        """
+        key = (name, tuple(sorted(exclude)))
+        model = self._models.get(key)
+        if model is not None:
+            self._last_used[key] = time.monotonic()
+            return model
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+        # Um lock por pipeline: duas threads pedindo o mesmo pipeline não o carregam duas vezes
+        wait_start = time.perf_counter()
+        with lock:
+            if key in self._models:
+                waited = time.perf_counter() - wait_start
+                if waited >= 0.1:
+                    print(f"Modelo spaCy {pipeline_label(key)}: {waited:.2f}s de espera pela carga em andamento")
+                self._last_used[key] = time.monotonic()
+                return self._models[key]
+            if self._loader is None:
+                # A importação do spaCy (uma vez por processo) fica fora da medida
+                importlib.import_module("spacy")
+            with self._lock:
+                alone = self._loading == 0
+                self._loading += 1
+                self._load_starts += 1
+                starts = self._load_starts
+            try:
+                rss_before = rss_bytes()
+                start = time.perf_counter()
+                model = self._load(name, key[1])
+                seconds = time.perf_counter() - start
+                rss_after = rss_bytes()
+            except OSError as e:
+                raise ModelNotFoundError(
+                    f"Modelo spaCy '{name}' não encontrado. Execute no terminal: "
+                    f"python -m spacy download {name}") from e
+            finally:
+                with self._lock:
+                    self._loading -= 1
+                    alone = alone and self._load_starts == starts
+            if not alone or rss_before is None or rss_after is None:
+                # Outra carga rodou ao mesmo tempo: a diferença de RSS seria dela também
+                rss_before = rss_after = None
+            stats = self._stats.setdefault(key, {'loads': 0})
+            stats.update({
+                'seconds': seconds,
+                'rss_bytes': rss_after - rss_before if rss_before is not None else None,
+                'loads': stats['loads'] + 1,
+            })
+            self._models[key] = model
+            self._last_used[key] = time.monotonic()
+            print(f"Modelo spaCy {pipeline_label(key)} carregado em {seconds:.2f}s{_format_memory(stats['rss_bytes'])}")
+            return model
+
+    def loaded(self):
+        """Chaves (modelo, componentes excluídos) dos pipelines carregados."""
+        return list(self._models)
+
+    def unload(self, name, exclude=()):
+        """Descarrega um pipeline (o próximo get o carrega de novo). Returns: se estava carregado."""
+        key = (name, tuple(sorted(exclude)))
+        with self._locks.get(key, self._lock):
+            model = self._models.pop(key, None)
+        if model is None:
+            return False
+        del model
+        gc.collect()
+        print(f"Modelo spaCy {pipeline_label(key)} descarregado")
+        return True
+
+    def unload_idle(self, idle_timeout=None):
+        """
+        Descarrega os pipelines sem uso há mais de idle_timeout segundos (padrão: o do registro).
+
+        Returns:
+            list: Chaves dos pipelines descarregados.
+        """
+        idle_timeout = self.idle_timeout if idle_timeout is None else idle_timeout
+        if idle_timeout is None:
+            return []
+        now = time.monotonic()
+        idle = [key for key in list(self._models) if now - self._last_used.get(key, now) > idle_timeout]
+        return [key for key in idle if self.unload(*key)]
+
+    def start_idle_monitor(self, interval=60):
+        """Inicia (uma vez por processo) uma thread que chama unload_idle a cada interval segundos."""
+        with self._lock:
+            if self._monitor is not None:
+                return
+            self._monitor = threading.Thread(target=self._monitor_loop, args=(interval,),
+                                             name="spacy-idle-monitor", daemon=True)
+        self._monitor.start()
+
+    def _monitor_loop(self, interval):
+        while True:
+            time.sleep(interval)
+            self.unload_idle()
+
+    def warm_up(self, names):
+        """
+        Carrega os modelos names, na ordem dada (prioridade), em uma thread em segundo plano.
+        Só a primeira chamada no processo tem efeito; modelos não instalados são ignorados.
+
+        Returns:
+            threading.Thread: A thread do aquecimento.
+        """
+        with self._lock:
+            if self._warm_up is None:
+                self._warm_up = threading.Thread(target=self._warm_up_loop, args=(list(names),),
+                                                 name="spacy-warm-up", daemon=True)
+                self._warm_up.start()
+            return self._warm_up
+
+    def _warm_up_loop(self, names):
+        start = time.perf_counter()
+        for name in names:
+            try:
+                self.get(name)
+            except ModelNotFoundError as e:
+                print(f"Aquecimento: {e}")
+                continue
+            print(f"Aquecimento: {name} pronto {time.perf_counter() - start:.2f}s após o início")
+        print(f"Aquecimento dos modelos spaCy concluído em {time.perf_counter() - start:.2f}s")
+
+    def stats(self):
+        """
+        Por pipeline: tempo da última carga (s), aumento de memória na carga (bytes), número
+        de cargas, se está carregado e há quantos segundos não é usado.
+        """
+        now = time.monotonic()
+        result = {}
+        for key, stats in self._stats.items():
+            result[pipeline_label(key)] = dict(
+                stats, loaded=key in self._models, idle_seconds=now - self._last_used.get(key, now))
+        return result
+
+    def report(self):
+        if not self._stats:
+            print("Nenhum modelo spaCy carregado.")
+        for label, stats in self.stats().items():
+            state = "carregado" if stats['loaded'] else "descarregado"
+            print(f"  {label}: {stats['seconds']:.2f}s{_format_memory(stats['rss_bytes'])}, {state}")
+
+
+def _format_memory(rss_delta):
+    return f", +{rss_delta / 1024 / 1024:.0f} MB" if rss_delta is not None else ", memória não medida"
+
+
+# Registro compartilhado pelo processo
+MODELS = ModelRegistry()
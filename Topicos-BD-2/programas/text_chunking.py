@@ -0,0 +1,80 @@
+"""
+Divisão de textos longos em trechos para processamento com spaCy.
+
+iter_chunks corta o texto em trechos de até max_chars caracteres, de preferência em
+quebras de parágrafo, depois em fins de frase e, em último caso, em espaços. O corte
+fica depois do espaço em branco, de modo que a concatenação dos trechos é exatamente o
+texto original e a tokenização de cada trecho coincide com a do texto inteiro na junção.
+
+iter_paragraphs corta antes em todas as quebras de parágrafo (e em posições extras, como
+os limites das seções do artigo), para que cada trecho tenha um único idioma.
+
+Exemplo:
+    from text_chunking import iter_chunks
+    for doc in nlp.pipe(iter_chunks(texto, 10000)):
+        ...
+"""
+import re
+
+# Pontos de corte em ordem de preferência; o trecho termina no fim de cada casamento
+PARAGRAPH_BREAK_RE = re.compile(r"\n[ \t\r\f\v]*\n\s*")
+SENTENCE_BREAK_RE = re.compile(r"(?<=[.!?])\s+")
+WHITESPACE_RE = re.compile(r"\s+")
+BREAK_PATTERNS = (PARAGRAPH_BREAK_RE, SENTENCE_BREAK_RE, WHITESPACE_RE)
+
+
+def _break_position(text, start, limit, min_end):
+    """Fim do melhor ponto de corte em text[start:limit] (limit se não houver nenhum)."""
+    best = start
+    for pattern in BREAK_PATTERNS:
+        end = start
+        for match in pattern.finditer(text, start, limit):
+            end = match.end()
+        # Aceita o corte mais preferido que não deixe o trecho curto demais
+        if end >= min_end:
+            return end
+        best = max(best, end)
+    return best if best > start else limit
+
+
+def iter_chunks(text, max_chars):
+    """
+    Divide o texto em trechos consecutivos de até max_chars caracteres.
+
+    Args:
+        text (str): Texto a dividir.
+        max_chars (int): Tamanho máximo de cada trecho.
+
+    Yields:
+        str: Trechos cuja concatenação é o texto original.
+    """
+    start = 0
+    while len(text) - start > max_chars:
+        limit = start + max_chars
+        end = _break_position(text, start, limit, start + max(max_chars // 2, 1))
+        yield text[start:end]
+        start = end
+    if start < len(text):
+        yield text[start:]
+
+
+def iter_paragraphs(text, max_chars, cuts=()):
+    """
+    Divide o texto em cada quebra de parágrafo e nas posições de cuts; parágrafos maiores
+    que max_chars são divididos por iter_chunks.
+
+    Args:
+        text (str): Texto a dividir.
+        max_chars (int): Tamanho máximo de cada trecho.
+        cuts (iterable): Posições adicionais de corte (ex: início de cada seção).
+
+    Yields:
+        str: Trechos cuja concatenação é o texto original.
+    """
+    positions = {match.end() for match in PARAGRAPH_BREAK_RE.finditer(text)}
+    positions.update(cut for cut in cuts if 0 < cut < len(text))
+    start = 0
+    for end in sorted(positions) + [len(text)]:
+        if end > start:
+            yield from iter_chunks(text[start:end], max_chars)
+            start = end
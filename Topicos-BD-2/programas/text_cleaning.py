@@ -0,0 +1,300 @@
+import re
+
+# Palavras que indicam um bloco de autores/afiliações no início do artigo
+AUTHOR_KEYWORDS = ['email', 'university', 'department', 'institute', 'college', 'orcid', 'instituição',
+                   'affiliation', 'author']
+# Prefixos (em minúsculas) que marcam o início do conteúdo principal
+CONTENT_START_PREFIXES = ('abstract', 'resumo', 'introdução', 'introduction')
+# Quantas linhas iniciais são examinadas em busca do bloco de autores
+AUTHOR_SCAN_LINES = 50
+
+ABSTRACT_START_RE = re.compile(r'\bABSTRACT\b', re.IGNORECASE)
+# Início de uma seção a remover no corpo do texto. REFERENCES/BIBLIOGRAPHY corta todo o resto.
+SECTION_START_RE = re.compile(
+    r'\b(?:(?P<keywords>KEYWORDS)|(?P<references>REFERENCES|BIBLIOGRAPHY))\b',
+    re.IGNORECASE
+)
+
+# Fim das seções ABSTRACT e KEYWORDS: a primeira posição após a palavra-chave em que
+# um destes padrões começa. As alternativas podem atravessar quebras de linha.
+_SECTION_END_COMMON = (
+    r'|\b(?:1\.\s*Introduction|I\.\s*INTRODUCTION)\b'  # Introduction (English)
+    r'|\b\d+\.\s+[A-Z][a-zA-Z\s]+'                     # Nova seção numerada
+    r'|\b[IVX]+\.\s+[A-Z][a-zA-Z\s]+'                  # Nova seção romana
+    r'|\n\n[A-Z]'                                      # Novo parágrafo
+)
+# Toda alternativa começa por um dos caracteres do lookahead inicial, que permite ao
+# motor de regex descartar as demais posições sem testar cada alternativa.
+ABSTRACT_END_RE = re.compile(
+    r'(?=[\dIVXKRP\n])(?:\bKEYWORDS\b|\bRESUMO\b|\bPALAVRAS-CHAVE\b' + _SECTION_END_COMMON + r')'
+    r'|\Z',  # Fim do documento
+    re.IGNORECASE
+)
+KEYWORDS_END_RE = re.compile(
+    r'(?=[\dIVXP\n])(?:\bPALAVRAS-CHAVE\b' + _SECTION_END_COMMON + r')'
+    r'|\Z',
+    re.IGNORECASE
+)
+
+# Linha que é apenas o título INTRODUCTION, com ou sem numeração ("1. Introduction", "I. INTRODUCTION")
+INTRODUCTION_HEADING_RE = re.compile(r'(?:\d+\.?\s*|[IVX]+\.?\s*)?INTRODUCTION', re.IGNORECASE)
+INTRODUCTION_ONLY_RE = re.compile(r'INTRODUCTION', re.IGNORECASE)
+# Numeração sozinha numa linha, que pertence a um título INTRODUCTION na linha seguinte
+HEADING_NUMBER_RE = re.compile(r'\d+\.?|[IVX]+\.?', re.IGNORECASE)
+
+# Linha que é apenas um número de página: arábico (até 4 dígitos) ou romano (até 4 caracteres),
+# opcionalmente envolvido por hífens/traços
+PAGE_NUMBER_RE = re.compile(r'^\s*[-–—]?\s*(?:\d{1,4}|[ivxlcdmIVXLCDM]{1,4})\s*[-–—]?\s*$')
+ROMAN_NUMERAL_RE = re.compile(r'[ivxlcdmIVXLCDM]+')
+MULTIPLE_SPACES_RE = re.compile(r'[ \t]{2,}')
+
+
+def strip_author_block(text):
+    """
+    Remove o bloco de autores e afiliações do início do texto (heurística, linguagem agnóstica).
+
+    Procura, nas primeiras AUTHOR_SCAN_LINES linhas, o início do conteúdo principal
+    (ABSTRACT, RESUMO, INTRODUCTION ou uma linha longa que não pareça metadado) e só
+    descarta as linhas anteriores se elas contiverem padrões de autor.
+    """
+    head = text.split('\n', AUTHOR_SCAN_LINES)[:AUTHOR_SCAN_LINES]
+    main_content_start_index = 0
+    for i, line in enumerate(head):
+        line_lower = line.lower().strip()
+        if line_lower.startswith(CONTENT_START_PREFIXES):
+            main_content_start_index = i
+            break
+        if len(line_lower.split()) > 10 and not any(keyword in line_lower for keyword in AUTHOR_KEYWORDS):
+            main_content_start_index = i
+            break
+
+    if main_content_start_index > 0:
+        potential_author_block = "\n".join(head[:main_content_start_index]).lower()
+        if any(keyword in potential_author_block for keyword in AUTHOR_KEYWORDS):
+            return text[sum(len(line) + 1 for line in head[:main_content_start_index]):]
+    return text
+
+
+def is_page_number(stripped_line):
+    """Indica se a linha (já sem espaços nas pontas) contém apenas um número de página."""
+    # Heurística extra contra falsos positivos: só linhas curtas e puramente numéricas ou romanas
+    if len(stripped_line) >= 10 or not PAGE_NUMBER_RE.match(stripped_line):
+        return False
+    return bool(
+        stripped_line.isdigit() or
+        ROMAN_NUMERAL_RE.fullmatch(stripped_line.replace('-', '').replace('–', '').replace('—', '').strip())
+    )
+
+
+def _pending_tail_start(text, pos):
+    """
+    Início dos dois últimos "tokens" (sequências sem espaço) de text[pos:], com os espaços
+    entre eles. É o trecho em que um fim de seção ainda pode começar e depender do texto
+    que falta chegar (ex: "3." no fim de uma página e "Resultados" no início da próxima).
+    """
+    i = len(text)
+    for _ in range(2):
+        while i > pos and text[i - 1].isspace():
+            i -= 1
+        while i > pos and not text[i - 1].isspace():
+            i -= 1
+    return i
+
+
+class _SectionStripper:
+    """
+    Remove, de um texto recebido em pedaços, as seções que vão de uma palavra de start_re
+    até a primeira posição em que end_re casa; se start_re tiver o grupo 'references',
+    o texto é cortado na primeira ocorrência e stopped passa a True.
+
+    A cada pedaço só é decidido o que o texto recebido até então permite decidir; o resto
+    fica em buffer (junto com o caractere anterior, necessário para os \b dos padrões).
+    """
+
+    def __init__(self, start_re, end_re, max_word_length):
+        self.start_re = start_re
+        self.end_re = end_re
+        self.max_word_length = max_word_length
+        self.buffer = ''
+        self.pos = 0  # Início do trecho ainda não decidido dentro de buffer
+        self.in_section = False
+        self.stopped = False
+
+    def feed(self, text, final=False):
+        """
+        Returns:
+            str: Texto decidido, fora das seções removidas.
+        """
+        if self.stopped:
+            return ''
+        buf = self.buffer + text if self.buffer else text
+        pos = self.pos
+        end = len(buf)
+        out = []
+        while True:
+            if self.in_section:
+                match = self.end_re.search(buf, pos)
+                if not final and match.end() >= end:
+                    # O fim da seção ainda pode depender do próximo pedaço
+                    pos = max(pos, min(match.start(), _pending_tail_start(buf, pos)))
+                    break
+                self.in_section = False
+                pos = match.start()
+                continue
+
+            match = self.start_re.search(buf, pos)
+            if match is not None and (final or match.end() < end):
+                out.append(buf[pos:match.start()])
+                if match.lastgroup == 'references':
+                    self.stopped = True
+                    self.buffer = ''
+                    return ''.join(out)
+                self.in_section = True
+                pos = match.end()
+                continue
+            # Nenhum início de seção decidido: libera o texto até onde uma palavra-chave
+            # ainda pode estar começando
+            safe = end if final else max(pos, end - self.max_word_length)
+            if match is not None:
+                safe = min(safe, match.start())
+            out.append(buf[pos:safe])
+            pos = safe
+            break
+
+        keep = max(pos - 1, 0)
+        self.buffer = buf[keep:]
+        self.pos = pos - keep
+        return ''.join(out)
+
+
+class TextCleaner:
+    """
+    Limpeza incremental: recebe o texto extraído em pedaços (ex: página a página) e produz
+    o mesmo resultado que clean_text sobre o texto inteiro.
+
+    Etapas, encadeadas a cada pedaço:
+    - bloco de autores, decidido assim que as primeiras AUTHOR_SCAN_LINES linhas chegam;
+    - remoção das seções ABSTRACT;
+    - máquina de estados do corpo: salta as seções KEYWORDS e para em REFERENCES/BIBLIOGRAPHY;
+    - limpeza linha a linha: título INTRODUCTION (e uma numeração sozinha na linha anterior),
+      números de página, linhas vazias e espaços.
+
+    Só o trecho ainda não decidido de cada etapa fica em memória, além do texto limpo.
+
+    Exemplo:
+        cleaner = TextCleaner()
+        for page_text in pages:
+            if cleaner.feed(page_text):
+                break  # REFERENCES confirmado: o resto do documento seria descartado
+        text = cleaner.finish()
+    """
+
+    def __init__(self):
+        self._head = []  # Início do texto, até o bloco de autores ser decidido
+        self._head_newlines = 0
+        self._pending_cr = False
+        self._abstracts = _SectionStripper(ABSTRACT_START_RE, ABSTRACT_END_RE, len('ABSTRACT'))
+        self._sections = _SectionStripper(SECTION_START_RE, KEYWORDS_END_RE, len('BIBLIOGRAPHY'))
+        self._partial_line = ''
+        self._held_number = None
+        self._lines = []
+        self.done = False  # True quando REFERENCES/BIBLIOGRAPHY foi confirmado
+
+    def feed(self, text):
+        """
+        Acrescenta um pedaço do texto extraído.
+
+        Returns:
+            bool: True se a seção de referências foi confirmada; os próximos pedaços seriam
+            descartados e não precisam ser extraídos.
+        """
+        if self.done:
+            return True
+        if self._pending_cr:
+            text = '\r' + text
+            self._pending_cr = False
+        if text.endswith('\r'):
+            # Pode ser a primeira metade de um "\r\n" dividido entre dois pedaços
+            text = text[:-1]
+            self._pending_cr = True
+        self._push(text.replace('\r\n', '\n').replace('\r', '\n').replace('\x0c', ''), final=False)
+        return self.done
+
+    def finish(self):
+        """Processa o que ainda estava pendente e retorna o texto limpo."""
+        if not self.done:
+            self._push('\n' if self._pending_cr else '', final=True)
+        self._add_line(self._partial_line, truncated=self.done)
+        if self._held_number is not None:
+            self._emit(self._held_number)
+        text = '\n'.join(self._lines)
+        # Os espaços repetidos nunca atravessam linhas: uma única substituição no texto final basta
+        if '  ' in text or '\t' in text:
+            text = MULTIPLE_SPACES_RE.sub(' ', text)
+        return text
+
+    def _push(self, text, final):
+        if self._head is not None:
+            self._head.append(text)
+            self._head_newlines += text.count('\n')
+            if self._head_newlines < AUTHOR_SCAN_LINES and not final:
+                return
+            text = strip_author_block(''.join(self._head))
+            self._head = None
+
+        body = self._sections.feed(self._abstracts.feed(text, final), final)
+        lines = (self._partial_line + body).split('\n') if self._partial_line else body.split('\n')
+        self._partial_line = lines.pop()
+        for line in lines:
+            self._add_line(line)
+        self.done = self._sections.stopped
+
+    def _add_line(self, line, truncated=False):
+        """
+        Uma numeração sozinha numa linha ("1.", "I") só é decidida na próxima linha não vazia:
+        se esta for o título INTRODUCTION, as duas são removidas. A linha cortada em
+        REFERENCES (truncated) nunca é tratada como título nem como numeração, pois a linha
+        inteira continha a palavra REFERENCES.
+        """
+        stripped = line.strip()
+        if not stripped:
+            return
+        if not truncated:
+            if INTRODUCTION_HEADING_RE.fullmatch(stripped):
+                if self._held_number is not None and not INTRODUCTION_ONLY_RE.fullmatch(stripped):
+                    self._emit(self._held_number)
+                self._held_number = None
+                return
+            if HEADING_NUMBER_RE.fullmatch(stripped):
+                if self._held_number is not None:
+                    self._emit(self._held_number)
+                self._held_number = stripped
+                return
+        if self._held_number is not None:
+            self._emit(self._held_number)
+            self._held_number = None
+        self._emit(stripped)
+
+    def _emit(self, stripped):
+        if not is_page_number(stripped):
+            self._lines.append(stripped)
+
+
+def clean_text(text):
+    """
+    Realiza operações de limpeza no texto extraído:
+    - Normaliza quebras de linha e remove caracteres de avanço de página.
+    - Tenta remover nomes de autores e afiliações (abordagem heurística, linguagem agnóstica).
+    - Remove as seções ABSTRACT (Inglês) e KEYWORDS (Inglês).
+    - Remove o cabeçalho INTRODUCTION (Inglês) se for um título de seção.
+    - Remove as seções REFERENCES/BIBLIOGRAPHY (Inglês).
+    - Tenta remover números de página.
+    - Normaliza espaços em branco para delimitação de parágrafos e palavras.
+
+    O texto é percorrido uma única vez por uma máquina de estados orientada a linhas
+    (ver TextCleaner), com todos os padrões compilados no carregamento do módulo; o
+    tempo é linear no tamanho do texto.
+    """
+    cleaner = TextCleaner()
+    cleaner.feed(text)
+    return cleaner.finish()
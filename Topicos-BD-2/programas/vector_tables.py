@@ -0,0 +1,213 @@
+"""
+Tabelas de vetores reduzidas para modelos spaCy com vetores (ex: pt_core_news_lg).
+
+O pt_core_news_lg é usado pelas páginas principalmente pelos vetores de palavras, e a
+tabela completa (500 mil linhas de 300 floats32, ~570 MB) fica na memória de cada processo
+que carrega o modelo. build_table guarda uma tabela reduzida:
+
+- só as palavras que aparecem no corpus do projeto mais as top_rows primeiras linhas da
+  tabela (nos pacotes do spaCy, as palavras mais frequentes vêm primeiro);
+- em float16, metade do tamanho;
+- em arquivos .npy que use_table abre com memória mapeada (np.load com mmap_mode="r"):
+  só as páginas lidas vão para a memória, e vários processos que usam o mesmo arquivo
+  (app, serviço de inferência) compartilham essas páginas pelo cache do sistema.
+
+As palavras fora da tabela reduzida ficam sem vetor (vetor zero), como palavras fora do
+vocabulário do modelo. Os vetores são convertidos para float32 na leitura, então o resto do
+pipeline (tok2vec, Doc.similarity) funciona sem mudanças.
+
+Exemplo:
+    python programas/vector_tables.py --model pt_core_news_lg
+
+    from spacy_models import MODELS
+    from vector_tables import table_path
+    MODELS.vector_tables["pt_core_news_lg"] = table_path("pt_core_news_lg")
+"""
+import argparse
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+from spacy.strings import get_string_id
+from spacy.vectors import BaseVectors, Mode
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_FOLDER = Path(os.environ.get("VECTOR_TABLES_PATH", PROJECT_ROOT / "arquivos" / "cache" / "vetores"))
+CORPUS_FOLDER = PROJECT_ROOT / "arquivos" / "files_txt"
+# Linhas mais frequentes mantidas além do vocabulário do corpus
+DEFAULT_TOP_ROWS = 50000
+# Versão do formato dos arquivos
+TABLE_VERSION = 1
+
+KEYS_FILE = "keys.npy"
+VECTORS_FILE = "vectors.npy"
+META_FILE = "meta.json"
+
+
+def table_path(model_name, folder=DEFAULT_FOLDER):
+    """Pasta da tabela reduzida de model_name."""
+    return Path(folder) / model_name
+
+
+def corpus_keys(nlp, texts):
+    """Chaves (hashes no atributo usado pela tabela de vetores, ex: ORTH) dos tokens de texts."""
+    attr = nlp.vocab.vectors.attr
+    keys = set()
+    for doc in nlp.tokenizer.pipe(texts):
+        keys.update(doc.to_array(attr).tolist())
+    return keys
+
+
+def build_table(nlp, texts, path, top_rows=DEFAULT_TOP_ROWS):
+    """
+    Grava a tabela reduzida dos vetores de nlp em path.
+
+    Args:
+        nlp: Pipeline com a tabela de vetores completa.
+        texts: Textos do corpus; as palavras que aparecem neles são mantidas.
+        path: Pasta de saída (criada se não existir).
+        top_rows (int): Primeiras linhas da tabela mantidas, mesmo fora do corpus.
+
+    Returns:
+        dict: Metadados gravados (modelo, linhas, bytes da tabela original e da reduzida).
+    """
+    vectors = nlp.vocab.vectors
+    seen = corpus_keys(nlp, texts)
+    kept = sorted((key, row) for key, row in vectors.key2row.items() if row < top_rows or key in seen)
+    keys = np.array([key for key, _ in kept], dtype=np.uint64)
+    data = np.asarray(vectors.data)[[row for _, row in kept]].astype(np.float16)
+
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    np.save(path / KEYS_FILE, keys)
+    np.save(path / VECTORS_FILE, data)
+    meta = {
+        'format': TABLE_VERSION,
+        'model': f"{nlp.meta.get('lang', nlp.lang)}_{nlp.meta.get('name', '')}",
+        'model_version': nlp.meta.get('version', ''),
+        'attr': int(vectors.attr),
+        'rows': len(keys),
+        'dims': int(data.shape[1]) if data.ndim == 2 else 0,
+        'top_rows': top_rows,
+        'corpus_words': len(seen),
+        'original_rows': int(vectors.shape[0]),
+        'original_bytes': int(np.asarray(vectors.data).nbytes),
+        'bytes': int(data.nbytes + keys.nbytes),
+    }
+    with open(path / META_FILE, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+class MappedVectors(BaseVectors):
+    """
+    Tabela de vetores float16 lida de arquivos mapeados em memória.
+
+    As chaves ficam ordenadas e são procuradas com busca binária (np.searchsorted), sem
+    dicionário por processo. Os vetores devolvidos são float32.
+
+    Args:
+        path: Pasta gravada por build_table.
+        strings: StringStore do vocabulário (definido pelo spaCy ao atribuir vocab.vectors).
+    """
+
+    def __init__(self, path, strings=None):
+        super().__init__(strings=strings)
+        path = Path(path)
+        with open(path / META_FILE, encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.strings = strings
+        self.name = f"{self.meta['model']}-f16-{self.meta['rows']}"
+        self.attr = self.meta['attr']
+        # Lido por Language.meta
+        self.mode = Mode.default
+        self._keys = np.load(path / KEYS_FILE, mmap_mode="r")
+        self.data = np.load(path / VECTORS_FILE, mmap_mode="r")
+
+    def _rows(self, keys):
+        keys = np.asarray(keys, dtype=np.uint64)
+        rows = np.searchsorted(self._keys, keys)
+        rows[rows >= len(self._keys)] = 0
+        found = self._keys[rows] == keys if len(self._keys) else np.zeros(keys.shape, dtype=bool)
+        return rows, found
+
+    def __getitem__(self, key):
+        rows, found = self._rows([get_string_id(key)])
+        if not found[0]:
+            raise KeyError(key)
+        return self.data[rows[0]].astype(np.float32)
+
+    def __contains__(self, key):
+        return bool(self._rows([get_string_id(key)])[1][0])
+
+    def get_batch(self, keys):
+        """Vetores float32 de keys (zero para chaves sem vetor), como o tok2vec espera."""
+        rows, found = self._rows(keys)
+        batch = np.zeros((len(rows), self.shape[1]), dtype=np.float32)
+        batch[found] = self.data[rows[found]]
+        return batch
+
+    def is_full(self):
+        return True
+
+    def add(self, key, *, vector=None):
+        raise ValueError("Tabela de vetores reduzida é somente leitura")
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    @property
+    def n_keys(self):
+        return len(self._keys)
+
+    @property
+    def vectors_length(self):
+        return self.data.shape[1]
+
+    @property
+    def size(self):
+        return self.data.size
+
+
+def use_table(nlp, path):
+    """
+    Troca a tabela de vetores de nlp pela tabela reduzida gravada em path.
+
+    Raises:
+        FileNotFoundError: Se a tabela não existir.
+        ValueError: Se a tabela for de outro modelo ou de outra versão do modelo.
+    """
+    table = MappedVectors(path, strings=nlp.vocab.strings)
+    name = f"{nlp.meta.get('lang', nlp.lang)}_{nlp.meta.get('name', '')}"
+    if (table.meta['model'], table.meta['model_version']) != (name, nlp.meta.get('version', '')):
+        raise ValueError(f"Tabela de {table.meta['model']} {table.meta['model_version']} não serve para "
+                         f"{name} {nlp.meta.get('version', '')}; gere de novo com vector_tables.py")
+    nlp.vocab.vectors = table
+    return nlp
+
+
+def read_corpus(folder=CORPUS_FOLDER):
+    """Textos dos .txt de folder."""
+    return [path.read_text(encoding="utf-8") for path in sorted(Path(folder).glob("*.txt"))]
+
+
+if __name__ == "__main__":
+    from spacy_models import MODELS
+
+    parser = argparse.ArgumentParser(description="Gera a tabela de vetores reduzida de um modelo spaCy.")
+    parser.add_argument("--model", default="pt_core_news_lg")
+    parser.add_argument("--corpus", default=str(CORPUS_FOLDER), help="pasta com os .txt do corpus")
+    parser.add_argument("--top-rows", type=int, default=DEFAULT_TOP_ROWS)
+    parser.add_argument("--output", default=None, help="pasta de saída (padrão: arquivos/cache/vetores/<modelo>)")
+    args = parser.parse_args()
+
+    nlp = MODELS.get(args.model)
+    output = args.output or table_path(args.model)
+    meta = build_table(nlp, read_corpus(args.corpus), output, top_rows=args.top_rows)
+    print(f"{meta['rows']} de {meta['original_rows']} linhas ({meta['corpus_words']} palavras do corpus): "
+          f"{meta['original_bytes'] / 1024 / 1024:.0f} MB -> {meta['bytes'] / 1024 / 1024:.0f} MB em {output}")